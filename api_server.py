@@ -0,0 +1,530 @@
+# ============================================================
+# MSAAS - API Server Module
+# Local HTTP/JSON service for portals and kiosks (asyncio, stdlib only)
+# ============================================================
+#
+# GET  /health
+# GET  /summary?student=ID&month=March
+# GET  /status?student=ID&month=March
+# GET  /days-needed?student=ID&month=March&remaining=8
+# GET  /safe-leaves?student=ID&month=March&remaining=8&target=80
+# GET  /report?student=ID&month=March
+# GET  /leave-plan?student=ID&start=August&until=March&must_attend=2026-03-12&prefer=Friday
+# GET  /at-risk?below=75&month=March   (or band=CRITICAL instead of below)
+# GET  /range?student=ID&from=August&to=March   (whole months, e.g. a term)
+# GET  /range?student=ID&from=March&from_day=15&to=April&to_day=10
+# GET  /range?student=ID&to=March&last=30   (last 30 working days up to March)
+# GET  /metrics   (call counts and timings, see instrumentation.py)
+#
+# POST /batch/<summary|status|days-needed|safe-leaves|report|leave-plan|at-risk|range>
+#      body: {"requests": [{"student": "s001", "month": "March", ...}, ...]}
+#      reply: {"results": [{...} or {"error": "..."}, ...]} in request order
+#
+# Instead of student/month, a request may give "days_present" and
+# "total_days" directly to calculate without a saved record.
+# Without "remaining", the days left in the month come from the school
+# calendar (optionally for a "section" and "year").
+# /at-risk answers from a risk index of every saved record, rebuilt
+# when it is older than RISK_INDEX_MAX_AGE seconds (other sessions save
+# to the same folder without the server hearing of it).
+# Connections are kept alive (HTTP/1.1) until the client closes them
+# or stays idle for IDLE_TIMEOUT seconds.
+
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl
+
+from attendance import parse_month
+from calculator import (get_percentage, get_status_band, calculate_projection,
+                        MINIMUM_ATTENDANCE_PERCENT, PROJECTION_TARGETS, SAFE_LEAVE_TARGETS)
+from display import get_recommendations
+from file_handler import load_data, load_student
+from instrumentation import get_metrics
+from leave_planner import plan_leaves, parse_day_list
+from prefix_index import AttendancePrefixIndex
+from risk_index import build_risk_index
+from school_calendar import get_calendar, term_records
+from utils import is_valid_student_id, parse_valid_number
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8075
+
+# Seconds an idle keep-alive connection stays open
+IDLE_TIMEOUT = 30
+
+# Largest accepted request head and body, in bytes
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 4 * 1024 * 1024
+
+# Most items accepted by one batch request
+MAX_BATCH_ITEMS = 10000
+
+# Seconds the risk index of /at-risk is reused before being rebuilt
+RISK_INDEX_MAX_AGE = 60
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+
+# Risk index of /at-risk and the time it was built (requests are
+# answered on worker threads, so it is built under a lock)
+_risk_index = None
+_risk_index_built = 0.0
+_risk_index_lock = threading.Lock()
+
+
+class RequestError(Exception):
+    """A request that cannot be answered, with its HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def get_record(params):
+    """
+    Get the attendance data a request is about
+    Parameters:
+        params (dict): Request parameters
+    Returns:
+        dict: Attendance data dictionary
+    Raises:
+        RequestError: If the parameters are invalid or there is no data
+    """
+    try:
+        if "days_present" in params or "total_days" in params:
+            total_days = parse_valid_number(params.get("total_days"), 0, 366)
+            days_present = parse_valid_number(params.get("days_present"), 0, total_days)
+            return {
+                "month": parse_month(str(params["month"])) if "month" in params else "",
+                "total_days": total_days,
+                "days_present": days_present,
+                "days_absent": total_days - days_present,
+                "daily_record": [],
+                "entry_type": "quick"
+            }
+
+        student_id = str(params.get("student", ""))
+        if not is_valid_student_id(student_id):
+            raise RequestError(400, "student must be 1-32 letters, digits, '-' or '_'")
+        month = parse_month(str(params.get("month", "")))
+
+    except (TypeError, ValueError) as e:
+        raise RequestError(400, str(e))
+
+    data = load_data(student_id, month)
+    if data is None:
+        raise RequestError(404, f"No attendance data for {student_id} in {month}")
+    return data
+
+
+def get_number(params, name, min_val, max_val):
+    """Read a whole-number parameter, as RequestError on bad input"""
+    if name not in params:
+        raise RequestError(400, f"Missing parameter: {name}")
+    try:
+        return parse_valid_number(params[name], min_val, max_val)
+    except (TypeError, ValueError) as e:
+        raise RequestError(400, f"{name}: {e}")
+
+
+def get_remaining(params, data):
+    """Read the remaining working days, or count them with the school calendar"""
+    if "remaining" in params or not data['month']:
+        return get_number(params, "remaining", 0, 31)
+
+    year = get_number(params, "year", 1900, 9999) if "year" in params else None
+    section = str(params["section"]) if "section" in params else None
+    return min(31, get_calendar().remaining_working_days(data['month'], data['total_days'], year, section))
+
+
+def summary_payload(params):
+    """Data shown by view_summary"""
+    data = get_record(params)
+    return {
+        "month": data['month'],
+        "total_days": data['total_days'],
+        "days_present": data['days_present'],
+        "days_absent": data['days_absent'],
+        "entry_type": data['entry_type'],
+        "percentage": get_percentage(data)
+    }
+
+
+def status_payload(params):
+    """Data shown by check_status"""
+    percentage = get_percentage(get_record(params))
+    minimum, status, message, symbol = get_status_band(percentage)
+    return {
+        "percentage": percentage,
+        "required_minimum": MINIMUM_ATTENDANCE_PERCENT,
+        "status": status,
+        "message": message,
+        "symbol": symbol,
+        "difference": round(percentage - MINIMUM_ATTENDANCE_PERCENT, 2),
+        "eligible": percentage >= MINIMUM_ATTENDANCE_PERCENT
+    }
+
+
+def days_needed_payload(params):
+    """Data shown by calculate_days_needed"""
+    data = get_record(params)
+    remaining_days = get_remaining(params, data)
+    return {
+        "percentage": get_percentage(data),
+        "remaining_days": remaining_days,
+        "projections": [
+            calculate_projection(data['days_present'], data['total_days'], remaining_days, target)
+            for target, label in PROJECTION_TARGETS
+        ]
+    }
+
+
+def safe_leaves_payload(params):
+    """Data shown by calculate_safe_leaves"""
+    data = get_record(params)
+    remaining_days = get_remaining(params, data)
+    target_percent = get_number(params, "target", 0, 100)
+    if target_percent not in SAFE_LEAVE_TARGETS:
+        raise RequestError(400, f"target must be one of {SAFE_LEAVE_TARGETS}")
+
+    projection = calculate_projection(data['days_present'], data['total_days'], remaining_days, target_percent)
+    projection["remaining_days"] = remaining_days
+    return projection
+
+
+def report_payload(params):
+    """Data shown by view_monthly_report"""
+    payload = summary_payload(params)
+    payload["eligible"] = payload["percentage"] >= MINIMUM_ATTENDANCE_PERCENT
+    payload["recommendations"] = get_recommendations(payload["percentage"])
+    return payload
+
+
+def leave_plan_payload(params):
+    """Data shown by main.py --plan-leaves for one student"""
+    student_id = str(params.get("student", ""))
+    if not is_valid_student_id(student_id):
+        raise RequestError(400, "student must be 1-32 letters, digits, '-' or '_'")
+
+    try:
+        end_month = parse_month(str(params.get("until", "")))
+        start_month = parse_month(str(params["start"])) if "start" in params else None
+        must_attend = parse_day_list(str(params.get("must_attend", "")))[0]
+        preferred, preferred_weekdays = parse_day_list(str(params.get("prefer", "")))
+    except ValueError as e:
+        raise RequestError(400, str(e))
+
+    records = load_student(student_id)
+    if not records:
+        raise RequestError(404, f"No attendance data for {student_id}")
+
+    year = get_number(params, "year", 1900, 9999) if "year" in params else None
+    section = str(params["section"]) if "section" in params else None
+    try:
+        plan = plan_leaves(records, end_month, must_attend, preferred, preferred_weekdays,
+                           year=year, section=section, start_month=start_month)
+    except ValueError as e:
+        raise RequestError(404, str(e))
+    plan["leaves"] = [day.isoformat() for day in plan["leaves"]]
+    return plan
+
+
+def get_risk_index():
+    """Get the risk index of every saved record, rebuilt once it is too old"""
+    global _risk_index, _risk_index_built
+
+    with _risk_index_lock:
+        if _risk_index is None or time.monotonic() - _risk_index_built > RISK_INDEX_MAX_AGE:
+            _risk_index = build_risk_index(watch=False)
+            _risk_index_built = time.monotonic()
+        return _risk_index
+
+
+def at_risk_payload(params):
+    """Records below a percentage (75 by default) or in one status band"""
+    try:
+        month = parse_month(str(params["month"])) if "month" in params else None
+        below = float(params.get("below", MINIMUM_ATTENDANCE_PERCENT))
+        if not 0 <= below <= 100:
+            raise ValueError("below must be a percentage between 0 and 100")
+    except (TypeError, ValueError) as e:
+        raise RequestError(400, str(e))
+
+    index = get_risk_index()
+    if "band" in params:
+        band = str(params["band"]).upper()
+        try:
+            entries = index.in_band(band, month)
+        except ValueError as e:
+            raise RequestError(400, str(e))
+        payload = {"band": band}
+    else:
+        entries = index.below(below, month)
+        payload = {"below": below}
+
+    payload["month"] = month
+    payload["count"] = len(entries)
+    payload["records"] = [{"student": student_id, "month": entry_month, "percentage": percentage}
+                          for percentage, student_id, entry_month in entries]
+    return payload
+
+
+def range_payload(params):
+    """Percentage over a range of working days, across month boundaries"""
+    student_id = str(params.get("student", ""))
+    if not is_valid_student_id(student_id):
+        raise RequestError(400, "student must be 1-32 letters, digits, '-' or '_'")
+
+    try:
+        last_month = parse_month(str(params.get("to", "")))
+        first_month = parse_month(str(params["from"])) if "from" in params else None
+    except ValueError as e:
+        raise RequestError(400, str(e))
+
+    records = term_records(load_student(student_id), last_month, first_month)
+    for month in (first_month, last_month):
+        if month is not None and month not in records:
+            raise RequestError(404, f"No attendance data for {student_id} in {month}")
+
+    # The term's working days end to end, the last month last
+    index = AttendancePrefixIndex(next(iter(records)))
+    for data in records.values():
+        index.set_month(data)
+
+    payload = {"student": student_id, "to": last_month}
+    try:
+        if "last" in params:
+            payload["last"] = get_number(params, "last", 1, 366)
+            payload["percentage"] = index.recent_percentage(payload["last"])
+        elif first_month is None:
+            raise RequestError(400, "Missing parameter: from (or last)")
+        elif "from_day" in params or "to_day" in params:
+            payload["from"] = first_month
+            payload["from_day"] = get_number(params, "from_day", 1, 31)
+            payload["to_day"] = get_number(params, "to_day", 1, 31)
+            payload["percentage"] = index.range_percentage(first_month, payload["from_day"],
+                                                           last_month, payload["to_day"])
+        else:
+            payload["from"] = first_month
+            payload["percentage"] = index.months_percentage(first_month, last_month)
+    except ValueError as e:
+        raise RequestError(400, str(e))
+
+    return payload
+
+
+# Path -> function building the reply for one set of parameters
+ENDPOINTS = {
+    "/summary": summary_payload,
+    "/status": status_payload,
+    "/days-needed": days_needed_payload,
+    "/safe-leaves": safe_leaves_payload,
+    "/report": report_payload,
+    "/leave-plan": leave_plan_payload,
+    "/at-risk": at_risk_payload,
+    "/range": range_payload
+}
+
+
+def run_batch_request(endpoint, body):
+    """
+    Answer a batch request, one result per item
+    Parameters:
+        endpoint (function): Payload function from ENDPOINTS
+        body (bytes): JSON request body
+    Returns:
+        dict: {"results": [...]}
+    """
+    try:
+        items = json.loads(body)["requests"]
+    except (ValueError, KeyError, TypeError):
+        raise RequestError(400, 'Body must be JSON: {"requests": [...]}')
+
+    if not isinstance(items, list):
+        raise RequestError(400, '"requests" must be a list')
+    if len(items) > MAX_BATCH_ITEMS:
+        raise RequestError(413, f"At most {MAX_BATCH_ITEMS} requests per batch")
+
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append({"error": "Each request must be a JSON object"})
+            continue
+        try:
+            results.append(endpoint(item))
+        except RequestError as e:
+            results.append({"error": str(e)})
+
+    return {"results": results}
+
+
+def handle_request(method, target, body):
+    """
+    Route one HTTP request
+    Parameters:
+        method (str): HTTP method
+        target (str): Request path with query string
+        body (bytes): Request body
+    Returns:
+        tuple: (HTTP status, reply dictionary)
+    """
+    url = urlsplit(target)
+    path = url.path.rstrip("/") or "/"
+
+    try:
+        if path == "/health":
+            return 200, {"status": "ok"}
+
+        if path == "/metrics":
+            return 200, get_metrics()
+
+        if path.startswith("/batch/"):
+            endpoint = ENDPOINTS.get(path[len("/batch"):])
+            if endpoint is None:
+                raise RequestError(404, f"Unknown endpoint: {path}")
+            if method != "POST":
+                raise RequestError(405, "Batch endpoints need POST")
+            return 200, run_batch_request(endpoint, body)
+
+        endpoint = ENDPOINTS.get(path)
+        if endpoint is None:
+            raise RequestError(404, f"Unknown endpoint: {path}")
+        if method != "GET":
+            raise RequestError(405, "Use GET, or POST to /batch" + path)
+        return 200, endpoint(dict(parse_qsl(url.query)))
+
+    except RequestError as e:
+        return e.status, {"error": str(e)}
+    except Exception as e:
+        return 500, {"error": f"Internal error: {e}"}
+
+
+def build_response(status, payload, keep_alive):
+    """Encode an HTTP response with a JSON body"""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Error')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+async def read_request(reader):
+    """
+    Read one HTTP request from a connection
+    Returns:
+        tuple: (method, target, headers, body), or None when the
+               client closed the connection or stayed idle too long
+    Raises:
+        RequestError: If the request is malformed or too large
+    """
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise RequestError(413, "Request head too large")
+
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3:
+        raise RequestError(400, "Malformed request line")
+    method, target, version = parts
+
+    headers = {"version": version}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise RequestError(400, "Bad Content-Length")
+    if length < 0 or length > MAX_BODY_SIZE:
+        raise RequestError(413, "Request body too large")
+
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def wants_keep_alive(headers):
+    """HTTP/1.1 keeps the connection unless told not to; 1.0 only on request"""
+    connection = headers.get("connection", "").lower()
+    if headers.get("version") == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+async def handle_client(reader, writer):
+    """Serve every request sent over one connection"""
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except RequestError as e:
+                writer.write(build_response(e.status, {"error": str(e)}, False))
+                await writer.drain()
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            if request is None:
+                break
+
+            method, target, headers, body = request
+            keep_alive = wants_keep_alive(headers)
+
+            # Store reads may wait for a student's lock or replay a journal,
+            # so requests run on worker threads and never hold up the others
+            status, payload = await asyncio.get_running_loop().run_in_executor(
+                None, handle_request, method, target, body)
+            writer.write(build_response(status, payload, keep_alive))
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Start the API server
+    Parameters:
+        host (str): Address to listen on (localhost by default)
+        port (int): Port to listen on (0 picks a free port)
+    Returns:
+        asyncio.Server: The running server
+    """
+    return await asyncio.start_server(handle_client, host, port, limit=MAX_HEADER_SIZE)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Run the API server until interrupted"""
+
+    async def run():
+        server = await start_server(host, port)
+        address = server.sockets[0].getsockname()
+        print(f"✓ MSAAS API listening on http://{address[0]}:{address[1]}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n○ API server stopped.")
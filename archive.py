@@ -0,0 +1,314 @@
+# ============================================================
+# MSAAS - Archive Module
+# Seals closed months into compressed, read-only segments
+# ============================================================
+#
+# Past months are rarely viewed but make up most of the data, so once
+# a month is closed every student's record of it can be sealed:
+#
+#   python main.py --seal March
+#
+# moves them out of the student folders into one segment file:
+#
+#   attendance_store/.archive/<Month>.seg
+#
+# A segment holds a small index (student ID -> place in the segment)
+# followed by every record in the snapshot format, zlib-compressed as
+# one block. Nothing is read at startup: a segment's index is read on
+# the first lookup of that month, and its records are decompressed on
+# the first record read. The ARCHIVE_CACHE_SEGMENTS most recently used
+# segments stay decompressed in memory.
+#
+# A record saved for a sealed month lives in the student folder again
+# and hides the sealed one; sealing the month again moves it in.
+
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+import file_handler
+from attendance import MONTH_NAMES
+from file_lock import FileLock
+from instrumentation import METRICS_ENABLED, record_io
+
+# Folder of the segments inside DATA_DIR (not a valid student ID,
+# so it is never listed as a student)
+ARCHIVE_DIR = ".archive"
+
+# Extension of a segment file
+SEGMENT_EXTENSION = ".seg"
+
+# Segment layout: magic, month index, number of records, index size,
+# followed by the index and the compressed records
+SEGMENT_HEADER = struct.Struct("<4sBII")
+SEGMENT_MAGIC = b"MSZ1"
+
+# Index entry after each student ID (length byte + UTF-8): offset and
+# size of the record inside the decompressed block
+INDEX_ENTRY = struct.Struct("<II")
+
+# Decompressed segments kept in memory
+ARCHIVE_CACHE_SEGMENTS = 4
+
+# zlib level of a segment (written once, read many times)
+COMPRESSION_LEVEL = 9
+
+# Month -> (file identity, {student ID -> (offset, size)})
+_indexes = {}
+
+# Month -> (file identity, decompressed records), least recently used first
+_segments = OrderedDict()
+
+# Guards both caches (the autosave thread and the menu may read at once)
+_cache_lock = threading.Lock()
+
+
+def get_archive_dir():
+    """Get the folder holding the segments"""
+    return os.path.join(file_handler.DATA_DIR, ARCHIVE_DIR)
+
+
+def get_segment_path(month):
+    """
+    Get the segment file path of one month
+    Parameters:
+        month (str): Month name
+    Returns:
+        str: File path
+    """
+    if month not in MONTH_NAMES:
+        raise ValueError(f"Invalid month: {month!r}")
+
+    return os.path.join(get_archive_dir(), month + SEGMENT_EXTENSION)
+
+
+def file_identity(stat):
+    """Values that change whenever a segment is replaced"""
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def build_segment(month, records):
+    """
+    Convert the records of one month into the segment format
+    Parameters:
+        month (str): Month name
+        records (dict): student_id -> attendance data
+    Returns:
+        bytes: Header, index and compressed records
+    """
+    index = bytearray()
+    block = bytearray()
+
+    for student_id in sorted(records):
+        snapshot = file_handler.pack_snapshot(records[student_id])
+        encoded_id = student_id.encode("utf-8")
+        if len(encoded_id) > 255:
+            raise ValueError(f"Student ID too long to seal: {student_id[:20]}...")
+        index += bytes([len(encoded_id)]) + encoded_id + INDEX_ENTRY.pack(len(block), len(snapshot))
+        block += snapshot
+
+    header = SEGMENT_HEADER.pack(SEGMENT_MAGIC, MONTH_NAMES.index(month), len(records), len(index))
+    return header + bytes(index) + zlib.compress(bytes(block), COMPRESSION_LEVEL)
+
+
+def parse_index(buffer):
+    """
+    Read the index of a segment
+    Parameters:
+        buffer (bytes): Segment bytes, at least up to the end of the index
+    Returns:
+        tuple: (student_id -> (offset, size), position of the compressed records)
+    Raises:
+        ValueError: If the buffer is not a segment
+    """
+    magic, month_index, count, index_size = SEGMENT_HEADER.unpack_from(buffer, 0)
+    if magic != SEGMENT_MAGIC:
+        raise ValueError("not an archive segment")
+
+    index = {}
+    position = SEGMENT_HEADER.size
+    for _ in range(count):
+        length = buffer[position]
+        student_id = bytes(buffer[position + 1:position + 1 + length]).decode("utf-8")
+        position += 1 + length
+        index[student_id] = INDEX_ENTRY.unpack_from(buffer, position)
+        position += INDEX_ENTRY.size
+
+    return index, SEGMENT_HEADER.size + index_size
+
+
+def read_index(month):
+    """
+    Get the index of a month's segment, reading it only on first use
+    or after the segment was sealed again
+    Parameters:
+        month (str): Month name
+    Returns:
+        dict: student_id -> (offset, size), empty if the month is not sealed
+    """
+    try:
+        stat = os.stat(get_segment_path(month))
+    except FileNotFoundError:
+        return {}
+
+    identity = file_identity(stat)
+    with _cache_lock:
+        cached = _indexes.get(month)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+
+    with open(get_segment_path(month), "rb") as file:
+        header = file.read(SEGMENT_HEADER.size)
+        index_size = SEGMENT_HEADER.unpack(header)[3]
+        buffer = header + file.read(index_size)
+        identity = file_identity(os.fstat(file.fileno()))
+
+    index = parse_index(buffer)[0]
+    if METRICS_ENABLED:
+        record_io("archive_index_read", len(buffer))
+
+    with _cache_lock:
+        _indexes[month] = (identity, index)
+    return index
+
+
+def read_block(month):
+    """
+    Get the decompressed records of a month's segment, from the cache
+    if it was used recently
+    Parameters:
+        month (str): Month name
+    Returns:
+        tuple: (student_id -> (offset, size), decompressed records)
+    """
+    index = read_index(month)
+
+    with _cache_lock:
+        cached_index = _indexes.get(month)
+        cached = _segments.get(month)
+        if cached is not None and cached_index is not None and cached[0] == cached_index[0]:
+            _segments.move_to_end(month)
+            return index, cached[1]
+
+    with open(get_segment_path(month), "rb") as file:
+        buffer = file.read()
+        read_identity = file_identity(os.fstat(file.fileno()))
+
+    # The index is parsed again from this same read, in case the month
+    # was sealed again since read_index looked at it
+    index, start = parse_index(buffer)
+    block = zlib.decompress(buffer[start:])
+    if METRICS_ENABLED:
+        record_io("archive_segment_read", len(buffer))
+
+    with _cache_lock:
+        _indexes[month] = (read_identity, index)
+        _segments[month] = (read_identity, block)
+        _segments.move_to_end(month)
+        while len(_segments) > ARCHIVE_CACHE_SEGMENTS:
+            _segments.popitem(last=False)
+
+    return index, block
+
+
+def load_archived(student_id, month):
+    """
+    Load one sealed record
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+    Returns:
+        dict: Attendance data dictionary, or None if it is not sealed
+    """
+    if student_id not in read_index(month):
+        return None
+
+    index, block = read_block(month)
+    entry = index.get(student_id)
+    if entry is None:
+        return None
+
+    # Copied out, so the record does not keep the whole block in memory
+    offset, size = entry
+    return file_handler.unpack_snapshot(block[offset:offset + size])[0]
+
+
+def archived_months(student_id):
+    """
+    List the sealed months of one student
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        list: Month names in calendar order
+    """
+    return [month for month in MONTH_NAMES if student_id in read_index(month)]
+
+
+def list_archived_students():
+    """
+    List every student with at least one sealed record
+    Returns:
+        set: Student IDs
+    """
+    students = set()
+    for month in MONTH_NAMES:
+        students.update(read_index(month))
+    return students
+
+
+def write_segment(month, segment):
+    """Replace a month's segment file in one step (temp file + rename)"""
+    path = get_segment_path(month)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(segment)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def seal_month(month):
+    """
+    Move every student's record of a closed month into its segment
+    Records sealed earlier stay in the segment unless a student has a
+    newer record of the month, which replaces them
+    Parameters:
+        month (str): Month name
+    Returns:
+        tuple: (records moved in, records in the segment, segment size in bytes)
+    """
+    os.makedirs(get_archive_dir(), exist_ok=True)
+
+    with FileLock(os.path.join(get_archive_dir(), month + ".lock")):
+        records = {}
+        index = read_index(month)
+        if index:
+            offsets, block = read_block(month)
+            for student_id, (offset, size) in offsets.items():
+                records[student_id] = file_handler.unpack_snapshot(block[offset:offset + size])[0]
+
+        # Versions of the live records read, to move only unchanged ones
+        moved = {}
+        for student_id in file_handler.list_file_students():
+            with file_handler.lock_student(student_id):
+                data, version = file_handler.read_record(student_id, month)
+            if data is not None:
+                records[student_id] = data
+                moved[student_id] = version
+
+        if not moved:
+            return 0, len(records), 0
+
+        segment = build_segment(month, records)
+        write_segment(month, segment)
+
+        # The segment is safely on disk: remove the live copies, except
+        # those a session changed meanwhile (they hide the sealed ones)
+        for student_id, version in moved.items():
+            with file_handler.lock_student(student_id, exclusive=True):
+                if file_handler.read_record(student_id, month)[1] == version:
+                    file_handler.delete_file_data(student_id, month, keep_subjects=True)
+
+    return len(moved), len(records), len(segment)
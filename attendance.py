@@ -3,8 +3,12 @@
 # Contains attendance entry functions
 # ============================================================
 
-from utils import get_valid_input, get_valid_choice
+from operator import attrgetter
+
+from utils import get_valid_input, get_valid_choice, parse_valid_number
 from menu import display_section_header
+from calculator import calculate_percentage
+from packed_record import PackedDailyRecord
 
 # Tuple of valid month names (immutable)
 MONTH_NAMES = (
@@ -12,8 +16,395 @@ MONTH_NAMES = (
     "July", "August", "September", "October", "November", "December"
 )
 
-# Tuple of typical working days per month
-TYPICAL_WORKING_DAYS = (22, 20, 23, 21, 22, 20, 23, 22, 21, 23, 21, 18)
+# Valid day-wise marks (H = holiday, skipped)
+VALID_MARKS = ('P', 'A', 'H')
+
+# Removes the valid marks from a day string, leaving only invalid characters
+_STRIP_MARKS = str.maketrans("", "", "PAH")
+
+# Entry types in the order of their stored index
+ENTRY_TYPES = ("detailed", "quick")
+
+# Keys of an attendance record ("percentage" only once it is cached)
+RECORD_FIELDS = ("month", "total_days", "days_present", "days_absent", "daily_record", "entry_type")
+
+# Key -> attribute getter, for AttendanceRecord.__getitem__
+_FIELD_GETTERS = {key: attrgetter(key) for key in RECORD_FIELDS + ("percentage",)}
+
+
+class AttendanceRecord:
+    """
+    Attendance data of one student in one month
+
+    Used exactly like the attendance data dictionary it replaces
+    (data['days_present'], 'percentage' in data, data.items(), ...),
+    but with fixed slots, the month and entry type kept as small
+    indexes and the day-wise marks packed at 2 bits per day, so a month
+    takes less than half the memory of the dictionary and its list of
+    marks. Fields can also be read as attributes (data.days_present).
+    """
+
+    __slots__ = ("_month", "total_days", "days_present", "days_absent",
+                 "_daily_record", "_entry_type", "percentage")
+
+    def __init__(self, month, total_days, days_present, days_absent,
+                 daily_record=(), entry_type="detailed", percentage=None):
+        """
+        Parameters:
+            month (str): Month name
+            total_days (int): Working days
+            days_present (int): Days present
+            days_absent (int): Days absent
+            daily_record (iterable): 'P'/'A' marks, a string of them or a PackedDailyRecord
+            entry_type (str): "detailed" or "quick"
+            percentage (float): Cached percentage, or None when not cached
+                                (then 'percentage' is not a key)
+        """
+        self.month = month
+        self.total_days = total_days
+        self.days_present = days_present
+        self.days_absent = days_absent
+        self.daily_record = daily_record
+        self.entry_type = entry_type
+        self.percentage = percentage
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a record from an attendance data dictionary"""
+        return cls(data['month'], data['total_days'], data['days_present'], data['days_absent'],
+                   data['daily_record'], data['entry_type'], data.get('percentage'))
+
+    @property
+    def month(self):
+        return MONTH_NAMES[self._month]
+
+    @month.setter
+    def month(self, value):
+        try:
+            self._month = MONTH_NAMES.index(value)
+        except ValueError:
+            raise ValueError(f"Invalid month: {value!r}")
+
+    @property
+    def entry_type(self):
+        return ENTRY_TYPES[self._entry_type]
+
+    @entry_type.setter
+    def entry_type(self, value):
+        try:
+            self._entry_type = ENTRY_TYPES.index(value)
+        except ValueError:
+            raise ValueError(f"Invalid entry type: {value!r}")
+
+    @property
+    def daily_record(self):
+        return self._daily_record
+
+    @daily_record.setter
+    def daily_record(self, marks):
+        if not isinstance(marks, PackedDailyRecord):
+            marks = PackedDailyRecord.from_marks(marks)
+        self._daily_record = marks
+
+    def __getitem__(self, key):
+        try:
+            value = _FIELD_GETTERS[key](self)
+        except KeyError:
+            raise KeyError(key) from None
+        if value is None:  # percentage not cached
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in _FIELD_GETTERS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        if key == "percentage":
+            return self.percentage is not None
+        return key in _FIELD_GETTERS
+
+    def keys(self):
+        if self.percentage is not None:
+            return RECORD_FIELDS + ("percentage",)
+        return RECORD_FIELDS
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        """Convert to an attendance data dictionary (marks as a list)"""
+        data = dict(self.items())
+        data['daily_record'] = list(self._daily_record)
+        return data
+
+    def copy(self):
+        """Copy the record, marks included"""
+        marks = self._daily_record
+        return AttendanceRecord(self.month, self.total_days, self.days_present, self.days_absent,
+                                PackedDailyRecord(bytearray(marks.to_bytes()), len(marks)),
+                                self.entry_type, self.get('percentage'))
+
+    def __eq__(self, other):
+        if not isinstance(other, (AttendanceRecord, dict)):
+            return NotImplemented
+        return set(self.keys()) == set(other.keys()) and all(self[key] == other[key] for key in self.keys())
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"AttendanceRecord({self.month!r}, {self.total_days}, {self.days_present}, "
+                f"{self.days_absent}, {''.join(self._daily_record)!r}, {self.entry_type!r})")
+
+
+def parse_month(value):
+    """
+    Convert a month name or number (1-12) to a month name
+    Parameters:
+        value (str): Month name (any case) or number
+    Returns:
+        str: Month name from MONTH_NAMES
+    Raises:
+        ValueError: If the value is not a month
+    """
+    value = value.strip()
+
+    if value.isdigit():
+        return MONTH_NAMES[parse_valid_number(value, 1, 12) - 1]
+
+    for month_name in MONTH_NAMES:
+        if month_name.lower() == value.lower():
+            return month_name
+
+    raise ValueError(f"Unknown month: {value}")
+
+
+def build_detailed_record(month_name, total_days, marks):
+    """
+    Build attendance data from day-wise marks, the same way
+    enter_attendance does: every H is skipped and reduces the
+    working days, so there must be exactly one mark per working day
+    Parameters:
+        month_name (str): Month name
+        total_days (int): Working days entered for the month (1-31)
+        marks (iterable): 'P', 'A' or 'H' for each day in order, or a
+                          whole month as one string like "PPAHP"
+    Returns:
+        AttendanceRecord: Attendance data
+    Raises:
+        ValueError: If a mark is invalid or the number of marks is wrong
+    """
+    total_days = parse_valid_number(total_days, 1, 31)
+
+    if isinstance(marks, str):
+        return build_record_from_string(month_name, total_days, marks)
+
+    daily_record = []
+    days_present = 0
+    days_absent = 0
+    holidays = 0
+
+    for mark in marks:
+        mark = mark.strip().upper()
+
+        if mark == 'P':
+            daily_record.append('P')
+            days_present += 1
+        elif mark == 'A':
+            daily_record.append('A')
+            days_absent += 1
+        elif mark == 'H':
+            holidays += 1
+        else:
+            raise ValueError("Invalid! Enter P, A, or H")
+
+    if len(daily_record) + holidays != total_days:
+        raise ValueError(f"Expected {total_days} marks, got {len(daily_record) + holidays}")
+
+    return AttendanceRecord(month_name, total_days - holidays, days_present, days_absent, daily_record)
+
+
+def build_record_from_string(month_name, total_days, day_string):
+    """
+    Build attendance data from a whole month of marks typed at once,
+    with the same rules as build_detailed_record; the string is checked
+    and counted with str methods instead of one Python step per day
+    Parameters:
+        month_name (str): Month name
+        total_days (int): Working days entered for the month (1-31)
+        day_string (str): One P/A/H per day, e.g. "PPAHP PPPAP"
+                          (spaces between groups of days are ignored)
+    Returns:
+        AttendanceRecord: Attendance data
+    Raises:
+        ValueError: If a mark is invalid or the number of marks is wrong
+    """
+    total_days = parse_valid_number(total_days, 1, 31)
+    marks = "".join(day_string.split()).upper()
+
+    invalid = marks.translate(_STRIP_MARKS)
+    if invalid:
+        raise ValueError(f"Invalid mark {invalid[0]!r} on day {marks.index(invalid[0]) + 1}! Enter P, A, or H")
+
+    if len(marks) != total_days:
+        raise ValueError(f"Expected {total_days} marks, got {len(marks)}")
+
+    holidays = marks.count('H')
+    days_present = marks.count('P')
+
+    return AttendanceRecord(month_name, total_days - holidays, days_present,
+                            total_days - holidays - days_present, marks.replace('H', ''))
+
+
+def build_quick_record(month_name, total_days, days_present):
+    """
+    Build attendance data from totals, the same way
+    enter_quick_attendance does
+    Parameters:
+        month_name (str): Month name
+        total_days (int): Total working days (1-31)
+        days_present (int): Days present (0 to total_days)
+    Returns:
+        AttendanceRecord: Attendance data
+    Raises:
+        ValueError: If a number is out of range
+    """
+    total_days = parse_valid_number(total_days, 1, 31)
+    days_present = parse_valid_number(days_present, 0, total_days)
+
+    # (daily record is not tracked in quick mode)
+    return AttendanceRecord(month_name, total_days, days_present, total_days - days_present, (), "quick")
+
+
+def new_detailed_record(month_name):
+    """
+    Create an empty day-wise record for marking days one at a time
+    Parameters:
+        month_name (str): Month name
+    Returns:
+        AttendanceRecord: Attendance data with no days yet
+    """
+    return AttendanceRecord(month_name, 0, 0, 0, (), "detailed", 0.0)
+
+
+def check_counters(data):
+    """
+    Check that the counters still agree with the daily record
+    Only the lengths are compared, so this costs the same for any month
+    Parameters:
+        data (dict): Attendance data dictionary
+    Raises:
+        ValueError: If the counters and daily record disagree
+    """
+    if data['days_present'] < 0 or data['days_absent'] < 0:
+        raise ValueError("Day counters cannot be negative")
+
+    if data['days_present'] + data['days_absent'] != data['total_days']:
+        raise ValueError("Present + absent days do not match working days")
+
+    if data['entry_type'] == "detailed" and len(data['daily_record']) != data['total_days']:
+        raise ValueError("Daily record length does not match working days")
+
+
+def _check_day_mark(data, status):
+    """Check that a record and mark can be changed day by day"""
+    if data['entry_type'] != "detailed":
+        raise ValueError("Only day-wise records can be changed day by day")
+
+    if status not in ('P', 'A'):
+        raise ValueError("Invalid! Enter P or A")
+
+
+def _update_counts(data, present_change, absent_change):
+    """Apply counter changes, refresh the cached percentage and re-check"""
+    data['days_present'] += present_change
+    data['days_absent'] += absent_change
+    data['total_days'] += present_change + absent_change
+    data['percentage'] = calculate_percentage(data['days_present'], data['total_days'])
+    check_counters(data)
+
+
+def mark_day(data, status):
+    """
+    Add the next working day to a day-wise record
+    Parameters:
+        data (dict): Attendance data dictionary (updated in place)
+        status (str): 'P' or 'A'
+    """
+    _check_day_mark(data, status)
+    if data['total_days'] >= 31:
+        raise ValueError("A month has at most 31 working days")
+
+    data['daily_record'].append(status)
+    if status == 'P':
+        _update_counts(data, 1, 0)
+    else:
+        _update_counts(data, 0, 1)
+
+
+def unmark_day(data, day_number=None):
+    """
+    Remove one working day from a day-wise record
+    Parameters:
+        data (dict): Attendance data dictionary (updated in place)
+        day_number (int): Day to remove (1-based), or None for the last day
+    """
+    _check_day_mark(data, 'P')
+
+    if day_number is None:
+        day_number = len(data['daily_record'])
+    day_number = parse_valid_number(day_number, 1, len(data['daily_record']))
+
+    if day_number == len(data['daily_record']):
+        status = data['daily_record'].pop()
+    else:
+        # Removing a day in the middle shifts the later days down
+        daily_record = list(data['daily_record'])
+        status = daily_record.pop(day_number - 1)
+        data['daily_record'] = daily_record
+
+    if status == 'P':
+        _update_counts(data, -1, 0)
+    else:
+        _update_counts(data, 0, -1)
+
+
+def correct_day(data, day_number, status):
+    """
+    Change the mark of an already recorded working day
+    Parameters:
+        data (dict): Attendance data dictionary (updated in place)
+        day_number (int): Day to correct (1-based)
+        status (str): 'P' or 'A'
+    """
+    _check_day_mark(data, status)
+    day_number = parse_valid_number(day_number, 1, len(data['daily_record']))
+
+    old_status = data['daily_record'][day_number - 1]
+    if old_status == status:
+        return
+
+    data['daily_record'][day_number - 1] = status
+    if status == 'P':
+        _update_counts(data, 1, -1)
+    else:
+        _update_counts(data, -1, 1)
 
 
 def get_month_name():
@@ -31,6 +422,19 @@ def get_month_name():
     return MONTH_NAMES[choice - 1]
 
 
+def calendar_working_days(month_name):
+    """
+    Working days of a month in the school calendar (see school_calendar.py),
+    at least 1 so it can always be entered
+    Parameters:
+        month_name (str): Month name
+    Returns:
+        int: Working days
+    """
+    from school_calendar import get_calendar
+    return max(1, get_calendar().month_working_days(month_name))
+
+
 def enter_attendance():
     """
     Enter detailed day-wise attendance
@@ -40,21 +444,36 @@ def enter_attendance():
     
     # Get month name
     month_name = get_month_name()
-    month_index = MONTH_NAMES.index(month_name)
     
-    # Get total working days
-    suggested_days = TYPICAL_WORKING_DAYS[month_index]
-    print(f"\nTypical working days for {month_name}: {suggested_days}")
+    # Get total working days, suggested by the school calendar
+    suggested_days = calendar_working_days(month_name)
+    print(f"\nWorking days in {month_name} (school calendar): {suggested_days}")
     
     total_days = get_valid_input(
-        "Enter actual working days this month: ", 
-        1, 31
+        f"Enter actual working days this month (Enter = {suggested_days}): ", 
+        1, 31, suggested_days
     )
     
-    # Initialize list to store daily attendance
-    daily_record = []
-    days_present = 0
-    days_absent = 0
+    # The whole month may be typed (or pasted) at once
+    while True:
+        day_string = input(
+            f"\nEnter all {total_days} marks at once (e.g. PPAHP...),\n"
+            "or press Enter to mark day by day: "
+        ).strip()
+        
+        if day_string == "":
+            break
+        
+        try:
+            attendance_data = build_record_from_string(month_name, total_days, day_string)
+        except ValueError as e:
+            print(f"   ⚠ {e}")
+            continue
+        
+        return show_recorded(attendance_data)
+    
+    # Initialize list to store every mark typed (holidays included)
+    marks = []
     
     print("\n" + "─" * 40)
     print("Mark attendance for each day:")
@@ -64,47 +483,46 @@ def enter_attendance():
     print("─" * 40)
     
     day_number = 1
+    working_days = total_days
     
     # Using while loop for day entry
-    while day_number <= total_days:
+    while day_number <= working_days:
         valid_input = False
         
         while not valid_input:
             status = input(f"Day {day_number:2d}: ").strip().upper()
             
             # Validate input using membership operator
-            if status in ['P', 'A', 'H']:
+            if status in VALID_MARKS:
                 valid_input = True
             else:
                 print("   ⚠ Invalid! Enter P, A, or H")
         
+        marks.append(status)
+        
         # Process based on status
-        if status == 'P':
-            daily_record.append('P')
-            days_present += 1
-            day_number += 1
-        elif status == 'A':
-            daily_record.append('A')
-            days_absent += 1
-            day_number += 1
-        else:  # Holiday - skip
+        if status == 'H':  # Holiday - skip
             print("   (Holiday - skipped)")
-            total_days -= 1  # Reduce total working days
-    
-    # Create attendance data dictionary
-    attendance_data = {
-        "month": month_name,
-        "total_days": total_days,
-        "days_present": days_present,
-        "days_absent": days_absent,
-        "daily_record": daily_record,
-        "entry_type": "detailed"
-    }
+            working_days -= 1  # Reduce total working days
+        else:
+            day_number += 1
     
+    attendance_data = build_detailed_record(month_name, total_days, marks)
+    return show_recorded(attendance_data)
+
+
+def show_recorded(attendance_data):
+    """
+    Confirm a day-wise entry
+    Parameters:
+        attendance_data (dict): Attendance data dictionary
+    Returns:
+        dict: The same attendance data
+    """
     print("\n" + "═" * 40)
-    print(f"✓ Attendance for {month_name} recorded!")
-    print(f"  Present: {days_present} days")
-    print(f"  Absent: {days_absent} days")
+    print(f"✓ Attendance for {attendance_data['month']} recorded!")
+    print(f"  Present: {attendance_data['days_present']} days")
+    print(f"  Absent: {attendance_data['days_absent']} days")
     print("═" * 40)
     
     return attendance_data
@@ -121,9 +539,10 @@ def enter_quick_attendance():
     month_name = get_month_name()
     
     # Get total working days
+    suggested_days = calendar_working_days(month_name)
     total_days = get_valid_input(
-        "\nEnter total working days: ", 
-        1, 31
+        f"\nEnter total working days (Enter = {suggested_days}): ", 
+        1, 31, suggested_days
     )
     
     # Get days present
@@ -132,21 +551,7 @@ def enter_quick_attendance():
         0, total_days
     )
     
-    # Calculate days absent
-    days_absent = total_days - days_present
-    
-    # Create empty daily record (not tracked in quick mode)
-    daily_record = []
-    
-    # Create attendance data dictionary
-    attendance_data = {
-        "month": month_name,
-        "total_days": total_days,
-        "days_present": days_present,
-        "days_absent": days_absent,
-        "daily_record": daily_record,
-        "entry_type": "quick"
-    }
+    attendance_data = build_quick_record(month_name, total_days, days_present)
     
     print("\n" + "═" * 40)
     print(f"✓ Quick entry for {month_name} recorded!")
@@ -0,0 +1,226 @@
+# ============================================================
+# MSAAS - Autosave Module
+# Saves the session's records on a background thread, so menu
+# actions never wait for the disk
+# ============================================================
+#
+# AutoSaver.save() only notes a record as pending, one per month (a
+# newer copy of a month replaces the older one). A background thread
+# writes the pending records once no change has come in for
+# AUTOSAVE_DELAY seconds, or straight away when AUTOSAVE_MAX_PENDING
+# months are waiting or a flush is asked for.
+# close() writes everything still pending and stops the thread; it runs
+# when the program exits, including on Ctrl+C and on SIGTERM/SIGHUP
+# (see install_exit_handlers).
+# The store's errors during those saves are collected by the thread
+# (file_handler.collect_store_messages) and shown by the menu with
+# take_messages(), so they never land in the middle of a prompt.
+
+import atexit
+import signal
+import threading
+import time
+
+from file_handler import save_versioned_data, collect_store_messages
+
+# Seconds without a new change before pending records are written
+AUTOSAVE_DELAY = 2.0
+
+# Pending months that are written without waiting for the delay
+AUTOSAVE_MAX_PENDING = 8
+
+# Seconds close() waits for the thread to stop after the last flush
+AUTOSAVE_STOP_TIMEOUT = 5.0
+
+
+class AutoSaver:
+    """Debounced background saving of one student's records"""
+
+    def __init__(self, student_id, delay=AUTOSAVE_DELAY, max_pending=AUTOSAVE_MAX_PENDING):
+        """
+        Parameters:
+            student_id (str): Student whose records are saved
+            delay (float): Seconds without changes before saving
+            max_pending (int): Pending months that are saved at once
+        """
+        self.student_id = student_id
+        self.delay = delay
+        self.max_pending = max_pending
+
+        self._condition = threading.Condition()
+        self._pending = {}       # month -> (record copy, check version, confirm when saved)
+        self._versions = {}      # month -> version of the last save or load
+        self._conflicts = set()  # months another session saved first
+        self._messages = []
+        self._last_change = 0.0
+        self._saving = False
+        self._flushing = False
+        self._stopping = False
+
+        self._thread = threading.Thread(target=self._run, name="msaas-autosave", daemon=True)
+        self._thread.start()
+
+    def set_version(self, month, version):
+        """
+        Remember the version of a month as loaded
+        Parameters:
+            month (str): Month name
+            version (int): Version from load_versioned_data (0 = not saved)
+        """
+        with self._condition:
+            self._versions[month] = version
+
+    def save(self, data, check_version=False):
+        """
+        Note a record to be saved soon (returns at once)
+        Parameters:
+            data (dict): Attendance data (copied, so it may change afterwards)
+            check_version (bool): Refuse the save if another session saved the
+                                  month since this session last loaded or saved it,
+                                  and confirm with a message once it is saved
+        """
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("Autosave has been closed")
+            # A month queued without the check stays unchecked: the newer
+            # copy includes that change, and a conflict would lose it.
+            # A checked (manual) save is still confirmed to the user
+            queued = self._pending.get(data['month'], (None, True, False))
+            self._pending[data['month']] = (data.copy(), check_version and queued[1],
+                                            check_version or queued[2])
+            self._conflicts.discard(data['month'])
+            self._last_change = time.monotonic()
+            self._condition.notify_all()
+
+    def flush(self, wait=True):
+        """
+        Write every pending record now
+        Parameters:
+            wait (bool): Wait until they are written
+        """
+        with self._condition:
+            if not self._pending and not self._saving:
+                return
+            self._flushing = True
+            self._condition.notify_all()
+            if wait:
+                while (self._pending or self._saving) and self._thread.is_alive():
+                    self._condition.wait()
+
+    def take_messages(self):
+        """
+        Get the messages of saves finished since the last call
+        Returns:
+            list: Lines to show the user
+        """
+        with self._condition:
+            messages, self._messages = self._messages, []
+        return messages
+
+    def take_conflicts(self):
+        """
+        Get the months another session saved first since the last call
+        Returns:
+            set: Month names
+        """
+        with self._condition:
+            conflicts, self._conflicts = self._conflicts, set()
+        return conflicts
+
+    def close(self):
+        """Write every pending record and stop the thread (safe to call twice)"""
+        self.flush()
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join(AUTOSAVE_STOP_TIMEOUT)
+
+    def _next_batch(self):
+        """
+        Wait until pending records are due (called with the lock held)
+        Returns:
+            dict: Records to write, or None when the thread should stop
+        """
+        while True:
+            if not self._pending:
+                self._flushing = False
+                if self._stopping:
+                    return None
+                self._condition.wait()
+                continue
+
+            if not (self._flushing or self._stopping) and len(self._pending) < self.max_pending:
+                remaining = self._last_change + self.delay - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+            batch, self._pending = self._pending, {}
+            return batch
+
+    def _run(self):
+        """Background thread: write pending records as they fall due"""
+        with self._condition:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                self._saving = True
+
+                # The disk is written without holding the lock, so the menu
+                # can keep adding changes meanwhile
+                self._condition.release()
+                try:
+                    results = []
+                    with collect_store_messages() as store_messages:
+                        for month, (data, check_version, confirm) in batch.items():
+                            expected = self._versions.get(month) if check_version else None
+                            try:
+                                version = save_versioned_data(data, self.student_id, expected)
+                            except Exception as e:
+                                store_messages.append(f"⚠ Error saving data: {e}")
+                                version = None
+                            results.append((month, check_version, confirm, expected, version))
+                finally:
+                    self._condition.acquire()
+
+                self._messages.extend(store_messages)
+
+                for month, check_version, confirm, expected, version in results:
+                    if version is not None:
+                        self._versions[month] = version
+                        if confirm:
+                            self._messages.append(f"✓ {month} saved successfully!")
+                    elif check_version and expected is not None:
+                        self._conflicts.add(month)
+                    else:
+                        self._messages.append(f"⚠ {month} could not be saved - choose 9 to try again")
+
+                self._saving = False
+                self._condition.notify_all()
+
+
+def _close_on_exit(saver):
+    """Save what is pending and show the messages of the last saves"""
+    saver.close()
+    for message in saver.take_messages():
+        print(message)
+
+
+def _exit_on_signal(signum, frame):
+    """Turn a termination signal into a normal exit, so exit handlers run"""
+    raise SystemExit(128 + signum)
+
+
+def install_exit_handlers(saver):
+    """
+    Make sure pending records are written however the program ends:
+    normal exit, an exception (e.g. Ctrl+C), SIGTERM or SIGHUP
+    Parameters:
+        saver (AutoSaver): Saver to close on exit
+    """
+    atexit.register(_close_on_exit, saver)
+    for name in ("SIGTERM", "SIGHUP"):
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            signal.signal(signum, _exit_on_signal)
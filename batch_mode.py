@@ -0,0 +1,254 @@
+# ============================================================
+# MSAAS - Batch Mode Module
+# Runs menu options 1-8 over a roster file without prompts
+# ============================================================
+#
+# Roster format: one command per line, comma-separated,
+# blank lines and lines starting with '#' are ignored
+#
+#   student_id, month, command, arguments...
+#
+#   1 / enter    total_days, marks     e.g.  s001,March,enter,5,PPAHP
+#   2 / quick    total_days, present   e.g.  s001,March,quick,22,18
+#   3 / summary                        e.g.  s001,March,summary
+#   4 / status
+#   5 / daily
+#   6 / needed   remaining_days        e.g.  s001,March,needed,8
+#   7 / leaves   remaining_days, target (75, 80, 85 or 90)
+#   8 / report
+#   mark         status                e.g.  s001,March,mark,P
+#   unmark       day                   e.g.  s001,March,unmark,12
+#   correct      day, status           e.g.  s001,March,correct,12,A
+
+import sys
+from contextlib import redirect_stdout
+
+from attendance import (parse_month, build_detailed_record, build_quick_record,
+                        new_detailed_record, mark_day, unmark_day, correct_day)
+from calculator import calculate_days_needed, calculate_safe_leaves, SAFE_LEAVE_TARGETS
+from display import view_summary, view_daily_record, check_status, view_monthly_report
+from file_handler import (save_data, load_data, journal_mark_day,
+                          journal_unmark_day, journal_correct_day)
+from instrumentation import timed
+from utils import is_valid_student_id, parse_valid_number
+
+# Command name of each menu option number
+COMMAND_ALIASES = {
+    "1": "enter",
+    "2": "quick",
+    "3": "summary",
+    "4": "status",
+    "5": "daily",
+    "6": "needed",
+    "7": "leaves",
+    "8": "report"
+}
+
+# Number of arguments each command takes after the command name
+COMMAND_ARGUMENT_COUNTS = {
+    "enter": 2,
+    "quick": 2,
+    "summary": 0,
+    "status": 0,
+    "daily": 0,
+    "needed": 1,
+    "leaves": 2,
+    "report": 0,
+    "mark": 1,
+    "unmark": 1,
+    "correct": 2
+}
+
+# Commands that only show data, using the same functions as the menu
+VIEW_COMMANDS = {
+    "summary": view_summary,
+    "status": check_status,
+    "daily": view_daily_record,
+    "report": view_monthly_report
+}
+
+
+def parse_roster_line(line):
+    """
+    Split and validate one roster line
+    Parameters:
+        line (str): Line from the roster file
+    Returns:
+        tuple: (student_id, month, command, arguments), or None for
+               blank and comment lines
+    Raises:
+        ValueError: If the line is not a valid command
+    """
+    line = line.strip()
+    if line == "" or line.startswith("#"):
+        return None
+
+    fields = [field.strip() for field in line.split(",")]
+    if len(fields) < 3:
+        raise ValueError("Expected: student_id, month, command, arguments...")
+
+    student_id = fields[0]
+    if not is_valid_student_id(student_id):
+        raise ValueError(f"Invalid student ID: {student_id}")
+
+    month = parse_month(fields[1])
+
+    command = fields[2].lower()
+    command = COMMAND_ALIASES.get(command, command)
+    if command not in COMMAND_ARGUMENT_COUNTS:
+        raise ValueError(f"Unknown command: {fields[2]}")
+
+    arguments = fields[3:]
+    if len(arguments) != COMMAND_ARGUMENT_COUNTS[command]:
+        raise ValueError(f"'{command}' takes {COMMAND_ARGUMENT_COUNTS[command]} argument(s)")
+
+    return student_id, month, command, arguments
+
+
+def check_saved(saved, key, records):
+    """
+    Stop a line whose change the store did not save
+    Parameters:
+        saved (bool): Result of the store call
+        key (tuple): (student_id, month) of the changed record
+        records (dict): (student_id, month) -> data already loaded this run
+    Raises:
+        ValueError: If not saved (the kept copy, already changed, is
+                    dropped, so later lines read the store again)
+    """
+    if not saved:
+        records.pop(key, None)
+        raise ValueError("Not saved")
+
+
+def save_record(data, student_id, records):
+    """
+    Save a whole record and keep it for the following lines
+    Parameters:
+        data (dict): Attendance data
+        student_id (str): Student ID
+        records (dict): (student_id, month) -> data already loaded this run
+    Raises:
+        ValueError: If the store did not save it
+    """
+    key = (student_id, data['month'])
+    check_saved(save_data(data, student_id), key, records)
+    records[key] = data
+
+
+def run_command(student_id, month, command, arguments, records):
+    """
+    Run one roster command, printing its output like the menu would
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+        command (str): Command name
+        arguments (list): Command arguments as text
+        records (dict): (student_id, month) -> data already loaded this run
+    Raises:
+        ValueError: If an argument is invalid or a change was not saved
+    """
+    key = (student_id, month)
+
+    if command == "enter":
+        data = build_detailed_record(month, arguments[0], arguments[1].replace(" ", ""))
+        save_record(data, student_id, records)
+        print(f"✓ Attendance for {month} recorded!")
+        return
+
+    if command == "quick":
+        data = build_quick_record(month, arguments[0], arguments[1])
+        save_record(data, student_id, records)
+        print(f"✓ Quick entry for {month} recorded!")
+        return
+
+    if key not in records:
+        records[key] = load_data(student_id, month)
+    data = records[key]
+
+    if command == "mark":
+        status = arguments[0].upper()
+        if data is None:
+            data = new_detailed_record(month)
+        mark_day(data, status)
+        records[key] = data
+        check_saved(journal_mark_day(student_id, month, status), key, records)
+        print(f"✓ Day {data['total_days']} marked {status}")
+
+    elif command in ("unmark", "correct") and data is None:
+        raise ValueError("No attendance data found")
+
+    elif command == "unmark":
+        day_number = parse_valid_number(arguments[0], 1, 31)
+        unmark_day(data, day_number)
+        check_saved(journal_unmark_day(student_id, month, day_number), key, records)
+        print(f"✓ Day {day_number} removed")
+
+    elif command == "correct":
+        day_number = parse_valid_number(arguments[0], 1, 31)
+        status = arguments[1].upper()
+        correct_day(data, day_number, status)
+        check_saved(journal_correct_day(student_id, month, day_number, status), key, records)
+        print(f"✓ Day {day_number} corrected to {status}")
+
+    elif command in VIEW_COMMANDS:
+        VIEW_COMMANDS[command](data)
+
+    elif command == "needed":
+        remaining_days = parse_valid_number(arguments[0], 0, 31)
+        calculate_days_needed(data, remaining_days)
+
+    else:  # leaves
+        remaining_days = parse_valid_number(arguments[0], 0, 31)
+        target_percent = parse_valid_number(arguments[1], 0, 100)
+        if target_percent not in SAFE_LEAVE_TARGETS:
+            raise ValueError(f"Target must be one of {SAFE_LEAVE_TARGETS}")
+        calculate_safe_leaves(data, remaining_days, target_percent)
+
+
+def run_batch(roster_lines, errors=sys.stderr):
+    """
+    Run every command of a roster, writing results to stdout
+    Parameters:
+        roster_lines (iterable): Lines of the roster file
+        errors (file): Where invalid lines are reported
+    Returns:
+        int: Number of lines that failed
+    """
+    records = {}
+    failures = 0
+
+    for line_number, line in enumerate(roster_lines, start=1):
+        try:
+            parsed = parse_roster_line(line)
+            if parsed is None:
+                continue
+
+            student_id, month, command, arguments = parsed
+            print(f"\n=== {student_id} | {month} | {command} ===")
+            with timed("batch." + command):
+                run_command(student_id, month, command, arguments, records)
+
+        except ValueError as e:
+            failures += 1
+            print(f"⚠ Line {line_number}: {e}", file=errors)
+
+    return failures
+
+
+def run_batch_file(roster_path, output_path=None):
+    """
+    Run a roster file, streaming results to stdout or an output file
+    Parameters:
+        roster_path (str): Roster file to read
+        output_path (str): File to write results to, or None for stdout
+    Returns:
+        int: Number of lines that failed
+    """
+    with open(roster_path, "r", encoding="utf-8") as roster:
+        if output_path is None:
+            return run_batch(roster)
+
+        with open(output_path, "w", encoding="utf-8") as output:
+            with redirect_stdout(output):
+                return run_batch(roster)
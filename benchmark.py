@@ -0,0 +1,339 @@
+# ============================================================
+# MSAAS - Benchmark Module
+# Seeded synthetic data and timing of every module at scale
+# ============================================================
+#
+# Usage:
+#   python benchmark.py --students 1,100,10000 --output before.json
+#   python benchmark.py --students 1,100,10000 --output after.json
+#   python benchmark.py --compare before.json after.json
+#
+# Each benchmark reports throughput, latency percentiles and peak
+# memory (measured in a second, untimed pass under tracemalloc).
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import file_handler
+from attendance import MONTH_NAMES, build_detailed_record
+from calculator import calculate_percentage, calculate_projection
+from display import render_summary, render_monthly_report, render_status
+from school_calendar import SchoolCalendar
+
+# Student counts benchmarked by default
+DEFAULT_SIZES = (1, 100, 10000)
+
+# Largest supported synthetic school
+MAX_STUDENTS = 100000
+
+# Chance that a day is a holiday in generated records
+HOLIDAY_RATE = 0.03
+
+# Working days of generated months: Monday to Friday of a fixed year,
+# so results do not depend on the school's calendar or today's date
+BENCHMARK_CALENDAR = SchoolCalendar()
+BENCHMARK_YEAR = 2025
+
+
+def generate_record(rng, month_index, attendance_rate):
+    """
+    Generate one realistic day-wise record
+    Parameters:
+        rng (random.Random): Seeded random generator
+        month_index (int): Index into MONTH_NAMES
+        attendance_rate (float): Chance the student is present on a day
+    Returns:
+        dict: Attendance data dictionary
+    """
+    working_days = BENCHMARK_CALENDAR.month_working_days(MONTH_NAMES[month_index], BENCHMARK_YEAR)
+
+    marks = []
+    for day in range(working_days):
+        roll = rng.random()
+        if roll < HOLIDAY_RATE:
+            marks.append('H')
+        elif roll < HOLIDAY_RATE + (1 - HOLIDAY_RATE) * attendance_rate:
+            marks.append('P')
+        else:
+            marks.append('A')
+
+    return build_detailed_record(MONTH_NAMES[month_index], working_days, marks)
+
+
+def generate_school(student_count, months=MONTH_NAMES, seed=42):
+    """
+    Generate records for a synthetic school
+    Each student gets a personal attendance rate (most between 65% and
+    98%), so percentages spread across every status band
+    Parameters:
+        student_count (int): Number of students (1 to MAX_STUDENTS)
+        months (tuple): Month names to generate
+        seed (int): Random seed, so runs are repeatable
+    Yields:
+        tuple: (student_id, attendance data dictionary)
+    """
+    if student_count < 1 or student_count > MAX_STUDENTS:
+        raise ValueError(f"Student count must be 1 to {MAX_STUDENTS}")
+
+    rng = random.Random(seed)
+    for number in range(student_count):
+        student_id = f"s{number:06d}"
+        attendance_rate = min(1.0, max(0.3, rng.gauss(0.84, 0.09)))
+        for month in months:
+            yield student_id, generate_record(rng, MONTH_NAMES.index(month), attendance_rate)
+
+
+def percentile(sorted_values, fraction):
+    """Value below which the given fraction of sorted values fall"""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_benchmark(name, students, operation, items, measure_memory=True):
+    """
+    Time an operation over every item, then measure its peak memory
+    Parameters:
+        name (str): Benchmark name
+        students (int): School size, for the report
+        operation (function): Called once per item
+        items (list): Arguments for operation
+        measure_memory (bool): Also run an untimed pass under tracemalloc
+    Returns:
+        dict: Throughput, latency percentiles (microseconds) and peak memory
+    """
+    latencies = []
+    clock = time.perf_counter_ns
+
+    start = clock()
+    for item in items:
+        before = clock()
+        operation(item)
+        latencies.append(clock() - before)
+    elapsed = (clock() - start) / 1e9
+
+    latencies.sort()
+    result = {
+        "name": name,
+        "students": students,
+        "operations": len(items),
+        "seconds": round(elapsed, 6),
+        "throughput": round(len(items) / elapsed, 1) if elapsed > 0 else None,
+        "p50_us": round(percentile(latencies, 0.50) / 1000, 2),
+        "p90_us": round(percentile(latencies, 0.90) / 1000, 2),
+        "p99_us": round(percentile(latencies, 0.99) / 1000, 2),
+        "max_us": round(latencies[-1] / 1000, 2) if latencies else 0,
+        "peak_kib": None
+    }
+
+    if measure_memory:
+        tracemalloc.start()
+        for item in items:
+            operation(item)
+        result["peak_kib"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+
+    return result
+
+
+def benchmark_storage(records, students, measure_memory):
+    """Time save_data and load_data round-trips in a temporary store"""
+    results = []
+    original_dir = file_handler.DATA_DIR
+    temp_dir = tempfile.mkdtemp(prefix="msaas_bench_")
+
+    try:
+        file_handler.DATA_DIR = temp_dir
+
+        results.append(run_benchmark(
+            "save_data", students,
+            lambda pair: file_handler.save_data(pair[1], pair[0]),
+            records, False
+        ))
+        results.append(run_benchmark(
+            "load_data", students,
+            lambda pair: file_handler.load_data(pair[0], pair[1]['month']),
+            records, measure_memory
+        ))
+    finally:
+        file_handler.DATA_DIR = original_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return results
+
+
+def benchmark_calculation(records, students, measure_memory):
+    """Time percentage and projection calculations"""
+    data_list = [data for student_id, data in records]
+
+    def calculate(data):
+        calculate_percentage(data['days_present'], data['total_days'])
+        for target in (75, 80, 85):
+            calculate_projection(data['days_present'], data['total_days'], 5, target)
+
+    results = [run_benchmark("calculate", students, calculate, data_list, measure_memory)]
+
+    try:
+        from cohort_calculator import calculate_cohort_from_records
+    except ImportError:
+        return results
+
+    results.append(run_benchmark(
+        "calculate_cohort", students,
+        lambda batch: calculate_cohort_from_records(batch, 5),
+        [data_list], measure_memory
+    ))
+    return results
+
+
+def benchmark_rendering(records, students, measure_memory):
+    """Time rendering of the summary, status and monthly report screens"""
+    data_list = [data for student_id, data in records]
+    return [
+        run_benchmark("render_summary", students, render_summary, data_list, measure_memory),
+        run_benchmark("render_status", students, render_status, data_list, measure_memory),
+        run_benchmark("render_monthly_report", students, render_monthly_report, data_list, measure_memory)
+    ]
+
+
+def benchmark_memory(records, students, measure_memory):
+    """Measure the memory every record holds once built (always measured)"""
+    rebuilt = []
+    tracemalloc.start()
+    for student_id, data in records:
+        rebuilt.append(build_detailed_record(data['month'], data['total_days'], list(data['daily_record'])))
+    held = tracemalloc.get_traced_memory()[0] - sys.getsizeof(rebuilt)
+    tracemalloc.stop()
+
+    return [{
+        "name": "records_in_memory",
+        "students": students,
+        "operations": len(records),
+        "throughput": None,
+        "bytes_per_record": round(held / len(records), 1) if records else 0,
+        "peak_kib": round(held / 1024, 1)
+    }]
+
+
+# Benchmark groups that can be picked with --benchmarks
+BENCHMARKS = {
+    "storage": benchmark_storage,
+    "calculation": benchmark_calculation,
+    "rendering": benchmark_rendering,
+    "memory": benchmark_memory
+}
+
+
+def get_version():
+    """Current git commit of the code being measured, if known"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(sizes=DEFAULT_SIZES, groups=tuple(BENCHMARKS), months=("March",), seed=42, measure_memory=True):
+    """
+    Run the chosen benchmark groups for every school size
+    Returns:
+        dict: Machine-readable results
+    """
+    results = []
+    for students in sizes:
+        records = list(generate_school(students, months, seed))
+        for group in groups:
+            results.extend(BENCHMARKS[group](records, students, measure_memory))
+            print(f"  done: {group} x {students} students", file=sys.stderr)
+
+    return {
+        "version": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "months": list(months),
+        "results": results
+    }
+
+
+def compare_results(old_path, new_path, stream=sys.stdout):
+    """
+    Print throughput and p99 changes between two result files
+    Parameters:
+        old_path (str): Earlier results JSON
+        new_path (str): Later results JSON
+    """
+    with open(old_path, "r", encoding="utf-8") as file:
+        old = json.load(file)
+    with open(new_path, "r", encoding="utf-8") as file:
+        new = json.load(file)
+
+    old_results = {(r["name"], r["students"]): r for r in old["results"]}
+
+    print(f"{'benchmark':<24}{'students':>9}{'ops/s old':>13}{'ops/s new':>13}{'change':>9}{'p99 old':>10}{'p99 new':>10}", file=stream)
+    for result in new["results"]:
+        before = old_results.get((result["name"], result["students"]))
+        if before is None or not before["throughput"] or not result["throughput"]:
+            continue
+        change = (result["throughput"] / before["throughput"] - 1) * 100
+        print(f"{result['name']:<24}{result['students']:>9}{before['throughput']:>13.1f}"
+              f"{result['throughput']:>13.1f}{change:>+8.1f}%{before['p99_us']:>10}{result['p99_us']:>10}", file=stream)
+
+    for result in new["results"]:
+        before = old_results.get((result["name"], result["students"]))
+        if before is None or "bytes_per_record" not in result or not before.get("bytes_per_record"):
+            continue
+        change = (result["bytes_per_record"] / before["bytes_per_record"] - 1) * 100
+        print(f"{result['name']:<24}{result['students']:>9}{before['bytes_per_record']:>11.1f} B"
+              f"{result['bytes_per_record']:>11.1f} B{change:>+8.1f}%", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MSAAS benchmark suite")
+    parser.add_argument("--students", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help=f"comma-separated school sizes (1 to {MAX_STUDENTS})")
+    parser.add_argument("--months", default="March",
+                        help="comma-separated month names to generate per student")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS),
+                        help="comma-separated groups: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--output", metavar="FILE", help="write JSON results to FILE")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two result files instead of running")
+    options = parser.parse_args(argv)
+
+    if options.compare:
+        compare_results(*options.compare)
+        return
+
+    sizes = [int(size) for size in options.students.split(",")]
+    groups = [group.strip() for group in options.benchmarks.split(",")]
+    months = [month.strip() for month in options.months.split(",")]
+
+    report = run_suite(sizes, groups, months, options.seed, not options.no_memory)
+    text = json.dumps(report, indent=2)
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# ============================================================
+# MSAAS - Bulk Report Module
+# Renders the monthly report of every student on all CPU cores
+# ============================================================
+#
+# Roster format (optional): one student per line, blank lines and
+# lines starting with '#' are ignored
+#
+#   student_id[, section]
+#
+# Without a roster, every student in the attendance store is used.
+
+import os
+import sys
+from multiprocessing import Pool
+
+from attendance import parse_month
+from display import render_monthly_report
+from file_handler import load_data, list_students, get_store, use_store
+from utils import is_valid_student_id
+
+# Section used for students listed without one
+DEFAULT_SECTION = "all"
+
+
+def read_roster(path, errors=sys.stderr):
+    """
+    Read (student_id, section) pairs from a roster file
+    Parameters:
+        path (str): Roster file
+        errors (file): Where invalid lines are reported
+    Returns:
+        list: (student_id, section) tuples in file order
+    """
+    students = []
+
+    with open(path, "r", encoding="utf-8") as roster:
+        for line_number, line in enumerate(roster, start=1):
+            line = line.strip()
+            if line == "" or line.startswith("#"):
+                continue
+
+            fields = [field.strip() for field in line.split(",")]
+            student_id = fields[0]
+            section = fields[1] if len(fields) > 1 and fields[1] else DEFAULT_SECTION
+
+            if len(fields) > 2 or not is_valid_student_id(student_id) or not is_valid_student_id(section):
+                print(f"⚠ Line {line_number}: expected student_id[, section]", file=errors)
+                continue
+
+            students.append((student_id, section))
+
+    return students
+
+
+def get_report_path(output_dir, student_id, section, month):
+    """
+    Get the file a student's report is written to
+    Parameters:
+        output_dir (str): Base folder for reports
+        student_id (str): Student ID
+        section (str): Section name
+        month (str): Month name
+    Returns:
+        str: File path, e.g. reports/XI-A/s001_March.txt
+    """
+    return os.path.join(output_dir, section, f"{student_id}_{month}.txt")
+
+
+def render_student_report(job):
+    """
+    Render one student's monthly report (runs inside a worker process)
+    Parameters:
+        job (tuple): (student_id, section, month, output_dir or None)
+    Returns:
+        tuple: (student_id, report text, True if the student has data)
+               The text is None when there is no data or it was
+               written to output_dir
+    """
+    student_id, section, month, output_dir = job
+
+    data = load_data(student_id, month)
+    if data is None:
+        return student_id, None, False
+
+    report = render_monthly_report(data)
+
+    if output_dir is None:
+        return student_id, report, True
+
+    path = get_report_path(output_dir, student_id, section, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(report)
+
+    return student_id, None, True
+
+
+def generate_reports(students, month, output=None, output_dir=None, workers=None):
+    """
+    Render the monthly report of many students in parallel
+    Reports go either to one file per student under output_dir, or to
+    one combined stream in roster order
+    Parameters:
+        students (list): (student_id, section) tuples
+        month (str): Month name or number
+        output (file): Stream for the combined output (default stdout)
+        output_dir (str): Folder for one file per student, or None
+        workers (int): Worker processes (default: number of CPU cores)
+    Returns:
+        tuple: (reports written, students without data)
+    """
+    month = parse_month(month)
+    if output is None:
+        output = sys.stdout
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    jobs = [(student_id, section, month, output_dir) for student_id, section in students]
+
+    # Large chunks keep inter-process traffic low; several per worker
+    # keep all cores busy until the end
+    chunk_size = max(1, len(jobs) // (workers * 8))
+
+    written = 0
+    missing = 0
+
+    # Workers read from the same store (file folder or database) as this process
+    with Pool(processes=workers, initializer=use_store, initargs=(get_store(),)) as pool:
+        # imap returns results in roster order, so combined output is ordered
+        for student_id, report, found in pool.imap(render_student_report, jobs, chunk_size):
+            if not found:
+                missing += 1
+                continue
+
+            written += 1
+            if report is not None:
+                output.write(f"\n=== {student_id} ===")
+                output.write(report)
+
+    return written, missing
+
+
+def generate_reports_for_store(month, roster_path=None, output_path=None, output_dir=None, workers=None):
+    """
+    Run generate_reports for a roster file, or every stored student
+    Parameters:
+        month (str): Month name or number
+        roster_path (str): Roster file, or None for every stored student
+        output_path (str): Combined output file, or None for stdout
+        output_dir (str): Folder for one file per student, or None
+        workers (int): Worker processes (default: number of CPU cores)
+    Returns:
+        tuple: (reports written, students without data)
+    """
+    if roster_path is not None:
+        students = read_roster(roster_path)
+    else:
+        students = [(student_id, DEFAULT_SECTION) for student_id in list_students()]
+
+    if output_path is None:
+        return generate_reports(students, month, None, output_dir, workers)
+
+    with open(output_path, "w", encoding="utf-8") as output:
+        return generate_reports(students, month, output, output_dir, workers)
@@ -4,7 +4,9 @@
 # ============================================================
 
 from utils import get_valid_input
-from menu import display_section_header, display_divider
+from menu import render_section_header, DIVIDER_TEXT
+from render import TextBlock, write_text
+from instrumentation import instrument
 import math  # Using math module
 
 # Constants
@@ -12,6 +14,16 @@ MINIMUM_ATTENDANCE_PERCENT = 75
 WARNING_THRESHOLD = 80
 SAFE_THRESHOLD = 85
 
+# Status bands as (lowest percentage, status, message, symbol),
+# highest band first
+STATUS_BANDS = (
+    (90, "EXCELLENT", "Outstanding attendance! Keep it up!", "★★★"),
+    (85, "VERY GOOD", "Great attendance record!", "★★☆"),
+    (80, "GOOD", "Good, but aim higher!", "★☆☆"),
+    (75, "SATISFACTORY", "Just meeting the requirement.", "✓"),
+    (0, "CRITICAL", "Below minimum! Take action now!", "⚠")
+)
+
 
 def calculate_percentage(days_present, total_days):
     """
@@ -29,6 +41,36 @@ def calculate_percentage(days_present, total_days):
     return round(percentage, 2)
 
 
+def get_percentage(data):
+    """
+    Get the attendance percentage of a record, using the value cached
+    by the day-by-day update functions when there is one
+    Parameters:
+        data (dict): Attendance data dictionary
+    Returns:
+        float: Attendance percentage rounded to 2 decimals
+    """
+    if 'percentage' in data:
+        return data['percentage']
+
+    return calculate_percentage(data['days_present'], data['total_days'])
+
+
+def get_status_band(percentage):
+    """
+    Find the status band of an attendance percentage
+    Parameters:
+        percentage (float): Attendance percentage
+    Returns:
+        tuple: (lowest percentage, status, message, symbol) from STATUS_BANDS
+    """
+    for band in STATUS_BANDS:
+        if percentage >= band[0]:
+            return band
+
+    return STATUS_BANDS[-1]
+
+
 def calculate_required_days(target_percent, total_days):
     """
     Calculate days required to achieve target percentage
@@ -42,147 +84,257 @@ def calculate_required_days(target_percent, total_days):
     return math.ceil(required)  # Using math.ceil
 
 
-def calculate_days_needed(data):
+# Targets shown by calculate_days_needed, with their table labels
+PROJECTION_TARGETS = ((75, "Min"), (80, "Safe"), (85, "Good"))
+
+
+@instrument("calc.projection")
+def calculate_projection(current_present, current_total, remaining_days, target_percent):
+    """
+    Project what it takes to reach a target by the end of the month
+    Parameters:
+        current_present (int): Days present so far
+        current_total (int): Working days so far
+        remaining_days (int): Remaining working days
+        target_percent (float): Target attendance percentage
+    Returns:
+        dict: target, new_total, required, days_needed (negative when
+              already ahead), safe_leaves (negative when short) and
+              reachable (True if the target can still be met)
+    """
+    new_total = current_total + remaining_days
+    required = calculate_required_days(target_percent, new_total)
+    days_needed = required - current_present
+
+    return {
+        "target": target_percent,
+        "new_total": new_total,
+        "required": required,
+        "days_needed": days_needed,
+        "safe_leaves": remaining_days - days_needed,
+        "reachable": days_needed <= remaining_days
+    }
+
+
+def calculate_subject_report(record, remaining_periods=None, target_percent=MINIMUM_ATTENDANCE_PERCENT):
+    """
+    Percentage, periods needed and safe leaves of every subject, with
+    the counts taken from one pass over the packed subject record
+    Parameters:
+        record (SubjectRecord): Period-by-period marks of one month
+        remaining_periods (dict): subject -> periods left this month, or None for none
+        target_percent (float): Percentage each subject must reach
+    Returns:
+        list: One dict per subject (subject, present, absent, total,
+              percentage, remaining and the calculate_projection values)
+    """
+    if remaining_periods is None:
+        remaining_periods = {}
+
+    report = []
+    for subject, (present, absent) in record.counts().items():
+        remaining = remaining_periods.get(subject, 0)
+        row = {
+            "subject": subject,
+            "present": present,
+            "absent": absent,
+            "total": present + absent,
+            "percentage": calculate_percentage(present, present + absent),
+            "remaining": remaining
+        }
+        row.update(calculate_projection(present, present + absent, remaining, target_percent))
+        report.append(row)
+
+    return report
+
+
+@instrument("render.projection")
+def render_projection(current_present, current_total, remaining_days):
+    """
+    Build the attendance projection table and recommendation
+    Parameters:
+        current_present (int): Days present so far
+        current_total (int): Working days so far
+        remaining_days (int): Remaining working days (more than 0)
+    Returns:
+        str: Rendered text
+    """
+    # Calculate projections
+    projections = [
+        calculate_projection(current_present, current_total, remaining_days, target)
+        for target, label in PROJECTION_TARGETS
+    ]
+    days_needed_75 = projections[0]['days_needed']
+    
+    # Display projections
+    block = TextBlock()
+    block.line()
+    block.top(46)
+    block.centered("         ATTENDANCE PROJECTION", 46)
+    block.divider(46)
+    block.row(f"  New Total Days: {current_total + remaining_days}", 46)
+    block.divider(46)
+    block.line("│  Target     │  Days Needed  │  Leaves OK   │".ljust(47))
+    block.divider(46)
+    
+    # One row per target
+    for projection, (target, label) in zip(projections, PROJECTION_TARGETS):
+        days_needed = max(0, projection['days_needed'])
+        leaves_ok = max(0, remaining_days - days_needed)
+        status = "✓" if projection['reachable'] else "✗"
+        block.line(f"│  {f'{target}% ({label})':<10} │  {days_needed:^11}  │  {leaves_ok:^10}  │ {status}")
+    
+    block.bottom(46)
+    
+    # Recommendations
+    block.line("\n📋 Recommendation:")
+    if days_needed_75 <= 0:
+        block.line(f"   You already qualify for 75%!")
+        block.line(f"   You can take up to {remaining_days + abs(days_needed_75)} more leaves.")
+    elif days_needed_75 <= remaining_days:
+        block.line(f"   Be present for at least {days_needed_75} of the next {remaining_days} days.")
+    else:
+        shortfall = days_needed_75 - remaining_days
+        block.line(f"   ⚠ Cannot reach 75% even with full attendance.")
+        block.line(f"   Shortfall: {shortfall} days")
+    
+    return block.text()
+
+
+def get_remaining_days(data):
+    """
+    Get the working days left in the record's month: filled in from the
+    school calendar when the school has one, otherwise asked for with
+    the Monday-to-Friday count as the default
+    Parameters:
+        data (dict): Attendance data dictionary
+    Returns:
+        int: Remaining working days
+    """
+    from school_calendar import get_calendar, has_school_calendar
+
+    remaining_days = min(31, get_calendar().remaining_working_days(data['month'], data['total_days']))
+    
+    if has_school_calendar():
+        print(f"\nRemaining working days in {data['month']} (school calendar): {remaining_days}")
+        return remaining_days
+    
+    return get_valid_input(
+        f"Enter remaining working days in month (Enter = {remaining_days}): ", 
+        0, 31, remaining_days
+    )
+
+
+def calculate_days_needed(data, remaining_days=None):
     """
     Calculate how many more days needed to reach 75%
     Parameters:
         data (dict): Attendance data dictionary
+        remaining_days (int): Remaining working days, or None to ask
     """
     if data is None:
         print("\n⚠ No attendance data found! Please enter data first.")
         return
     
-    display_section_header("DAYS NEEDED CALCULATOR")
-    
     current_present = data['days_present']
     current_total = data['total_days']
-    current_percent = calculate_percentage(current_present, current_total)
+    current_percent = get_percentage(data)
     
-    print(f"\nCurrent Status:")
-    print(f"  Present: {current_present} / {current_total} days")
-    print(f"  Current %: {current_percent}%")
-    
-    display_divider()
+    block = TextBlock()
+    block.extend(render_section_header("DAYS NEEDED CALCULATOR"))
+    block.line(f"\nCurrent Status:")
+    block.line(f"  Present: {current_present} / {current_total} days")
+    block.line(f"  Current %: {current_percent}%")
+    block.extend(DIVIDER_TEXT)
+    block.write()
     
     # Get remaining days
-    remaining_days = get_valid_input(
-        "Enter remaining working days in month: ", 
-        0, 31
-    )
+    if remaining_days is None:
+        remaining_days = get_remaining_days(data)
     
     if remaining_days == 0:
         print("\n○ No remaining days to calculate.")
         return
     
-    # Calculate projections
-    new_total = current_total + remaining_days
-    required_for_75 = calculate_required_days(75, new_total)
-    required_for_80 = calculate_required_days(80, new_total)
-    required_for_85 = calculate_required_days(85, new_total)
-    
-    days_needed_75 = required_for_75 - current_present
-    days_needed_80 = required_for_80 - current_present
-    days_needed_85 = required_for_85 - current_present
-    
-    # Display projections
-    print("\n┌" + "─" * 46 + "┐")
-    print("│" + "         ATTENDANCE PROJECTION".center(46) + "│")
-    print("├" + "─" * 46 + "┤")
-    print(f"│  New Total Days: {new_total}".ljust(47) + "│")
-    print("├" + "─" * 46 + "┤")
-    print("│  Target     │  Days Needed  │  Leaves OK   │".ljust(47) + "")
-    print("├" + "─" * 46 + "┤")
-    
-    # For 75%
-    leaves_ok_75 = remaining_days - max(0, days_needed_75)
-    status_75 = "✓" if days_needed_75 <= remaining_days else "✗"
-    print(f"│  75% (Min)  │  {max(0, days_needed_75):^11}  │  {max(0, leaves_ok_75):^10}  │ {status_75}")
-    
-    # For 80%
-    leaves_ok_80 = remaining_days - max(0, days_needed_80)
-    status_80 = "✓" if days_needed_80 <= remaining_days else "✗"
-    print(f"│  80% (Safe) │  {max(0, days_needed_80):^11}  │  {max(0, leaves_ok_80):^10}  │ {status_80}")
-    
-    # For 85%
-    leaves_ok_85 = remaining_days - max(0, days_needed_85)
-    status_85 = "✓" if days_needed_85 <= remaining_days else "✗"
-    print(f"│  85% (Good) │  {max(0, days_needed_85):^11}  │  {max(0, leaves_ok_85):^10}  │ {status_85}")
-    
-    print("└" + "─" * 46 + "┘")
-    
-    # Recommendations
-    print("\n📋 Recommendation:")
-    if days_needed_75 <= 0:
-        print(f"   You already qualify for 75%!")
-        print(f"   You can take up to {remaining_days + abs(days_needed_75)} more leaves.")
-    elif days_needed_75 <= remaining_days:
-        print(f"   Be present for at least {days_needed_75} of the next {remaining_days} days.")
-    else:
-        shortfall = days_needed_75 - remaining_days
-        print(f"   ⚠ Cannot reach 75% even with full attendance.")
-        print(f"   Shortfall: {shortfall} days")
+    write_text(render_projection(current_present, current_total, remaining_days))
+
 
+# Target percentages offered by calculate_safe_leaves
+SAFE_LEAVE_TARGETS = (75, 80, 85, 90)
 
-def calculate_safe_leaves(data):
+
+def calculate_safe_leaves(data, remaining_days=None, target_percent=None):
     """
     Calculate how many leaves can be safely taken
     Parameters:
         data (dict): Attendance data dictionary
+        remaining_days (int): Remaining working days, or None to ask
+        target_percent (int): One of SAFE_LEAVE_TARGETS, or None to ask
     """
     if data is None:
         print("\n⚠ No attendance data found! Please enter data first.")
         return
     
-    display_section_header("SAFE LEAVES CALCULATOR")
+    write_text(render_section_header("SAFE LEAVES CALCULATOR"))
     
     current_present = data['days_present']
     current_total = data['total_days']
     
     # Get remaining days
-    remaining_days = get_valid_input(
-        "Enter remaining working days in month: ", 
-        0, 31
-    )
+    if remaining_days is None:
+        remaining_days = get_remaining_days(data)
     
     # Get target percentage
-    print("\nSelect target percentage to maintain:")
-    print("  1. 75% (Minimum requirement)")
-    print("  2. 80% (Safe zone)")
-    print("  3. 85% (Comfortable)")
-    print("  4. 90% (Excellent)")
-    
-    choice = get_valid_input("Your choice (1-4): ", 1, 4)
-    
-    # Map choice to percentage using dictionary
-    target_map = {
-        1: 75,
-        2: 80,
-        3: 85,
-        4: 90
-    }
-    target_percent = target_map[choice]
+    if target_percent is None:
+        print("\nSelect target percentage to maintain:")
+        print("  1. 75% (Minimum requirement)")
+        print("  2. 80% (Safe zone)")
+        print("  3. 85% (Comfortable)")
+        print("  4. 90% (Excellent)")
+        
+        choice = get_valid_input("Your choice (1-4): ", 1, 4)
+        
+        # Map choice to percentage using tuple index
+        target_percent = SAFE_LEAVE_TARGETS[choice - 1]
     
+    write_text(render_safe_leaves(current_present, current_total, remaining_days, target_percent))
+
+
+@instrument("render.safe_leaves")
+def render_safe_leaves(current_present, current_total, remaining_days, target_percent):
+    """
+    Build the safe leaves calculation box
+    Parameters:
+        current_present (int): Days present so far
+        current_total (int): Working days so far
+        remaining_days (int): Remaining working days
+        target_percent (int): Target percentage to keep
+    Returns:
+        str: Rendered text
+    """
     # Calculate safe leaves
-    new_total = current_total + remaining_days
-    required_present = calculate_required_days(target_percent, new_total)
-    additional_needed = required_present - current_present
-    
-    safe_leaves = remaining_days - additional_needed
+    projection = calculate_projection(current_present, current_total, remaining_days, target_percent)
+    new_total = projection['new_total']
+    required_present = projection['required']
+    safe_leaves = projection['safe_leaves']
     
     # Display results
-    print("\n┌" + "─" * 40 + "┐")
-    print("│" + "     SAFE LEAVES CALCULATION".center(40) + "│")
-    print("├" + "─" * 40 + "┤")
-    print(f"│  Target: {target_percent}%".ljust(41) + "│")
-    print(f"│  Total Days (projected): {new_total}".ljust(41) + "│")
-    print(f"│  Required Present: {required_present}".ljust(41) + "│")
-    print(f"│  Currently Present: {current_present}".ljust(41) + "│")
-    print("├" + "─" * 40 + "┤")
+    block = TextBlock()
+    block.line()
+    block.top(40)
+    block.centered("     SAFE LEAVES CALCULATION", 40)
+    block.divider(40)
+    block.row(f"  Target: {target_percent}%", 40)
+    block.row(f"  Total Days (projected): {new_total}", 40)
+    block.row(f"  Required Present: {required_present}", 40)
+    block.row(f"  Currently Present: {current_present}", 40)
+    block.divider(40)
     
     if safe_leaves >= 0:
-        print(f"│  ✓ Safe Leaves Available: {safe_leaves}".ljust(41) + "│")
+        block.row(f"  ✓ Safe Leaves Available: {safe_leaves}", 40)
     else:
-        print(f"│  ✗ No leaves available".ljust(41) + "│")
-        print(f"│    Need {abs(safe_leaves)} more present days".ljust(41) + "│")
+        block.row(f"  ✗ No leaves available", 40)
+        block.row(f"    Need {abs(safe_leaves)} more present days", 40)
     
-    print("└" + "─" * 40 + "┘")
+    block.bottom(40)
+    return block.text()
@@ -0,0 +1,127 @@
+# ============================================================
+# MSAAS - Class Entry Module
+# Enter a whole month for a whole class in one paste
+# ============================================================
+#
+# Paste format: one student per line, blank lines end the paste,
+# lines starting with '#' are ignored
+#
+#   student_id  marks        e.g.  s001  PPAHPPPAPPPPAPPHPPPPAP
+#                                  s002, PPPPP PPAPP PPPPH PPPPP PP
+#
+# The ID and the marks are separated by a comma, tab or spaces; spaces
+# inside the marks are ignored. Every line needs one P/A/H per working
+# day, checked by the same rules as Day-wise Entry (menu option 1) and
+# the batch mode 'enter' command.
+
+import sys
+
+from attendance import build_record_from_string
+from file_handler import save_many_data
+from utils import is_valid_student_id, parse_valid_number
+
+
+def parse_class_line(line, month, total_days):
+    """
+    Split and check one pasted line
+    Parameters:
+        line (str): "student_id marks"
+        month (str): Month name
+        total_days (int): Working days of the month
+    Returns:
+        tuple: (student_id, attendance data), or None for blank and comment lines
+    Raises:
+        ValueError: If the line is invalid
+    """
+    line = line.strip()
+    if line == "" or line.startswith("#"):
+        return None
+
+    fields = line.replace(",", " ").replace("\t", " ").split(None, 1)
+    if len(fields) != 2:
+        raise ValueError("Expected: student_id marks")
+
+    student_id, marks = fields
+    if not is_valid_student_id(student_id):
+        raise ValueError(f"Invalid student ID: {student_id}")
+
+    return student_id, build_record_from_string(month, total_days, marks)
+
+
+def enter_class(lines, month, total_days, errors=sys.stderr):
+    """
+    Check every pasted line, then save all valid records at once
+    Parameters:
+        lines (iterable): Pasted lines
+        month (str): Month name
+        total_days (int): Working days of the month
+        errors (file): Where invalid lines are reported
+    Returns:
+        tuple: (records saved, lines that failed or were not saved)
+    """
+    records = {}
+    failures = 0
+
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            parsed = parse_class_line(line, month, total_days)
+            if parsed is None:
+                continue
+
+            student_id, data = parsed
+            if student_id in records:
+                raise ValueError(f"{student_id} is listed twice")
+            records[student_id] = data
+
+        except ValueError as e:
+            failures += 1
+            print(f"⚠ Line {line_number}: {e}", file=errors)
+
+    saved = save_many_data(records.items())
+    if saved < len(records):
+        # The store has shown why; the lines count as failed
+        print(f"⚠ {len(records) - saved} records could not be saved", file=errors)
+        failures += len(records) - saved
+    return saved, failures
+
+
+def read_paste(stream=None):
+    """
+    Read pasted lines up to the first blank line (or end of input)
+    Parameters:
+        stream (file): Input, default sys.stdin
+    Yields:
+        str: Each pasted line
+    """
+    if stream is None:
+        stream = sys.stdin
+
+    for line in stream:
+        if line.strip() == "":
+            return
+        yield line
+
+
+def enter_class_from_stdin(month, total_days):
+    """
+    Enter a class from lines pasted into the terminal (or piped in)
+    Parameters:
+        month (str): Month name
+        total_days (int): Working days of the month
+    Returns:
+        tuple: (records saved, lines that failed)
+    Raises:
+        ValueError: If total_days is not 1-31
+    """
+    total_days = parse_valid_number(total_days, 1, 31)
+
+    if sys.stdin.isatty():
+        print(f"Paste one line per student for {month} ({total_days} marks each):")
+        print("  student_id PPAHP...   (finish with an empty line)")
+
+    # Read the whole paste first, so messages do not mix with pasted lines
+    lines = list(read_paste())
+    saved, failures = enter_class(lines, month, total_days)
+
+    print(f"✓ {saved} students recorded for {month}" + (f", {failures} lines failed" if failures else ""))
+    return saved, failures
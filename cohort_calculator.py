@@ -0,0 +1,117 @@
+# ============================================================
+# MSAAS - Cohort Calculator Module
+# Batch versions of the calculator functions for a whole class
+# or school at once (needs NumPy)
+# ============================================================
+
+import numpy as np
+
+# Targets used by calculate_days_needed
+DEFAULT_TARGETS = (75, 80, 85)
+
+
+def _round_like_python(values):
+    """
+    Round to 2 decimals exactly like Python's round()
+    NumPy rounds x * 100 to the nearest integer, which can land on the
+    other side of Python's result when x is (almost) halfway between two
+    hundredths; those few values are rounded again with round()
+    """
+    rounded = np.round(values, 2)
+
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_half):
+        rounded.flat[index] = round(float(values.flat[index]), 2)
+
+    return rounded
+
+
+def calculate_percentages(days_present, total_days):
+    """
+    Calculate attendance percentages for many students
+    Parameters:
+        days_present (array-like): Days present of each student
+        total_days (array-like): Total working days of each student
+    Returns:
+        numpy.ndarray: Percentages rounded to 2 decimals (0.0 where total is 0)
+    """
+    present = np.asarray(days_present, dtype=np.int64)
+    total = np.asarray(total_days, dtype=np.int64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = (present / total) * 100
+
+    percentages = np.where(total == 0, 0.0, percentages)
+    return _round_like_python(percentages)
+
+
+def calculate_required_days_batch(targets, total_days):
+    """
+    Calculate days required for every student x target pair
+    Parameters:
+        targets (array-like): Target percentages, shape (targets,)
+        total_days (array-like): Total working days, shape (students,)
+    Returns:
+        numpy.ndarray: Required days rounded up, shape (students, targets)
+    """
+    fractions = np.asarray(targets, dtype=np.float64) / 100
+    total = np.asarray(total_days, dtype=np.int64)
+
+    required = fractions[np.newaxis, :] * total[:, np.newaxis]
+    return np.ceil(required).astype(np.int64)
+
+
+def calculate_cohort(days_present, total_days, remaining_days, targets=DEFAULT_TARGETS):
+    """
+    Calculate percentages, days needed and safe leaves for a whole cohort
+    in one pass, matching calculate_days_needed / calculate_safe_leaves
+    Parameters:
+        days_present (array-like): Days present of each student
+        total_days (array-like): Working days so far of each student
+        remaining_days (array-like or int): Remaining working days
+        targets (array-like): Target percentages
+    Returns:
+        dict: NumPy arrays
+            "percentage"   (students,)          current percentage
+            "new_total"    (students,)          projected total days
+            "required"     (students, targets)  present days required
+            "days_needed"  (students, targets)  more present days needed
+                                                (negative = already ahead)
+            "safe_leaves"  (students, targets)  leaves that keep the target
+                                                (negative = days short)
+            "reachable"    (students, targets)  True if the target can be met
+    """
+    present = np.asarray(days_present, dtype=np.int64)
+    total = np.asarray(total_days, dtype=np.int64)
+    remaining = np.broadcast_to(np.asarray(remaining_days, dtype=np.int64), total.shape)
+
+    new_total = total + remaining
+    required = calculate_required_days_batch(targets, new_total)
+    days_needed = required - present[:, np.newaxis]
+    safe_leaves = remaining[:, np.newaxis] - days_needed
+
+    return {
+        "percentage": calculate_percentages(present, total),
+        "new_total": new_total,
+        "required": required,
+        "days_needed": days_needed,
+        "safe_leaves": safe_leaves,
+        "reachable": days_needed <= remaining[:, np.newaxis]
+    }
+
+
+def calculate_cohort_from_records(records, remaining_days, targets=DEFAULT_TARGETS):
+    """
+    Run calculate_cohort over a list of attendance data dictionaries
+    Parameters:
+        records (list): Attendance data dictionaries
+        remaining_days (array-like or int): Remaining working days
+        targets (array-like): Target percentages
+    Returns:
+        dict: Same arrays as calculate_cohort, in the order of records
+    """
+    present = np.fromiter((data['days_present'] for data in records), dtype=np.int64, count=len(records))
+    total = np.fromiter((data['total_days'] for data in records), dtype=np.int64, count=len(records))
+    return calculate_cohort(present, total, remaining_days, targets)
+
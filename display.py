@@ -3,215 +3,327 @@
 # Contains all display/output functions
 # ============================================================
 
-from calculator import calculate_percentage, MINIMUM_ATTENDANCE_PERCENT
-from menu import display_section_header, display_divider
+from calculator import (get_percentage, get_status_band, calculate_subject_report,
+                        MINIMUM_ATTENDANCE_PERCENT)
+from instrumentation import instrument
+from menu import render_section_header
+from packed_record import count_marks
+from render import TextBlock, write_text, DOUBLE
 
-def view_summary(data):
+# Message shown when a view is opened before any data exists
+NO_DATA_MESSAGE = "\n⚠ No attendance data found! Please enter data first."
+
+
+def get_recommendations(percentage):
     """
-    Display attendance summary
+    Get the monthly report recommendations for a percentage
+    Parameters:
+        percentage (float): Attendance percentage
+    Returns:
+        list: Two recommendation strings
+    """
+    # Recommendations using list
+    recommendations = []
+
+    if percentage < 75:
+        recommendations.append("Improve attendance immediately")
+        recommendations.append("Avoid taking any more leaves")
+    elif percentage < 80:
+        recommendations.append("Maintain current attendance")
+        recommendations.append("Limit leaves to emergencies only")
+    elif percentage < 90:
+        recommendations.append("Good job! Keep it up")
+        recommendations.append("You have some buffer for leaves")
+    else:
+        recommendations.append("Excellent attendance!")
+        recommendations.append("You're setting a great example")
+
+    return recommendations
+
+
+@instrument("render.summary")
+def render_summary(data):
+    """
+    Build the attendance summary screen
     Parameters:
         data (dict): Attendance data dictionary
+    Returns:
+        str: Rendered text
     """
-    if data is None:
-        print("\n⚠ No attendance data found! Please enter data first.")
-        return
-    
-    percentage = calculate_percentage(data['days_present'], data['total_days'])
-    
-    display_section_header("ATTENDANCE SUMMARY")
-    
-    print()
-    print("┌" + "─" * 40 + "┐")
-    print(f"│  Month: {data['month']}".ljust(41) + "│")
-    print("├" + "─" * 40 + "┤")
-    print(f"│  Total Working Days  : {data['total_days']:>10}".ljust(41) + "│")
-    print(f"│  Days Present        : {data['days_present']:>10}".ljust(41) + "│")
-    print(f"│  Days Absent         : {data['days_absent']:>10}".ljust(41) + "│")
-    print("├" + "─" * 40 + "┤")
-    print(f"│  Attendance %        : {percentage:>9}%".ljust(41) + "│")
-    print(f"│  Entry Type          : {data['entry_type'].title():>10}".ljust(41) + "│")
-    print("└" + "─" * 40 + "┘")
-    
+    percentage = get_percentage(data)
+
+    block = TextBlock()
+    block.extend(render_section_header("ATTENDANCE SUMMARY"))
+
+    block.line()
+    block.top(40)
+    block.row(f"  Month: {data['month']}", 40)
+    block.divider(40)
+    block.row(f"  Total Working Days  : {data['total_days']:>10}", 40)
+    block.row(f"  Days Present        : {data['days_present']:>10}", 40)
+    block.row(f"  Days Absent         : {data['days_absent']:>10}", 40)
+    block.divider(40)
+    block.row(f"  Attendance %        : {percentage:>9}%", 40)
+    block.row(f"  Entry Type          : {data['entry_type'].title():>10}", 40)
+    block.bottom(40)
+
     # Visual bar representation
     bar_length = 30
     filled = int((percentage / 100) * bar_length)
     empty = bar_length - filled
-    
-    print()
-    print("  Progress: [" + "█" * filled + "░" * empty + f"] {percentage}%")
 
+    block.line()
+    block.line("  Progress: [" + "█" * filled + "░" * empty + f"] {percentage}%")
+    return block.text()
 
-def check_status(data):
+
+def view_summary(data):
     """
-    Check if attendance meets 75% requirement
+    Display attendance summary
     Parameters:
         data (dict): Attendance data dictionary
     """
     if data is None:
-        print("\n⚠ No attendance data found! Please enter data first.")
+        print(NO_DATA_MESSAGE)
         return
-    
-    percentage = calculate_percentage(data['days_present'], data['total_days'])
-    
-    display_section_header("75% STATUS CHECK")
-    
-    print()
-    print("┌" + "─" * 44 + "┐")
-    print(f"│  Your Attendance    : {percentage:>8}%".ljust(45) + "│")
-    print(f"│  Required Minimum   : {MINIMUM_ATTENDANCE_PERCENT:>8}%".ljust(45) + "│")
-    print("├" + "─" * 44 + "┤")
-    
-    # Status check using conditional statements
-    if percentage >= 90:
-        status = "EXCELLENT"
-        message = "Outstanding attendance! Keep it up!"
-        symbol = "★★★"
-    elif percentage >= 85:
-        status = "VERY GOOD"
-        message = "Great attendance record!"
-        symbol = "★★☆"
-    elif percentage >= 80:
-        status = "GOOD"
-        message = "Good, but aim higher!"
-        symbol = "★☆☆"
-    elif percentage >= 75:
-        status = "SATISFACTORY"
-        message = "Just meeting the requirement."
-        symbol = "✓"
-    else:
-        status = "CRITICAL"
-        message = "Below minimum! Take action now!"
-        symbol = "⚠"
-    
-    print(f"│  Status: {status} {symbol}".ljust(45) + "│")
-    print(f"│  {message}".ljust(45) + "│")
-    print("├" + "─" * 44 + "┤")
-    
+
+    write_text(render_summary(data))
+
+
+@instrument("render.status")
+def render_status(data):
+    """
+    Build the 75% status check screen
+    Parameters:
+        data (dict): Attendance data dictionary
+    Returns:
+        str: Rendered text
+    """
+    percentage = get_percentage(data)
+
+    block = TextBlock()
+    block.extend(render_section_header("75% STATUS CHECK"))
+
+    block.line()
+    block.top(44)
+    block.row(f"  Your Attendance    : {percentage:>8}%", 44)
+    block.row(f"  Required Minimum   : {MINIMUM_ATTENDANCE_PERCENT:>8}%", 44)
+    block.divider(44)
+
+    # Status check using the band table
+    status, message, symbol = get_status_band(percentage)[1:]
+
+    block.row(f"  Status: {status} {symbol}", 44)
+    block.row(f"  {message}", 44)
+    block.divider(44)
+
     # Difference from 75%
     diff = percentage - 75
-    
+
     if diff >= 0:
-        print(f"│  ✓ You are {diff:.2f}% ABOVE the minimum".ljust(45) + "│")
+        block.row(f"  ✓ You are {diff:.2f}% ABOVE the minimum", 44)
     else:
-        print(f"│  ✗ You are {abs(diff):.2f}% BELOW the minimum".ljust(45) + "│")
-    
-    print("└" + "─" * 44 + "┘")
+        block.row(f"  ✗ You are {abs(diff):.2f}% BELOW the minimum", 44)
 
+    block.bottom(44)
+    return block.text()
 
-def view_daily_record(data):
+
+def check_status(data):
     """
-    Display day-wise attendance record
+    Check if attendance meets 75% requirement
     Parameters:
         data (dict): Attendance data dictionary
     """
     if data is None:
-        print("\n⚠ No attendance data found! Please enter data first.")
+        print(NO_DATA_MESSAGE)
         return
-    
-    # Check if daily record exists
-    if len(data['daily_record']) == 0:
-        print("\n⚠ No day-wise record available!")
-        print("  (Use 'Day-wise Entry' for detailed tracking)")
-        return
-    
-    display_section_header(f"DAY-WISE RECORD - {data['month'].upper()}")
-    
+
+    write_text(render_status(data))
+
+
+@instrument("render.daily_record")
+def render_daily_record(data):
+    """
+    Build the day-wise record screen
+    Parameters:
+        data (dict): Attendance data dictionary with a non-empty daily record
+    Returns:
+        str: Rendered text
+    """
     record = data['daily_record']
     total_days = len(record)
-    
-    print()
-    print("┌" + "─" * 44 + "┐")
-    
-    # Display in rows of 7 days (like a week)
+
+    # Counted straight from the (possibly packed) record
+    days_present, days_absent = count_marks(record)
+
+    block = TextBlock()
+    block.extend(render_section_header(f"DAY-WISE RECORD - {data['month'].upper()}"))
+
+    block.line()
+    block.top(44)
+
+    # Display in rows of 5 days
     row_count = 0
-    line = "│  "
-    
+    line = "  "
+
     # Using nested loop concept
-    for i in range(total_days):
+    for i, status in enumerate(record):
         day_num = i + 1
-        status = record[i]
-        
+
         if status == 'P':
             line += f"D{day_num:02d}:✓ "
         else:
             line += f"D{day_num:02d}:✗ "
-        
+
         row_count += 1
-        
+
         # New line after every 5 days
         if row_count == 5 or i == total_days - 1:
-            line = line.ljust(45) + "│"
-            print(line)
-            line = "│  "
+            block.row(line, 44)
+            line = "  "
             row_count = 0
-    
-    print("├" + "─" * 44 + "┤")
-    print(f"│  ✓ Present: {data['days_present']} days".ljust(45) + "│")
-    print(f"│  ✗ Absent:  {data['days_absent']} days".ljust(45) + "│")
-    print("└" + "─" * 44 + "┘")
-    
+
+    block.divider(44)
+    block.row(f"  ✓ Present: {days_present} days", 44)
+    block.row(f"  ✗ Absent:  {days_absent} days", 44)
+    block.bottom(44)
+
     # Legend
-    print("\n  Legend: ✓ = Present, ✗ = Absent")
+    block.line("\n  Legend: ✓ = Present, ✗ = Absent")
+    return block.text()
 
 
-def view_monthly_report(data):
+def view_daily_record(data):
     """
-    Display comprehensive monthly report
+    Display day-wise attendance record
     Parameters:
         data (dict): Attendance data dictionary
     """
     if data is None:
-        print("\n⚠ No attendance data found! Please enter data first.")
+        print(NO_DATA_MESSAGE)
+        return
+
+    # Check if daily record exists
+    if len(data['daily_record']) == 0:
+        print("\n⚠ No day-wise record available!")
+        print("  (Use 'Day-wise Entry' for detailed tracking)")
         return
-    
-    percentage = calculate_percentage(data['days_present'], data['total_days'])
-    
-    display_section_header("MONTHLY ATTENDANCE REPORT")
-    
-    print()
-    print("╔" + "═" * 50 + "╗")
-    print("║" + f"  ATTENDANCE REPORT - {data['month'].upper()}".ljust(50) + "║")
-    print("╠" + "═" * 50 + "╣")
-    print("║" + " " * 50 + "║")
-    print("║" + "  STATISTICS".ljust(50) + "║")
-    print("║" + f"  ├─ Total Working Days  : {data['total_days']}".ljust(50) + "║")
-    print("║" + f"  ├─ Days Present        : {data['days_present']}".ljust(50) + "║")
-    print("║" + f"  ├─ Days Absent         : {data['days_absent']}".ljust(50) + "║")
-    print("║" + f"  └─ Attendance          : {percentage}%".ljust(50) + "║")
-    print("║" + " " * 50 + "║")
-    print("╠" + "═" * 50 + "╣")
-    
+
+    write_text(render_daily_record(data))
+
+
+@instrument("render.monthly_report")
+def render_monthly_report(data):
+    """
+    Build the monthly report screen
+    Parameters:
+        data (dict): Attendance data dictionary
+    Returns:
+        str: Rendered text
+    """
+    percentage = get_percentage(data)
+
+    block = TextBlock()
+    block.extend(render_section_header("MONTHLY ATTENDANCE REPORT"))
+
+    block.line()
+    block.top(50, DOUBLE)
+    block.row(f"  ATTENDANCE REPORT - {data['month'].upper()}", 50, DOUBLE)
+    block.divider(50, DOUBLE)
+    block.blank(50, DOUBLE)
+    block.row("  STATISTICS", 50, DOUBLE)
+    block.row(f"  ├─ Total Working Days  : {data['total_days']}", 50, DOUBLE)
+    block.row(f"  ├─ Days Present        : {data['days_present']}", 50, DOUBLE)
+    block.row(f"  ├─ Days Absent         : {data['days_absent']}", 50, DOUBLE)
+    block.row(f"  └─ Attendance          : {percentage}%", 50, DOUBLE)
+    block.blank(50, DOUBLE)
+    block.divider(50, DOUBLE)
+
     # Status determination
     if percentage >= 75:
         status_line = "  STATUS: ✓ ELIGIBLE (Meets 75% requirement)"
     else:
         status_line = "  STATUS: ✗ NOT ELIGIBLE (Below 75%)"
-    
-    print("║" + status_line.ljust(50) + "║")
-    print("║" + " " * 50 + "║")
-    
-    # Recommendations using list
-    recommendations = []
-    
-    if percentage < 75:
-        recommendations.append("Improve attendance immediately")
-        recommendations.append("Avoid taking any more leaves")
-    elif percentage < 80:
-        recommendations.append("Maintain current attendance")
-        recommendations.append("Limit leaves to emergencies only")
-    elif percentage < 90:
-        recommendations.append("Good job! Keep it up")
-        recommendations.append("You have some buffer for leaves")
-    else:
-        recommendations.append("Excellent attendance!")
-        recommendations.append("You're setting a great example")
-    
-    print("╠" + "═" * 50 + "╣")
-    print("║" + "  RECOMMENDATIONS".ljust(50) + "║")
-    
+
+    block.row(status_line, 50, DOUBLE)
+    block.blank(50, DOUBLE)
+
+    block.divider(50, DOUBLE)
+    block.row("  RECOMMENDATIONS", 50, DOUBLE)
+
     # Using for loop to iterate through list
-    for i in range(len(recommendations)):
-        print("║" + f"  • {recommendations[i]}".ljust(50) + "║")
-    
-    print("║" + " " * 50 + "║")
-    print("╚" + "═" * 50 + "╝")
+    for recommendation in get_recommendations(percentage):
+        block.row(f"  • {recommendation}", 50, DOUBLE)
+
+    block.blank(50, DOUBLE)
+    block.bottom(50, DOUBLE)
+    return block.text()
+
+
+def view_monthly_report(data):
+    """
+    Display comprehensive monthly report
+    Parameters:
+        data (dict): Attendance data dictionary
+    """
+    if data is None:
+        print(NO_DATA_MESSAGE)
+        return
+
+    write_text(render_monthly_report(data))
+
+
+@instrument("render.subject_report")
+def render_subject_report(record, remaining_periods=None):
+    """
+    Build the per-subject report screen
+    Parameters:
+        record (SubjectRecord): Period-by-period marks of one month
+        remaining_periods (dict): subject -> periods left this month, or None for none
+    Returns:
+        str: Rendered text
+    """
+    report = calculate_subject_report(record, remaining_periods)
+
+    block = TextBlock()
+    block.extend(render_section_header(f"SUBJECT REPORT - {record.month.upper()}"))
+
+    block.line()
+    block.top(60)
+    block.row(f"  {'Subject':<14}{'Present':>9}{'%':>9}{'Left':>6}{'Needed':>8}{'Leaves':>8}", 60)
+    block.divider(60)
+
+    for row in report:
+        status = "✓" if row['percentage'] >= MINIMUM_ATTENDANCE_PERCENT else "✗"
+        present = f"{row['present']}/{row['total']}"
+        block.row(f"  {row['subject'][:13]:<14}{present:>9}{row['percentage']:>8}%{row['remaining']:>6}"
+                  f"{max(0, row['days_needed']):>8}{max(0, row['safe_leaves']):>8} {status}", 60)
+
+    block.divider(60)
+    block.row(f"  Working days recorded: {len(record)}", 60)
+    block.bottom(60)
+
+    # Subjects that cannot reach the minimum this month
+    for row in report:
+        if not row['reachable']:
+            block.line(f"  ⚠ {row['subject']}: cannot reach {MINIMUM_ATTENDANCE_PERCENT}% this month,"
+                       f" short by {row['days_needed'] - row['remaining']} periods")
+
+    block.line(f"\n  Needed = periods to attend for {MINIMUM_ATTENDANCE_PERCENT}%,"
+               " Leaves = periods that can be missed")
+    return block.text()
+
+
+def view_subject_report(record, remaining_periods=None):
+    """
+    Display per-subject percentages, periods needed and safe leaves
+    Parameters:
+        record (SubjectRecord): Period-by-period marks of one month
+        remaining_periods (dict): subject -> periods left this month, or None for none
+    """
+    if record is None or not record.subjects:
+        print("\n⚠ No subject-wise record available!")
+        return
+
+    write_text(render_subject_report(record, remaining_periods))
@@ -3,110 +3,1187 @@
 # Contains file reading and writing functions
 # ============================================================
 
-# File name constant
+import os  # Import os module for file operations
+import struct
+import threading
+from contextlib import contextmanager, nullcontext
+from itertools import groupby
+
+from attendance import (MONTH_NAMES, ENTRY_TYPES, AttendanceRecord, new_detailed_record,
+                        mark_day, unmark_day, correct_day)
+from file_lock import FileLock
+from instrumentation import METRICS_ENABLED, instrument, record_io
+from packed_record import PackedDailyRecord, pack_marks
+from subject_record import SubjectRecord
+from utils import is_valid_student_id
+
+# File name constant (old single-record file, migrated on first load)
 DATA_FILE = "attendance_data.txt"
 
+# Folder holding the data of every student:
+#   attendance_store/<student_id>/<Month>.rec   (snapshot of one month)
+#   attendance_store/<student_id>/journal.log   (events since the snapshots)
+#   attendance_store/<student_id>/journal.lock  (lock and journal state)
+#   attendance_store/<student_id>/<Month>.sub   (period-by-period marks, if any)
+DATA_DIR = "attendance_store"
+
+# Student used when no student ID is given
+DEFAULT_STUDENT_ID = "default"
+
+# Extension of a single snapshot record file
+RECORD_EXTENSION = ".rec"
+
+# Extension of a subject record file (see subject_record.py)
+SUBJECT_EXTENSION = ".sub"
+
+# Snapshot layout: magic, month index, entry type index, total days,
+# days present, days absent, number of marks, journal sequence number,
+# followed by the day-wise marks packed at 2 bits per day
+SNAPSHOT_HEADER = struct.Struct("<4sBBHHHHQ")
+SNAPSHOT_MAGIC = b"MSA1"
+
+# Name of the append-only journal inside a student folder
+JOURNAL_FILE = "journal.log"
+
+# Lock file of a student folder. Every read holds it shared and every
+# write holds it exclusively, so sessions sharing the folder never see
+# half a change, and students never wait for each other. It also holds
+# the journal state "<last sequence> <events> <journal size>", so every
+# session numbers new events from the same point
+LOCK_FILE = "journal.lock"
+
+# Bytes of the journal state line in the lock file
+JOURNAL_STATE_SIZE = 64
+
+# Journal is folded into the snapshots once it holds this many events
+JOURNAL_COMPACT_LIMIT = 64
+
+# Number of tab-separated fields of each journal event type
+EVENT_FIELD_COUNTS = {
+    "record": 8,    # seq, record, month, total, present, absent, type, daily
+    "mark": 4,      # seq, mark, month, status
+    "unmark": 4,    # seq, unmark, month, day
+    "correct": 5    # seq, correct, month, day, status
+}
+
+# Functions called as listener(student_id, month) after every save
+_save_listeners = []
+
+# Messages of threads that collect them instead of printing
+# (see collect_store_messages)
+_collecting = threading.local()
+
+
+def get_student_dir(student_id):
+    """
+    Get the folder holding all records of one student
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        str: Folder path
+    """
+    if not is_valid_student_id(student_id):
+        raise ValueError(f"Invalid student ID: {student_id!r}")
+
+    return os.path.join(DATA_DIR, student_id)
+
+
+def get_record_path(student_id, month):
+    """
+    Get the snapshot file path of one (student, month) record
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+    Returns:
+        str: File path
+    """
+    if month not in MONTH_NAMES:
+        raise ValueError(f"Invalid month: {month!r}")
+
+    return os.path.join(get_student_dir(student_id), month + RECORD_EXTENSION)
+
 
-def save_data(data):
+def get_subject_path(student_id, month):
     """
-    Save attendance data to a text file
+    Get the subject record file path of one (student, month)
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+    Returns:
+        str: File path
+    """
+    if month not in MONTH_NAMES:
+        raise ValueError(f"Invalid month: {month!r}")
+
+    return os.path.join(get_student_dir(student_id), month + SUBJECT_EXTENSION)
+
+
+def get_journal_path(student_id):
+    """
+    Get the journal file path of one student
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        str: File path
+    """
+    return os.path.join(get_student_dir(student_id), JOURNAL_FILE)
+
+
+def get_lock_path(student_id):
+    """
+    Get the lock file path of one student
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        str: File path
+    """
+    return os.path.join(get_student_dir(student_id), LOCK_FILE)
+
+
+def lock_student(student_id, exclusive=False):
+    """
+    Lock the records of one student
+    Parameters:
+        student_id (str): Student ID
+        exclusive (bool): True to write (waits for everyone),
+                          False to read (waits only for a writer)
+    Returns:
+        context manager: Gives the lock file descriptor (None when reading a
+                         student without a folder, as there is nothing to read)
+    """
+    student_dir = get_student_dir(student_id)
+    if exclusive:
+        os.makedirs(student_dir, exist_ok=True)
+    elif not os.path.isdir(student_dir):
+        return nullcontext()
+
+    return FileLock(os.path.join(student_dir, LOCK_FILE), exclusive)
+
+
+def show_store_message(message):
+    """
+    Show an error or warning of the store, or keep it when this thread
+    collects them (a background thread must not print over a prompt)
+    Parameters:
+        message (str): Message, e.g. "⚠ Error saving data: ..."
+    """
+    messages = getattr(_collecting, "messages", None)
+    if messages is None:
+        print(f"\n{message}")
+    else:
+        messages.append(message)
+
+
+@contextmanager
+def collect_store_messages():
+    """
+    Keep the store's messages of this thread in a list instead of printing them
+    Returns:
+        context manager: Gives the list
+    """
+    messages = []
+    _collecting.messages = messages
+    try:
+        yield messages
+    finally:
+        _collecting.messages = None
+
+
+def print_save_conflict(month):
+    """Tell the user a save was refused because another session saved first"""
+    show_store_message(f"⚠ {month} was changed by another session since it was loaded - not saved")
+
+
+def pack_snapshot(data, sequence=0):
+    """
+    Convert attendance data into the binary snapshot format
     Parameters:
         data (dict): Attendance data dictionary
+        sequence (int): Last journal event included in this snapshot
     Returns:
-        bool: True if successful, False otherwise
+        bytes: Header followed by the marks packed at 2 bits per day
+    """
+    daily_record = data['daily_record']
+    if isinstance(daily_record, PackedDailyRecord):
+        packed = daily_record.to_bytes()
+    else:
+        packed = bytes(pack_marks(daily_record))
+
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC,
+        MONTH_NAMES.index(data['month']),
+        ENTRY_TYPES.index(data['entry_type']),
+        data['total_days'],
+        data['days_present'],
+        data['days_absent'],
+        len(daily_record),
+        sequence
+    )
+    return header + packed
+
+
+def unpack_snapshot(buffer):
+    """
+    Read a binary snapshot without copying its day-wise marks
+    Parameters:
+        buffer (bytes-like): Snapshot bytes, usually a whole snapshot file
+    Returns:
+        tuple: (AttendanceRecord, sequence number)
+    """
+    (magic, month_index, type_index, total_days, days_present,
+     days_absent, day_count, sequence) = SNAPSHOT_HEADER.unpack_from(buffer, 0)
+
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not an attendance snapshot")
+
+    attendance_data = AttendanceRecord(
+        MONTH_NAMES[month_index], total_days, days_present, days_absent,
+        PackedDailyRecord(buffer, day_count, SNAPSHOT_HEADER.size), ENTRY_TYPES[type_index]
+    )
+
+    return attendance_data, sequence
+
+
+def parse_record(lines):
+    """
+    Convert the six-line text format (old data file and journal
+    record events) back into attendance data
+    Parameters:
+        lines (list): Lines in the text format
+    Returns:
+        AttendanceRecord: Attendance data, or None if lines are incomplete
+    """
+    # Check if file has enough data
+    if len(lines) < 6:
+        return None
+
+    # Parse daily record
+    daily_str = lines[5].strip()
+    if daily_str:
+        daily_record = daily_str.split(",")
+    else:
+        daily_record = []
+
+    attendance_data = AttendanceRecord(
+        lines[0].strip(), int(lines[1].strip()), int(lines[2].strip()),
+        int(lines[3].strip()), daily_record, lines[4].strip()
+    )
+
+    return attendance_data
+
+
+def write_snapshot(student_id, data, sequence):
+    """
+    Replace the snapshot file of one (student, month) record
+    The new file is written next to the old one and renamed over it,
+    so a crash leaves either the old or the new snapshot, never half of one
+    Parameters:
+        student_id (str): Student ID
+        data (dict): Attendance data dictionary
+        sequence (int): Last journal event included in this snapshot
+    """
+    path = get_record_path(student_id, data['month'])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    snapshot = pack_snapshot(data, sequence)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(snapshot)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp_path, path)
+
+    if METRICS_ENABLED:
+        record_io("snapshot_write", len(snapshot))
+
+
+def read_snapshot(student_id, month):
+    """
+    Read the snapshot of one (student, month) record
+    A snapshot is a few dozen bytes, so it is read whole in one call;
+    the record keeps no open file or mapping (on Windows a mapped file
+    could not be replaced by the next compaction)
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+    Returns:
+        tuple: (attendance data or None, sequence number)
     """
     try:
-        # Open file in write mode
-        file = open(DATA_FILE, "w")
-        
-        # Write each piece of data on a new line
-        file.write(data['month'] + "\n")
-        file.write(str(data['total_days']) + "\n")
-        file.write(str(data['days_present']) + "\n")
-        file.write(str(data['days_absent']) + "\n")
-        file.write(data['entry_type'] + "\n")
-        
-        # Write daily record as comma-separated string
-        daily_str = ",".join(data['daily_record'])
-        file.write(daily_str + "\n")
-        
-        # Close the file
-        file.close()
-        
-        return True
-        
-    except Exception as e:
-        print(f"\n⚠ Error saving data: {e}")
-        return False
+        with open(get_record_path(student_id, month), "rb") as file:
+            buffer = file.read()
+    except FileNotFoundError:
+        return None, 0
+
+    if METRICS_ENABLED:
+        record_io("snapshot_read", len(buffer))
 
+    return unpack_snapshot(buffer)
 
-def load_data():
+
+def read_journal(student_id):
     """
-    Load attendance data from text file
+    Read every complete event from a student's journal
+    A last line without a newline is a write cut short by a crash and is ignored
+    Parameters:
+        student_id (str): Student ID
     Returns:
-        dict: Attendance data dictionary, or None if file doesn't exist
+        list: Events, each a list of string fields
     """
     try:
-        # Open file in read mode
-        file = open(DATA_FILE, "r")
-        
-        # Read all lines
-        lines = file.readlines()
-        
-        # Close the file
-        file.close()
-        
-        # Check if file has enough data
-        if len(lines) < 6:
-            return None
-        
-        # Parse data from lines
-        month = lines[0].strip()
-        total_days = int(lines[1].strip())
-        days_present = int(lines[2].strip())
-        days_absent = int(lines[3].strip())
-        entry_type = lines[4].strip()
-        
-        # Parse daily record
-        daily_str = lines[5].strip()
-        if daily_str:
-            daily_record = daily_str.split(",")
-        else:
-            daily_record = []
-        
-        # Create and return dictionary
-        attendance_data = {
-            "month": month,
-            "total_days": total_days,
-            "days_present": days_present,
-            "days_absent": days_absent,
-            "daily_record": daily_record,
-            "entry_type": entry_type
-        }
-        
-        return attendance_data
-        
+        with open(get_journal_path(student_id), "r", encoding="utf-8") as file:
+            lines = file.readlines()
+            if METRICS_ENABLED:
+                record_io("journal_read", file.buffer.tell())
     except FileNotFoundError:
-        # File doesn't exist yet
-        return None
+        return []
+
+    events = []
+    for line in lines:
+        if not line.endswith("\n"):
+            break
+
+        fields = line.rstrip("\n").split("\t")
+        if len(fields) < 2 or EVENT_FIELD_COUNTS.get(fields[1]) != len(fields):
+            break
+
+        events.append(fields)
+
+    return events
+
+
+def apply_event(records, fields, student_id=None):
+    """
+    Apply one journal event to a dictionary of records
+    Parameters:
+        records (dict): Month name -> attendance data (updated in place)
+        fields (list): Event fields as read from the journal
+        student_id (str): Student the records belong to; a day marked in a
+                          sealed month is added to the sealed record
+    """
+    kind = fields[1]
+    month = fields[2]
+
+    if kind == "record":
+        records[month] = parse_record(fields[2:])
+        return
+
+    data = records.get(month)
+    if data is None:
+        if student_id is not None:
+            from archive import load_archived
+            data = load_archived(student_id, month)
+        if data is None:
+            data = new_detailed_record(month)
+        records[month] = data
+
+    if kind == "mark":
+        mark_day(data, fields[3])
+    elif kind == "unmark":
+        unmark_day(data, int(fields[3]))
+    else:  # correct
+        correct_day(data, int(fields[3]), fields[4])
+
+
+def write_journal_state(lock_fd, state):
+    """
+    Store the journal state in a student's held lock file
+    Parameters:
+        lock_fd (int): Lock file from lock_student(..., exclusive=True)
+        state (list): [last sequence number, events in journal, journal size]
+    """
+    # Always the same length, so the old state never needs cutting off
+    line = " ".join(str(value) for value in state).ljust(JOURNAL_STATE_SIZE - 1).encode("ascii") + b"\n"
+    os.lseek(lock_fd, 0, os.SEEK_SET)
+    os.write(lock_fd, line)
+
+
+def read_journal_state(student_id, lock_fd):
+    """
+    Get the journal state from a student's held lock file
+    The state is only trusted while it matches the journal's size; after
+    a crash between a journal write and the state update, or on first
+    use, it is worked out again from the journal and the snapshots
+    Parameters:
+        student_id (str): Student ID
+        lock_fd (int): Lock file from lock_student(..., exclusive=True)
+    Returns:
+        list: [last sequence number, events in journal, journal size]
+    """
+    journal_path = get_journal_path(student_id)
+    try:
+        journal_size = os.path.getsize(journal_path)
+    except FileNotFoundError:
+        journal_size = 0
+
+    os.lseek(lock_fd, 0, os.SEEK_SET)
+    values = os.read(lock_fd, JOURNAL_STATE_SIZE).split()
+    last_sequence = 0
+    if len(values) == 3 and all(value.isdigit() for value in values):
+        state = [int(value) for value in values]
+        if state[2] == journal_size:
+            return state
+        # Sequence numbers never go back, even after a month is deleted
+        last_sequence = state[0]
+
+    events = read_journal(student_id)
+
+    # Cut off a half-written last line so new events start on a fresh line
+    valid_size = sum(len("\t".join(fields).encode("utf-8")) + 1 for fields in events)
+    if journal_size != valid_size:
+        with open(journal_path, "r+b") as file:
+            file.truncate(valid_size)
+
+    if events:
+        last_sequence = max(last_sequence, int(events[-1][0]))
+    for month in list_months(student_id):
+        last_sequence = max(last_sequence, read_snapshot(student_id, month)[1])
+
+    state = [last_sequence, len(events), valid_size]
+    write_journal_state(lock_fd, state)
+    return state
+
+
+def append_event(student_id, fields, expected_version=None):
+    """
+    Append one event to a student's journal - the only write a save needs
+    Parameters:
+        student_id (str): Student ID
+        fields (list): Event fields after the sequence number
+        expected_version (int): Version of the month when the caller loaded it
+                                (0 if it was not saved), or None to skip the check
+    Returns:
+        int: New version of the month (the event's sequence number), or None if not saved
+    """
+    kind = fields[0]
+    month = fields[1]
+
+    try:
+        with lock_student(student_id, exclusive=True) as lock_fd:
+            state = read_journal_state(student_id, lock_fd)
+
+            if expected_version is not None or kind != "record":
+                data, version = read_record(student_id, month)
+                if expected_version is not None and version != expected_version:
+                    print_save_conflict(month)
+                    return None
+
+                # Check the change against the record as saved now,
+                # so an invalid event never reaches the journal
+                if kind != "record":
+                    apply_event({month: data} if data is not None else {}, [0] + fields, student_id)
+
+            sequence = state[0] + 1
+            line = "\t".join([str(sequence)] + [str(field) for field in fields]) + "\n"
+            encoded = line.encode("utf-8")
+
+            with open(get_journal_path(student_id), "ab") as file:
+                file.write(encoded)
+                file.flush()
+                os.fsync(file.fileno())
+
+            state = [sequence, state[1] + 1, state[2] + len(encoded)]
+            write_journal_state(lock_fd, state)
+
+            if METRICS_ENABLED:
+                record_io("journal_append", len(encoded))
+
+            # The change is safely in the journal now: a failed compaction
+            # leaves the journal in place and is tried again on a later save
+            if state[1] >= JOURNAL_COMPACT_LIMIT:
+                try:
+                    compact_journal(student_id)
+                except Exception as e:
+                    show_store_message(f"⚠ Saved, but the journal could not be compacted: {e}")
+
     except Exception as e:
-        print(f"\n⚠ Error loading data: {e}")
+        show_store_message(f"⚠ Error saving data: {e}")
+        return None
+
+    notify_save_listeners(student_id, month)
+    return sequence
+
+
+def notify_save_listeners(student_id, month):
+    """
+    Tell every registered listener that a record was saved or deleted
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+    """
+    for listener in _save_listeners:
+        listener(student_id, month)
+
+
+def add_save_listener(listener):
+    """
+    Register a function to call after every saved change
+    Parameters:
+        listener (function): Called as listener(student_id, month)
+    """
+    _save_listeners.append(listener)
+
+
+def remove_save_listener(listener):
+    """
+    Stop calling a function registered with add_save_listener
+    Parameters:
+        listener (function): Function to remove
+    """
+    if listener in _save_listeners:
+        _save_listeners.remove(listener)
+
+
+@instrument("file.compact_journal")
+def compact_journal(student_id):
+    """
+    Fold a student's journal into the month snapshots and empty it
+    Parameters:
+        student_id (str): Student ID
+    """
+    with lock_student(student_id, exclusive=True) as lock_fd:
+        state = read_journal_state(student_id, lock_fd)
+        events = read_journal(student_id)
+        if not events:
+            return
+
+        records = load_live_student(student_id)
+
+        # Each snapshot keeps the sequence number of the last event of its
+        # month, which stays the month's version. Snapshots are written in
+        # the order months were last touched, so the newest file is still
+        # the most recently used month
+        versions = {}
+        for fields in events:
+            versions.pop(fields[2], None)
+            versions[fields[2]] = int(fields[0])
+
+        for month, version in versions.items():
+            write_snapshot(student_id, records[month], version)
+
+        os.remove(get_journal_path(student_id))
+        write_journal_state(lock_fd, [state[0], 0, 0])
+
+
+def save_record(student_id, data, expected_version=None):
+    """
+    Save one (student, month) record, leaving all other records untouched
+    Parameters:
+        student_id (str): Student ID
+        data (dict): Attendance data dictionary
+        expected_version (int): Version the record had when it was loaded,
+                                or None to save over any change made since
+    Returns:
+        int: New version of the record, or None if not saved
+    """
+    if data['month'] not in MONTH_NAMES:
+        show_store_message(f"⚠ Error saving data: Invalid month: {data['month']!r}")
         return None
 
+    return append_event(student_id, [
+        "record",
+        data['month'],
+        data['total_days'],
+        data['days_present'],
+        data['days_absent'],
+        data['entry_type'],
+        ",".join(data['daily_record'])
+    ], expected_version)
+
+
+def journal_file_mark_day(student_id, month, status):
+    """
+    Record one more working day for a student's month in the journal
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+        status (str): 'P' or 'A'
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return append_event(student_id, ["mark", month, status]) is not None
+
 
-def delete_data():
+def journal_file_unmark_day(student_id, month, day_number):
     """
-    Delete the saved data file
+    Remove one recorded working day through the journal
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+        day_number (int): Working day to remove (1-based)
     Returns:
         bool: True if successful, False otherwise
     """
-    import os  # Import os module for file operations
-    
+    return append_event(student_id, ["unmark", month, day_number]) is not None
+
+
+def journal_file_correct_day(student_id, month, day_number, status):
+    """
+    Change the mark of an already recorded working day through the journal
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+        day_number (int): Working day to correct (1-based)
+        status (str): 'P' or 'A'
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return append_event(student_id, ["correct", month, day_number, status]) is not None
+
+
+def read_record(student_id, month):
+    """
+    Read one (student, month) record and its version
+    The version is the sequence number of the last event of the month,
+    so it changes with every save of that month and with nothing else
+    Called with the student's lock held (see lock_student)
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+    Returns:
+        tuple: (attendance data or None, version - 0 if not saved yet)
+    """
+    data, sequence = read_snapshot(student_id, month)
+
+    records = {}
+    version = 0
+    if data is not None:
+        records[month] = data
+        version = sequence
+
+    # Replay the journal tail on top of the snapshot
+    for fields in read_journal(student_id):
+        if fields[2] == month and int(fields[0]) > sequence:
+            apply_event(records, fields, student_id)
+            version = int(fields[0])
+
+    return records.get(month), version
+
+
+def list_file_students():
+    """
+    List every student that has a folder or a sealed record in the file store
+    Returns:
+        list: Sorted student IDs
+    """
+    from archive import list_archived_students
+
+    if not os.path.isdir(DATA_DIR):
+        return []
+
+    students = list_archived_students()
+    for name in os.listdir(DATA_DIR):
+        if is_valid_student_id(name) and os.path.isdir(os.path.join(DATA_DIR, name)):
+            students.add(name)
+
+    return sorted(students)
+
+
+def list_months(student_id):
+    """
+    List the months with a snapshot for one student
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        list: Month names in calendar order
+    """
+    student_dir = get_student_dir(student_id)
+    if not os.path.isdir(student_dir):
+        return []
+
+    saved = set(os.listdir(student_dir))
+    return [month for month in MONTH_NAMES if month + RECORD_EXTENSION in saved]
+
+
+def load_live_student(student_id):
+    """
+    Load every month of one student kept in the student folder
+    (snapshots plus journal tail)
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        dict: Month name -> attendance data
+    """
+    records = {}
+    sequences = {}
+
+    with lock_student(student_id):
+        for month in list_months(student_id):
+            data, sequence = read_snapshot(student_id, month)
+            if data is not None:
+                records[month] = data
+                sequences[month] = sequence
+
+        for fields in read_journal(student_id):
+            if int(fields[0]) > sequences.get(fields[2], 0):
+                apply_event(records, fields, student_id)
+
+    return records
+
+
+def load_file_student(student_id):
+    """
+    Load every saved month of one student, sealed months included
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        dict: Month name -> attendance data, in calendar order
+    """
+    from archive import archived_months, load_archived
+
+    records = load_live_student(student_id)
+
+    for month in archived_months(student_id):
+        if month not in records:
+            records[month] = load_archived(student_id, month)
+
+    return {month: records[month] for month in MONTH_NAMES if month in records}
+
+
+def find_latest_month(student_id):
+    """
+    Find the most recently saved month of one student, or the most
+    recently sealed one if every month is sealed
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        str: Month name, or None if nothing is saved
+    """
+    # The newest journal event names the most recently saved month
+    events = read_journal(student_id)
+    if events:
+        return events[-1][2]
+
+    from archive import archived_months, get_segment_path
+
+    # Otherwise pick the newest snapshot of this student only
+    latest_month = None
+    latest_time = None
+    for saved_month in list_months(student_id):
+        saved_time = os.path.getmtime(get_record_path(student_id, saved_month))
+        if latest_time is None or saved_time >= latest_time:
+            latest_month = saved_month
+            latest_time = saved_time
+
+    if latest_month is not None:
+        return latest_month
+
+    # Every month is sealed: pick the most recently sealed one
+    for sealed_month in archived_months(student_id):
+        sealed_time = os.path.getmtime(get_segment_path(sealed_month))
+        if latest_time is None or sealed_time >= latest_time:
+            latest_month = sealed_month
+            latest_time = sealed_time
+
+    return latest_month
+
+
+def migrate_legacy_file():
+    """
+    Move an old single-record attendance_data.txt into the store
+    as a record of the default student
+    Returns:
+        tuple: (migrated attendance data or None, its version)
+    """
+    if not os.path.exists(DATA_FILE):
+        return None, 0
+
     try:
-        if os.path.exists(DATA_FILE):
+        with lock_student(DEFAULT_STUDENT_ID, exclusive=True):
+            try:
+                with open(DATA_FILE, "r", encoding="utf-8") as file:
+                    data = parse_record(file.readlines())
+            except FileNotFoundError:
+                # Another session migrated it while this one waited
+                month = find_latest_month(DEFAULT_STUDENT_ID)
+                return read_record(DEFAULT_STUDENT_ID, month) if month is not None else (None, 0)
+
+            if data is None:
+                return None, 0
+
+            version = save_record(DEFAULT_STUDENT_ID, data)
+            if version is None:
+                return None, 0
+
             os.remove(DATA_FILE)
-            return True
+            return data, version
+
+    except Exception as e:
+        show_store_message(f"⚠ Error loading data: {e}")
+        return None, 0
+
+
+def load_file_record(student_id=DEFAULT_STUDENT_ID, month=None):
+    """
+    Load attendance data and its version from the file store
+    Parameters:
+        student_id (str): Student to load
+        month (str): Month to load, or None for the most recently saved one
+    Returns:
+        tuple: (attendance data or None, version - 0 if nothing is saved)
+    """
+    from archive import load_archived
+
+    try:
+        with lock_student(student_id):
+            if month is None:
+                month = find_latest_month(student_id)
+            if month is not None:
+                data, version = read_record(student_id, month)
+                if data is None:
+                    # A sealed month, decompressed on first use
+                    data = load_archived(student_id, month)
+                return data, version
+
+    except Exception as e:
+        show_store_message(f"⚠ Error loading data: {e}")
+        return None, 0
+
+    if student_id == DEFAULT_STUDENT_ID:
+        return migrate_legacy_file()
+
+    return None, 0
+
+
+def delete_file_data(student_id=DEFAULT_STUDENT_ID, month=None, keep_subjects=False):
+    """
+    Delete saved data of one student from the file store
+    (sealed records in the archive are never changed)
+    Parameters:
+        student_id (str): Student whose data is deleted
+        month (str): Month to delete, or None for every month
+        keep_subjects (bool): Leave the subject records in place (used when
+                              sealing, as segments hold only the month records)
+    Returns:
+        bool: True if something was deleted, False otherwise
+    """
+    try:
+        if not os.path.isdir(get_student_dir(student_id)):
+            return False
+
+        deleted = []
+        with lock_student(student_id, exclusive=True):
+            # Fold pending events first so deleting a snapshot removes them too
+            compact_journal(student_id)
+
+            if month is not None:
+                months = [month]
+            else:
+                months = list_months(student_id)
+
+            for saved_month in months:
+                path = get_record_path(student_id, saved_month)
+                if os.path.exists(path):
+                    os.remove(path)
+                    deleted.append(saved_month)
+
+            # Subject records go with their month, unless it is being sealed
+            if not keep_subjects:
+                for saved_month in (MONTH_NAMES if month is None else [month]):
+                    path = get_subject_path(student_id, saved_month)
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        for saved_month in deleted:
+            notify_save_listeners(student_id, saved_month)
+
+        return len(deleted) > 0
+    except Exception as e:
+        show_store_message(f"⚠ Error deleting data: {e}")
         return False
+
+
+def save_file_subjects(student_id, record):
+    """
+    Save the subject record of one (student, month), replacing the old one
+    in one step (temp file + rename)
+    Parameters:
+        student_id (str): Student ID
+        record (SubjectRecord): Period-by-period marks
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        path = get_subject_path(student_id, record.month)
+        buffer = record.to_bytes()
+
+        with lock_student(student_id, exclusive=True):
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write(buffer)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+
+        if METRICS_ENABLED:
+            record_io("subject_write", len(buffer))
+        return True
     except Exception as e:
-        print(f"\n⚠ Error deleting data: {e}")
+        show_store_message(f"⚠ Error saving data: {e}")
         return False
+
+
+def load_file_subjects(student_id, month):
+    """
+    Load the subject record of one (student, month)
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+    Returns:
+        SubjectRecord: The record, or None if there is none
+    """
+    try:
+        with lock_student(student_id):
+            with open(get_subject_path(student_id, month), "rb") as file:
+                buffer = file.read()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        show_store_message(f"⚠ Error loading data: {e}")
+        return None
+
+    if METRICS_ENABLED:
+        record_io("subject_read", len(buffer))
+
+    try:
+        return SubjectRecord.from_bytes(buffer)
+    except (ValueError, struct.error) as e:
+        show_store_message(f"⚠ Error loading data: {e}")
+        return None
+
+
+class FileStore:
+    """
+    The default store: per-student journal and month snapshots under DATA_DIR
+
+    Every store offers the same methods, so save_data, load_data and
+    the other functions below work the same on any of them
+    (see sqlite_store.SQLiteStore for the database store)
+    """
+
+    def save(self, student_id, data, expected_version=None):
+        return save_record(student_id, data, expected_version)
+
+    def save_many(self, items):
+        saved = 0
+        # One lock for each run of records of the same student
+        for student_id, group in groupby(items, key=lambda item: item[0]):
+            try:
+                with lock_student(student_id, exclusive=True):
+                    for _, data in group:
+                        if save_record(student_id, data) is not None:
+                            saved += 1
+            except Exception as e:
+                show_store_message(f"⚠ Error saving data: {e}")
+        return saved
+
+    def load(self, student_id, month=None):
+        return load_file_record(student_id, month)[0]
+
+    def load_versioned(self, student_id, month=None):
+        return load_file_record(student_id, month)
+
+    def delete(self, student_id, month=None):
+        return delete_file_data(student_id, month)
+
+    def mark_day(self, student_id, month, status):
+        return journal_file_mark_day(student_id, month, status)
+
+    def unmark_day(self, student_id, month, day_number):
+        return journal_file_unmark_day(student_id, month, day_number)
+
+    def correct_day(self, student_id, month, day_number, status):
+        return journal_file_correct_day(student_id, month, day_number, status)
+
+    def list_students(self):
+        return list_file_students()
+
+    def load_student(self, student_id):
+        return load_file_student(student_id)
+
+    def save_subjects(self, student_id, record):
+        return save_file_subjects(student_id, record)
+
+    def load_subjects(self, student_id, month):
+        return load_file_subjects(student_id, month)
+
+
+# Store used by every function below
+_store = FileStore()
+
+
+def use_store(store):
+    """
+    Switch every save and load to another store
+    Parameters:
+        store: FileStore, sqlite_store.SQLiteStore or any object with the same methods
+    """
+    global _store
+    _store = store
+
+
+def get_store():
+    """Get the store currently in use"""
+    return _store
+
+
+@instrument("file.save_data")
+def save_data(data, student_id=DEFAULT_STUDENT_ID):
+    """
+    Save attendance data to the store
+    Parameters:
+        data (dict): Attendance data dictionary
+        student_id (str): Student the data belongs to
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return _store.save(student_id, data) is not None
+
+
+def save_versioned_data(data, student_id=DEFAULT_STUDENT_ID, expected_version=None):
+    """
+    Save attendance data unless another session saved that month since
+    it was loaded (optimistic concurrency: nothing is locked in between)
+    Parameters:
+        data (dict): Attendance data dictionary
+        student_id (str): Student the data belongs to
+        expected_version (int): Version from load_versioned_data or an earlier
+                                save (0 = not saved yet), or None to save anyway
+    Returns:
+        int: New version of the record, or None if not saved
+    """
+    return _store.save(student_id, data, expected_version)
+
+
+def save_many_data(items):
+    """
+    Save many records at once (in batched transactions where the store has them)
+    Parameters:
+        items (iterable): (student_id, attendance data) pairs
+    Returns:
+        int: Number of records saved
+    """
+    return _store.save_many(items)
+
+
+@instrument("file.load_data")
+def load_data(student_id=DEFAULT_STUDENT_ID, month=None):
+    """
+    Load attendance data from the store
+    Parameters:
+        student_id (str): Student to load
+        month (str): Month to load, or None for the most recently saved one
+    Returns:
+        dict: Attendance data dictionary, or None if nothing is saved
+    """
+    return _store.load(student_id, month)
+
+
+def load_versioned_data(student_id=DEFAULT_STUDENT_ID, month=None):
+    """
+    Load attendance data together with its version, for save_versioned_data
+    Parameters:
+        student_id (str): Student to load
+        month (str): Month to load, or None for the most recently saved one
+    Returns:
+        tuple: (attendance data or None, version - 0 if nothing is saved)
+    """
+    return _store.load_versioned(student_id, month)
+
+
+def delete_data(student_id=DEFAULT_STUDENT_ID, month=None):
+    """
+    Delete saved data of one student
+    Parameters:
+        student_id (str): Student whose data is deleted
+        month (str): Month to delete, or None for every month
+    Returns:
+        bool: True if something was deleted, False otherwise
+    """
+    return _store.delete(student_id, month)
+
+
+def journal_mark_day(student_id, month, status):
+    """
+    Record one more working day for a student's month
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+        status (str): 'P' or 'A'
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return _store.mark_day(student_id, month, status)
+
+
+def journal_unmark_day(student_id, month, day_number):
+    """
+    Remove one recorded working day
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+        day_number (int): Working day to remove (1-based)
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return _store.unmark_day(student_id, month, day_number)
+
+
+def journal_correct_day(student_id, month, day_number, status):
+    """
+    Change the mark of an already recorded working day
+    Parameters:
+        student_id (str): Student ID
+        month (str): Month name
+        day_number (int): Working day to correct (1-based)
+        status (str): 'P' or 'A'
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return _store.correct_day(student_id, month, day_number, status)
+
+
+def list_students():
+    """
+    List every student that has at least one saved record
+    Returns:
+        list: Sorted student IDs
+    """
+    return _store.list_students()
+
+
+def load_student(student_id):
+    """
+    Load every saved month of one student
+    Parameters:
+        student_id (str): Student ID
+    Returns:
+        dict: Month name -> attendance data, in calendar order
+    """
+    return _store.load_student(student_id)
+
+
+def save_subject_data(record, student_id=DEFAULT_STUDENT_ID):
+    """
+    Save a month of period-by-period marks to the store
+    Parameters:
+        record (SubjectRecord): Subject record
+        student_id (str): Student the record belongs to
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return _store.save_subjects(student_id, record)
+
+
+def load_subject_data(student_id=DEFAULT_STUDENT_ID, month=None):
+    """
+    Load a month of period-by-period marks from the store
+    Parameters:
+        student_id (str): Student to load
+        month (str): Month name
+    Returns:
+        SubjectRecord: The record, or None if nothing is saved
+    """
+    return _store.load_subjects(student_id, month)
@@ -0,0 +1,147 @@
+# ============================================================
+# MSAAS - File Lock Module
+# Advisory locks that let several sessions share one data folder
+# ============================================================
+#
+# A lock is held on a small lock file: shared by any number of
+# readers, or exclusive to one writer. fcntl.flock is used on Linux
+# and macOS; Windows only has exclusive locks (msvcrt.locking), so
+# readers there take turns as well.
+# Locks are re-entrant within a thread: a function holding a lock can
+# call another that takes the same lock.
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Seconds to wait for another session before giving up
+LOCK_TIMEOUT = 10.0
+
+# Longest pause between two attempts, in seconds
+LOCK_MAX_DELAY = 0.05
+
+# Lock path -> [FileLock, depth] of the locks this thread holds
+_held = threading.local()
+
+
+def _held_locks():
+    try:
+        return _held.locks
+    except AttributeError:
+        _held.locks = {}
+        return _held.locks
+
+
+def _try_lock(fd, exclusive):
+    """
+    Make one attempt to take the lock
+    Returns:
+        bool: True if the lock is now held
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except BlockingIOError:
+        return False
+    except OSError:
+        if fcntl is not None:
+            raise
+        return False  # msvcrt reports a held lock as EACCES or EDEADLOCK
+    return True
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """
+    Shared or exclusive lock on one lock file
+
+    Used as a context manager giving the lock file's descriptor, open
+    for reading and writing, so small bits of state can be kept in the
+    file while the lock is held
+    """
+
+    def __init__(self, path, exclusive=True, timeout=LOCK_TIMEOUT):
+        """
+        Parameters:
+            path (str): Lock file, created if missing (its folder must exist)
+            exclusive (bool): True for a writer, False for a reader
+            timeout (float): Seconds to wait before raising TimeoutError
+        """
+        self.path = path
+        self.exclusive = exclusive
+        self.timeout = timeout
+        self.fd = None
+
+    def acquire(self):
+        """
+        Wait for the lock
+        Returns:
+            int: File descriptor of the lock file
+        Raises:
+            TimeoutError: If another session held the lock for too long
+            RuntimeError: If this thread holds a shared lock and asks for an exclusive one
+        """
+        locks = _held_locks()
+        held = locks.get(self.path)
+        if held is not None:
+            owner = held[0]
+            if self.exclusive and not owner.exclusive:
+                raise RuntimeError(f"Cannot upgrade a shared lock on {self.path}")
+            held[1] += 1
+            self.fd = owner.fd
+            return self.fd
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            if not _try_lock(fd, self.exclusive):
+                deadline = time.monotonic() + self.timeout
+                delay = 0.001
+                while not _try_lock(fd, self.exclusive):
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"{self.path} is locked by another session")
+                    time.sleep(delay)
+                    delay = min(delay * 2, LOCK_MAX_DELAY)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self.fd = fd
+        locks[self.path] = [self, 1]
+        return fd
+
+    def release(self):
+        """Give the lock back (the outermost release unlocks the file)"""
+        locks = _held_locks()
+        held = locks[self.path]
+        held[1] -= 1
+        if held[1] > 0:
+            return
+
+        del locks[self.path]
+        fd = held[0].fd
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,212 @@
+# ============================================================
+# MSAAS - Instrumentation Module
+# Opt-in call counts, latency histograms and file I/O counters
+# ============================================================
+#
+# Switched on by naming an output file before starting the program:
+#
+#   MSAAS_METRICS=metrics.json python main.py
+#
+# The metrics are written to that file as JSON when the program
+# exits (and served at GET /metrics by the API server).
+# When the variable is not set, @instrument returns the original
+# function unchanged and timed() returns a shared no-op context,
+# so instrumented code runs exactly as before.
+
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+
+# Environment variable naming the metrics output file
+METRICS_ENV = "MSAAS_METRICS"
+
+METRICS_FILE = os.environ.get(METRICS_ENV, "")
+METRICS_ENABLED = METRICS_FILE != ""
+
+# Upper bounds of the latency histogram buckets, in microseconds;
+# slower calls land in a final "+Inf" bucket
+LATENCY_BUCKETS_US = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000,
+                      10000, 20000, 50000, 100000, 500000, 1000000)
+
+# Name -> [calls, total ns, slowest ns, bucket counts]
+_timings = {}
+
+# I/O kind -> [operations, bytes]
+_io_counts = {}
+
+# Guards both tables (the API server and the autosave thread record
+# from worker threads)
+_lock = threading.Lock()
+
+# Context returned by timed() while instrumentation is off
+_NO_TIMER = nullcontext()
+
+
+def record_timing(name, elapsed_ns):
+    """
+    Add one call to the statistics of a name
+    Parameters:
+        name (str): Action or function name
+        elapsed_ns (int): Time the call took, in nanoseconds
+    """
+    bucket = bisect_left(LATENCY_BUCKETS_US, elapsed_ns / 1000)
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = [0, 0, 0, [0] * (len(LATENCY_BUCKETS_US) + 1)]
+            _timings[name] = timing
+
+        timing[0] += 1
+        timing[1] += elapsed_ns
+        if elapsed_ns > timing[2]:
+            timing[2] = elapsed_ns
+        timing[3][bucket] += 1
+
+
+def record_io(kind, size):
+    """
+    Count one file operation and the bytes it moved
+    Callers check METRICS_ENABLED first, so this is never reached
+    while instrumentation is off
+    Parameters:
+        kind (str): e.g. "journal_append" or "snapshot_read"
+        size (int): Bytes read or written
+    """
+    with _lock:
+        counts = _io_counts.get(kind)
+        if counts is None:
+            counts = [0, 0]
+            _io_counts[kind] = counts
+
+        counts[0] += 1
+        counts[1] += size
+
+
+def instrument(name):
+    """
+    Decorator recording the count and latency of every call
+    Parameters:
+        name (str): Name the calls are recorded under
+    Returns:
+        function: Decorator - the identity while instrumentation is off
+    """
+    def decorate(func):
+        if not METRICS_ENABLED:
+            return func
+
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_timing(name, clock() - started)
+
+        return wrapper
+
+    return decorate
+
+
+class _Timer:
+    """Context manager timing one block of code"""
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record_timing(self.name, time.perf_counter_ns() - self.started)
+        return False
+
+
+def timed(name):
+    """
+    Time a block of code, e.g. `with timed("action.summary"):`
+    Parameters:
+        name (str): Name the block is recorded under
+    Returns:
+        Context manager (a shared no-op while instrumentation is off)
+    """
+    if not METRICS_ENABLED:
+        return _NO_TIMER
+    return _Timer(name)
+
+
+def get_metrics():
+    """
+    Get every statistic collected so far
+    Returns:
+        dict: Machine-readable metrics
+    """
+    bucket_labels = [str(bound) for bound in LATENCY_BUCKETS_US] + ["+Inf"]
+
+    # Copied at once, so calls recorded meanwhile cannot mix in
+    with _lock:
+        timing_rows = {name: (timing[0], timing[1], timing[2], list(timing[3]))
+                       for name, timing in _timings.items()}
+        io_rows = {kind: tuple(counts) for kind, counts in _io_counts.items()}
+
+    timings = {}
+    for name in sorted(timing_rows):
+        calls, total_ns, slowest_ns, buckets = timing_rows[name]
+        timings[name] = {
+            "calls": calls,
+            "total_ms": round(total_ns / 1e6, 3),
+            "mean_us": round(total_ns / calls / 1000, 2),
+            "max_us": round(slowest_ns / 1000, 2),
+            "histogram_us": {label: count for label, count in zip(bucket_labels, buckets) if count}
+        }
+
+    io = {}
+    for kind in sorted(io_rows):
+        operations, size = io_rows[kind]
+        io[kind] = {"operations": operations, "bytes": size}
+
+    return {
+        "enabled": METRICS_ENABLED,
+        "pid": os.getpid(),
+        "timings": timings,
+        "io": io,
+        "bytes_read": sum(size for kind, (count, size) in io_rows.items() if kind.endswith("_read")),
+        "bytes_written": sum(size for kind, (count, size) in io_rows.items() if not kind.endswith("_read"))
+    }
+
+
+def dump_metrics(path=None):
+    """
+    Write the metrics to a JSON file
+    Parameters:
+        path (str): Output file (default: the file named by MSAAS_METRICS)
+    """
+    if path is None:
+        path = METRICS_FILE
+
+    try:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(get_metrics(), file, indent=2)
+            file.write("\n")
+    except OSError as e:
+        print(f"\n⚠ Error writing metrics: {e}")
+
+
+def reset_metrics():
+    """Forget every statistic collected so far"""
+    with _lock:
+        _timings.clear()
+        _io_counts.clear()
+
+
+if METRICS_ENABLED:
+    atexit.register(dump_metrics)
@@ -0,0 +1,333 @@
+# ============================================================
+# MSAAS - Leave Planner Module
+# Which upcoming working days a student can skip and still end
+# every month and the term at or above the 75% minimum
+# ============================================================
+#
+# calculate_safe_leaves says how many days can be missed; the planner
+# picks the days. Every month left in the term can lose at most
+#
+#   present + upcoming - calculate_required_days(target, total + upcoming)
+#
+# days (its safe leaves), and the whole term at most the same sum over
+# every month. Must-attend days (exams) are never picked. The other
+# days are taken greedily, preferred days off first in date order, then
+# the latest days first (keeping the margin for unplanned absences as
+# long as possible), each one if its month and the term still have a
+# leave to spare. The limits nest (months inside the term), so this
+# greedy choice skips as many days as possible, and among those plans
+# as many preferred days as possible.
+
+from collections import Counter
+
+from calculator import calculate_percentage, calculate_required_days, MINIMUM_ATTENDANCE_PERCENT
+from attendance import MONTH_NAMES
+from school_calendar import get_calendar, default_year, month_dates, parse_date, parse_weekday, term_records
+
+
+def parse_day_list(text):
+    """
+    Read a comma-separated list of dates and day names
+    e.g. "2026-03-12, 2026-03-13" or "Friday, 2026-02-16"
+    Parameters:
+        text (str): The list
+    Returns:
+        tuple: (set of dates, set of weekday numbers)
+    Raises:
+        ValueError: If an item is neither a date nor a day name
+    """
+    dates = set()
+    weekdays = set()
+    for item in text.split(","):
+        if item.strip() == "":
+            continue
+        if item.strip()[:1].isdigit():
+            dates.add(parse_date(item))
+        else:
+            weekdays.add(parse_weekday(item))
+    return dates, weekdays
+
+
+def upcoming_days(last_month, end_month, recorded_days=0, school_calendar=None, year=None, section=None):
+    """
+    List the working days left in the term, like
+    risk_simulator.remaining_working_days but day by day
+    Parameters:
+        last_month (str): Last month with attendance recorded
+        end_month (str): Last month of the term
+        recorded_days (int): Working days recorded in last_month
+        school_calendar (SchoolCalendar): Calendar to use, default get_calendar()
+        year (int): Year of last_month, default the most recent one
+        section (str): Section, or None for the whole school
+    Returns:
+        list: (month, date) of every working day left, in date order
+    """
+    if school_calendar is None:
+        school_calendar = get_calendar()
+    if year is None:
+        year = default_year(last_month)
+
+    days = []
+    index = MONTH_NAMES.index(last_month)
+    while True:
+        month = MONTH_NAMES[index]
+        dates = school_calendar.working_dates(*month_dates(month, year), section)
+        if month == last_month:
+            dates = dates[recorded_days:]
+        days.extend((month, day) for day in dates)
+
+        if month == end_month:
+            return days
+        index += 1
+        if index == 12:
+            index = 0
+            year += 1
+
+
+def order_candidates(days, must_attend=(), preferred=(), preferred_weekdays=()):
+    """
+    Put the days that may be skipped in the order the planner tries them
+    Parameters:
+        days (list): (month, date) from upcoming_days
+        must_attend (set): Dates that cannot be skipped
+        preferred (set): Preferred dates off
+        preferred_weekdays (set): Preferred weekdays off (Monday = 0)
+    Returns:
+        list: (month, date), preferred days first
+    """
+    first = []
+    rest = []
+    for month, day in days:
+        if day in must_attend:
+            continue
+        if day in preferred or day.weekday() in preferred_weekdays:
+            first.append((month, day))
+        else:
+            rest.append((month, day))
+
+    rest.reverse()
+    return first + rest
+
+
+def leave_limits(records, days, target_percent=MINIMUM_ATTENDANCE_PERCENT):
+    """
+    Work out how many days each month left and the term can lose
+    Parameters:
+        records (dict): month -> attendance data of the term so far, in term order
+        days (list): (month, date) from upcoming_days
+        target_percent (float): Percentage to stay at or above
+    Returns:
+        tuple: ({month: (present, total, upcoming, safe leaves)},
+                (present, total, upcoming, safe leaves) of the term)
+               safe leaves are negative when even full attendance falls short
+    """
+    upcoming = Counter(month for month, day in days)
+
+    months = {}
+    for month in dict.fromkeys(month for month, day in days):
+        data = records.get(month)
+        present = data['days_present'] if data else 0
+        total = data['total_days'] if data else 0
+        count = upcoming[month]
+        months[month] = (present, total, count,
+                         present + count - calculate_required_days(target_percent, total + count))
+
+    present = sum(data['days_present'] for data in records.values())
+    total = sum(data['total_days'] for data in records.values())
+    count = len(days)
+    term = (present, total, count, present + count - calculate_required_days(target_percent, total + count))
+    return months, term
+
+
+def choose_leaves(candidates, months, term):
+    """
+    Take candidate days while their month and the term can spare them
+    Parameters:
+        candidates (list): (month, date) from order_candidates
+        months (dict): Month limits from leave_limits
+        term (tuple): Term limits from leave_limits
+    Returns:
+        list: Chosen dates in date order
+    """
+    budget = term[3]
+    taken = Counter()
+    leaves = []
+
+    for month, day in candidates:
+        if budget <= 0:
+            break
+        if taken[month] < months[month][3]:
+            taken[month] += 1
+            leaves.append(day)
+            budget -= 1
+
+    leaves.sort()
+    return leaves
+
+
+def build_plan(leaves, months, term):
+    """
+    Describe the result of following a plan
+    Returns:
+        dict: leaves (dates), upcoming_days, months (list of month,
+              upcoming, leaves, percentage, meets_target), term_percentage,
+              term_meets_target and meets_target (the term and every month)
+    """
+    skipped = Counter(MONTH_NAMES[day.month - 1] for day in leaves)
+
+    month_rows = []
+    for month, (present, total, count, safe_leaves) in months.items():
+        month_rows.append({
+            "month": month,
+            "upcoming": count,
+            "leaves": skipped[month],
+            "percentage": calculate_percentage(present + count - skipped[month], total + count),
+            "meets_target": safe_leaves >= 0
+        })
+
+    present, total, count, safe_leaves = term
+    return {
+        "leaves": leaves,
+        "upcoming_days": count,
+        "months": month_rows,
+        "term_percentage": calculate_percentage(present + count - len(leaves), total + count),
+        "term_meets_target": safe_leaves >= 0,
+        "meets_target": safe_leaves >= 0 and all(row["meets_target"] for row in month_rows)
+    }
+
+
+def plan_leaves(records, end_month, must_attend=(), preferred=(), preferred_weekdays=(),
+                school_calendar=None, year=None, section=None,
+                target_percent=MINIMUM_ATTENDANCE_PERCENT, start_month=None):
+    """
+    Plan the days one student can skip up to the end of term
+    The days left start after the last working day recorded in the term
+    Parameters:
+        records (dict): month -> attendance data, as from load_student
+        end_month (str): Last month of the term
+        must_attend (set): Dates that cannot be skipped (exams)
+        preferred (set): Preferred dates off
+        preferred_weekdays (set): Preferred weekdays off (Monday = 0)
+        school_calendar (SchoolCalendar): Calendar to use, default get_calendar()
+        year (int): Year of the last recorded month, default the most recent one
+        section (str): Section, or None for the whole school
+        target_percent (float): Percentage to stay at or above
+        start_month (str): First month of the term, default the month
+                           after end_month (the whole year up to it)
+    Returns:
+        dict: The plan (see build_plan)
+    Raises:
+        ValueError: If there is no attendance recorded in the term
+    """
+    records = term_records(records, end_month, start_month)
+    if not records:
+        raise ValueError("No attendance data recorded in the term")
+
+    last_month = list(records)[-1]
+    days = upcoming_days(last_month, end_month, records[last_month]['total_days'],
+                         school_calendar, year, section)
+    months, term = leave_limits(records, days, target_percent)
+    candidates = order_candidates(days, must_attend, preferred, preferred_weekdays)
+    return build_plan(choose_leaves(candidates, months, term), months, term)
+
+
+def plan_store(end_month, must_attend=(), preferred=(), preferred_weekdays=(),
+               school_calendar=None, year=None, section=None,
+               target_percent=MINIMUM_ATTENDANCE_PERCENT, start_month=None):
+    """
+    Plan every stored student at once
+    Students whose records end at the same place share the days left
+    and their order, so each one only costs the greedy pass
+    Parameters:
+        end_month (str): Last month of the term
+        (the others as for plan_leaves, the same for every student)
+    Returns:
+        tuple: (list of student IDs, list of plans)
+    """
+    from file_handler import list_students, load_student
+
+    if school_calendar is None:
+        school_calendar = get_calendar()
+
+    # (last month, recorded days) -> (days left, candidates in order)
+    shared = {}
+    student_ids = []
+    plans = []
+
+    for student_id in list_students():
+        records = term_records(load_student(student_id), end_month, start_month)
+        if not records:
+            continue
+
+        last_month = list(records)[-1]
+        key = (last_month, records[last_month]['total_days'])
+        if key not in shared:
+            days = upcoming_days(last_month, end_month, key[1], school_calendar, year, section)
+            shared[key] = (days, order_candidates(days, must_attend, preferred, preferred_weekdays))
+        days, candidates = shared[key]
+
+        months, term = leave_limits(records, days, target_percent)
+        student_ids.append(student_id)
+        plans.append(build_plan(choose_leaves(candidates, months, term), months, term))
+
+    return student_ids, plans
+
+
+def format_day(day):
+    """Show a date with its weekday, e.g. Fri 2026-03-13"""
+    return day.strftime("%a %Y-%m-%d")
+
+
+def format_plan(student_id, plan, target_percent=MINIMUM_ATTENDANCE_PERCENT):
+    """
+    Build the text of one student's plan
+    Parameters:
+        student_id (str): Student ID
+        plan (dict): Plan from plan_leaves
+        target_percent (float): Target the plan was made for
+    Returns:
+        str: Plan text
+    """
+    lines = [
+        f"Leave plan for {student_id} ({target_percent}% minimum)",
+        f"  {plan['upcoming_days']} working days left, {len(plan['leaves'])} can be skipped",
+        "",
+        f"  {'Month':<12}{'Left':>6}{'Skip':>6}{'Final %':>10}"
+    ]
+    for row in plan["months"]:
+        lines.append(f"  {row['month']:<12}{row['upcoming']:>6}{row['leaves']:>6}{row['percentage']:>10.2f}")
+    lines.append(f"  {'Term':<12}{plan['upcoming_days']:>6}{len(plan['leaves']):>6}{plan['term_percentage']:>10.2f}")
+
+    if plan["leaves"]:
+        lines.append("")
+        lines.append("  Days you can skip:")
+        for day in plan["leaves"]:
+            lines.append(f"    {format_day(day)}")
+
+    for row in plan["months"]:
+        if not row["meets_target"]:
+            lines.append(f"  ⚠ {row['month']} cannot reach {target_percent}% even with full attendance")
+    if not plan["term_meets_target"]:
+        lines.append(f"  ⚠ The term cannot reach {target_percent}% even with full attendance")
+
+    return "\n".join(lines) + "\n"
+
+
+def format_cohort_plans(student_ids, plans):
+    """
+    Build a table of every student's plan
+    Parameters:
+        student_ids (list): Student IDs in the order of plans
+        plans (list): Plans from plan_store
+    Returns:
+        str: Report text
+    """
+    lines = [f"{'Student':<34}{'Left':>6}{'Skip':>6}{'Final %':>10}  {'Next day off':<16}"]
+    for student_id, plan in zip(student_ids, plans):
+        if plan["leaves"]:
+            next_day = format_day(plan["leaves"][0])
+        else:
+            next_day = "-" if plan["meets_target"] else "⚠ below minimum"
+        lines.append(f"{student_id:<34}{plan['upcoming_days']:>6}{len(plan['leaves']):>6}"
+                     f"{plan['term_percentage']:>10.2f}  {next_day:<16}")
+    return "\n".join(lines) + "\n"
@@ -5,12 +5,32 @@
 # ============================================================
 
 # Importing required modules
-from menu import display_welcome, display_menu, display_goodbye
+import argparse
+import sys
+
+from menu import display_welcome, display_goodbye, MENU_TEXT
 from attendance import enter_attendance, enter_quick_attendance
 from calculator import calculate_days_needed, calculate_safe_leaves
 from display import view_summary, view_daily_record, check_status, view_monthly_report
-from file_handler import save_data, load_data
-from utils import get_valid_choice, pause_screen, clear_screen
+from file_handler import load_versioned_data, DEFAULT_STUDENT_ID
+from utils import get_valid_choice, get_valid_student_id, pause_screen
+from screen import present_screen
+from instrumentation import timed
+from autosave import AutoSaver, install_exit_handlers
+
+# Name each menu choice is timed under (see instrumentation.py)
+ACTION_NAMES = {
+    1: "action.enter_attendance",
+    2: "action.quick_entry",
+    3: "action.view_summary",
+    4: "action.check_status",
+    5: "action.view_daily_record",
+    6: "action.days_needed",
+    7: "action.safe_leaves",
+    8: "action.monthly_report",
+    9: "action.save",
+    10: "action.exit"
+}
 
 def main():
     """
@@ -21,10 +41,25 @@ def main():
     display_welcome()
     pause_screen()
     
-    # Try to load existing data from file
-    attendance_data = load_data()
+    # Ask which student this session is for
+    student_id = get_valid_student_id(
+        f"\nEnter student ID (press Enter for '{DEFAULT_STUDENT_ID}'): ",
+        DEFAULT_STUDENT_ID
+    )
+    
+    # Changes are saved in the background, and whatever is still
+    # pending is saved however the program ends
+    saver = AutoSaver(student_id)
+    install_exit_handlers(saver)
+    
+    # Try to load existing data from file. The version is checked when
+    # the data is saved manually or on exit, so changes another session
+    # saved in the meantime are never overwritten with this session's
+    # older copy
+    attendance_data, version = load_versioned_data(student_id)
     
     if attendance_data is not None:
+        saver.set_version(attendance_data['month'], version)
         print("\n✓ Previous attendance data loaded successfully!")
     else:
         print("\n○ No previous data found. Start fresh!")
@@ -34,69 +69,290 @@ def main():
     running = True
     
     while running:
-        clear_screen()
-        display_menu()
+        # Drawn over the previous menu instead of blanking the screen first
+        present_screen(MENU_TEXT)
+        
+        # Results of the background saves since the menu was last shown
+        for message in saver.take_messages():
+            print(message)
+        if attendance_data is not None and attendance_data['month'] in saver.take_conflicts():
+            # Saved by another session: continue with their data
+            attendance_data, version = load_versioned_data(student_id, attendance_data['month'])
+            if attendance_data is not None:
+                saver.set_version(attendance_data['month'], version)
+                print("○ The newer saved data has been loaded")
         
         choice = get_valid_choice("Enter your choice (1-10): ", 1, 10)
         
-        # Menu option handling using if-elif-else
-        if choice == 1:
-            # Enter detailed attendance
-            attendance_data = enter_attendance()
-            if attendance_data is not None:
-                save_data(attendance_data)
+        # Each action is timed when instrumentation is switched on
+        with timed(ACTION_NAMES[choice]):
+            # Menu option handling using if-elif-else
+            if choice == 1:
+                # Enter detailed attendance
+                attendance_data = enter_attendance()
+                if attendance_data is not None:
+                    saver.save(attendance_data)
                 
-        elif choice == 2:
-            # Quick attendance entry
-            attendance_data = enter_quick_attendance()
-            if attendance_data is not None:
-                save_data(attendance_data)
+            elif choice == 2:
+                # Quick attendance entry
+                attendance_data = enter_quick_attendance()
+                if attendance_data is not None:
+                    saver.save(attendance_data)
                 
-        elif choice == 3:
-            # View summary
-            view_summary(attendance_data)
+            elif choice == 3:
+                # View summary
+                view_summary(attendance_data)
             
-        elif choice == 4:
-            # Check status against 75%
-            check_status(attendance_data)
+            elif choice == 4:
+                # Check status against 75%
+                check_status(attendance_data)
             
-        elif choice == 5:
-            # View day-wise record
-            view_daily_record(attendance_data)
+            elif choice == 5:
+                # View day-wise record
+                view_daily_record(attendance_data)
             
-        elif choice == 6:
-            # Calculate days needed
-            calculate_days_needed(attendance_data)
+            elif choice == 6:
+                # Calculate days needed
+                calculate_days_needed(attendance_data)
             
-        elif choice == 7:
-            # Calculate safe leaves
-            calculate_safe_leaves(attendance_data)
+            elif choice == 7:
+                # Calculate safe leaves
+                calculate_safe_leaves(attendance_data)
             
-        elif choice == 8:
-            # View monthly report
-            view_monthly_report(attendance_data)
+            elif choice == 8:
+                # View monthly report
+                view_monthly_report(attendance_data)
             
-        elif choice == 9:
-            # Save data manually
-            if attendance_data is not None:
-                save_data(attendance_data)
-                print("\n✓ Data saved successfully!")
-            else:
-                print("\n⚠ No data to save!")
+            elif choice == 9:
+                # Save data manually
+                if attendance_data is None:
+                    print("\n⚠ No data to save!")
+                else:
+                    # Saved right away; the result is shown with the menu
+                    saver.save(attendance_data, check_version=True)
+                    saver.flush(wait=False)
+                    print("\n○ Saving data...")
                 
-        elif choice == 10:
-            # Exit program
-            if attendance_data is not None:
-                save_data(attendance_data)
-            display_goodbye()
-            running = False
-            continue
+            elif choice == 10:
+                # Exit program
+                if attendance_data is not None:
+                    saver.save(attendance_data, check_version=True)
+                saver.close()
+                for message in saver.take_messages():
+                    print(message)
+                display_goodbye()
+                running = False
         
-        pause_screen()
+        if running:
+            pause_screen()
     
     # End of program
 
 
+def positive_int(text):
+    """argparse type: a whole number of at least 1"""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected a whole number of at least 1, got {text!r}")
+    return value
+
+
+def parse_arguments(argv):
+    """
+    Read command-line options
+    Parameters:
+        argv (list): Command-line arguments (without the program name)
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Monthly School Attendance Awareness System")
+    parser.add_argument("--batch", metavar="ROSTER",
+                        help="run the commands in a roster file without prompts")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write batch results or reports to FILE instead of the screen")
+    parser.add_argument("--reports", metavar="MONTH",
+                        help="write the monthly report of every student (see --roster)")
+    parser.add_argument("--roster", metavar="FILE",
+                        help="students for --reports (student_id[, section] per line)")
+    parser.add_argument("--output-dir", metavar="DIR",
+                        help="write --reports to one file per student under DIR")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="worker processes for --reports (default: all cores)")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the local HTTP/JSON API instead of the menu")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address for --serve (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8075,
+                        help="port for --serve (default 8075)")
+    parser.add_argument("--import", dest="import_file", metavar="FILE",
+                        help="import a CSV/TSV roll-call export (student_id, date, status)")
+    parser.add_argument("--risk", metavar="END_MONTH",
+                        help="simulate each student's chance of ending the term (up to END_MONTH) below 75%%")
+    parser.add_argument("--trials", type=positive_int, default=10000, metavar="N",
+                        help="simulated terms per student for --risk (default 10000)")
+    parser.add_argument("--term-start", metavar="MONTH",
+                        help="first month of the term for --risk/--plan-leaves (default: the twelve months up to END_MONTH)")
+    parser.add_argument("--db", metavar="FILE",
+                        help="keep attendance in an SQLite database instead of attendance_store/")
+    parser.add_argument("--seal", metavar="MONTH",
+                        help="move a closed month of every student into a compressed archive segment")
+    parser.add_argument("--class-entry", metavar="MONTH",
+                        help="enter MONTH for a whole class, one 'student_id PPAHP...' line per student from stdin")
+    parser.add_argument("--days", type=int, metavar="N",
+                        help="working days of the month for --class-entry")
+    parser.add_argument("--plan-leaves", metavar="END_MONTH",
+                        help="plan the days each student can skip up to END_MONTH and stay at 75%%")
+    parser.add_argument("--student", metavar="ID",
+                        help="student for --subject-entry/--subject-report (plans only this student for --plan-leaves)")
+    parser.add_argument("--must-attend", default="", metavar="DATES",
+                        help="days that cannot be skipped for --plan-leaves, e.g. 2026-03-12,2026-03-13")
+    parser.add_argument("--prefer", default="", metavar="DAYS",
+                        help="preferred days off for --plan-leaves, dates or day names, e.g. Friday")
+    parser.add_argument("--subject-entry", metavar="MONTH",
+                        help="enter MONTH period by period for --student, one 'Mon PPAPP' line per day from stdin")
+    parser.add_argument("--subject-report", metavar="MONTH",
+                        help="show per-subject percentages, periods needed and safe leaves of --student")
+    parser.add_argument("--timetable", default="timetable.txt", metavar="FILE",
+                        help="weekly timetable for --subject-entry/--subject-report (default timetable.txt)")
+    options = parser.parse_args(argv)
+    if options.class_entry is not None and options.days is None:
+        parser.error("--class-entry needs --days")
+    if (options.subject_entry is not None or options.subject_report is not None) and options.student is None:
+        parser.error("--subject-entry and --subject-report need --student")
+    return options
+
+
 # Program execution starts here
 if __name__ == "__main__":
+    options = parse_arguments(sys.argv[1:])
+    
+    if options.db is not None:
+        from file_handler import use_store
+        from sqlite_store import SQLiteStore
+        use_store(SQLiteStore(options.db))
+    
+    if options.import_file is not None:
+        from roll_call_import import import_roll_call
+        saved = import_roll_call(options.import_file)
+        print(f"✓ Imported {saved} monthly records")
+        sys.exit(0)
+    
+    if options.seal is not None:
+        if options.db is not None:
+            print("⚠ --seal works on the attendance_store/ folder, not on --db", file=sys.stderr)
+            sys.exit(1)
+        from attendance import parse_month
+        from archive import seal_month
+        try:
+            month = parse_month(options.seal)
+            moved, total, size = seal_month(month)
+        except ValueError as e:
+            print(f"⚠ {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✓ {moved} records of {month} sealed ({total} in the archive, {size / 1024:.1f} KiB)")
+        sys.exit(0)
+    
+    if options.class_entry is not None:
+        from attendance import parse_month
+        from class_entry import enter_class_from_stdin
+        try:
+            saved, failures = enter_class_from_stdin(parse_month(options.class_entry), options.days)
+        except ValueError as e:
+            print(f"⚠ {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(1 if failures else 0)
+    
+    if options.subject_entry is not None or options.subject_report is not None:
+        from attendance import parse_month
+        from display import view_subject_report
+        from file_handler import save_subject_data, load_subject_data
+        from subject_record import load_timetable, build_subject_record, remaining_subject_periods
+        try:
+            timetable = load_timetable(options.timetable)
+            if options.subject_entry is not None:
+                record = build_subject_record(parse_month(options.subject_entry), timetable, sys.stdin)
+                if not save_subject_data(record, options.student):
+                    sys.exit(1)
+                print(f"✓ {len(record)} days of {record.month} recorded for {options.student}")
+            else:
+                month = parse_month(options.subject_report)
+                record = load_subject_data(options.student, month)
+                if record is None:
+                    print(f"⚠ No subject-wise record of {month} for {options.student}", file=sys.stderr)
+                    sys.exit(1)
+                view_subject_report(record, remaining_subject_periods(month, len(record), timetable))
+        except (OSError, ValueError) as e:
+            print(f"⚠ {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+    
+    if options.plan_leaves is not None:
+        from attendance import parse_month
+        from file_handler import load_student
+        from leave_planner import (plan_leaves, plan_store, parse_day_list,
+                                   format_plan, format_cohort_plans)
+        try:
+            end_month = parse_month(options.plan_leaves)
+            start_month = parse_month(options.term_start) if options.term_start is not None else None
+            must_attend = parse_day_list(options.must_attend)[0]
+            preferred, preferred_weekdays = parse_day_list(options.prefer)
+            if options.student is not None:
+                plan = plan_leaves(load_student(options.student), end_month,
+                                   must_attend, preferred, preferred_weekdays,
+                                   start_month=start_month)
+                report = format_plan(options.student, plan)
+            else:
+                report = format_cohort_plans(*plan_store(end_month, must_attend,
+                                                         preferred, preferred_weekdays,
+                                                         start_month=start_month))
+        except ValueError as e:
+            print(f"⚠ {e}", file=sys.stderr)
+            sys.exit(1)
+        if options.output is not None:
+            with open(options.output, "w", encoding="utf-8") as file:
+                file.write(report)
+        else:
+            print(report, end="")
+        sys.exit(0)
+    
+    if options.risk is not None:
+        from attendance import parse_month
+        from risk_simulator import simulate_store, format_risk_report
+        try:
+            start_month = parse_month(options.term_start) if options.term_start is not None else None
+            end_month = parse_month(options.risk)
+        except ValueError as e:
+            print(f"⚠ {e}", file=sys.stderr)
+            sys.exit(1)
+        student_ids, results = simulate_store(end_month, options.trials, start_month=start_month)
+        report = format_risk_report(student_ids, results)
+        if options.output is not None:
+            with open(options.output, "w", encoding="utf-8") as file:
+                file.write(report)
+        else:
+            print(report, end="")
+        sys.exit(0)
+    
+    if options.serve:
+        from api_server import serve
+        serve(options.host, options.port)
+        sys.exit(0)
+    
+    if options.reports is not None:
+        from bulk_report import generate_reports_for_store
+        written, missing = generate_reports_for_store(
+            options.reports, options.roster, options.output,
+            options.output_dir, options.workers
+        )
+        print(f"✓ {written} reports written, {missing} students without data", file=sys.stderr)
+        sys.exit(0)
+    
+    if options.batch is not None:
+        from batch_mode import run_batch_file
+        failures = run_batch_file(options.batch, options.output)
+        sys.exit(1 if failures else 0)
+    
     main()
@@ -3,71 +3,111 @@
 # Contains all menu display functions
 # ============================================================
 
+from render import TextBlock, write_text, DOUBLE
+
+
+def render_welcome():
+    """Build the welcome screen with project information"""
+    block = TextBlock()
+    block.line()
+    block.top(58, DOUBLE)
+    block.blank(58, DOUBLE)
+    block.centered("   MONTHLY SCHOOL ATTENDANCE AWARENESS SYSTEM (MSAAS)", 58, DOUBLE)
+    block.blank(58, DOUBLE)
+    block.divider(58, DOUBLE)
+    block.blank(58, DOUBLE)
+    block.centered("   Developed By: Trishaan Saha", 58, DOUBLE)
+    block.centered("   Class: XI A", 58, DOUBLE)
+    block.blank(58, DOUBLE)
+    block.divider(58, DOUBLE)
+    block.blank(58, DOUBLE)
+    block.centered("   A tool to track and analyze your school attendance", 58, DOUBLE)
+    block.centered("   Stay informed. Stay regular. Stay successful.", 58, DOUBLE)
+    block.blank(58, DOUBLE)
+    block.bottom(58, DOUBLE)
+    return block.text()
+
+
+def render_menu():
+    """Build the main menu options"""
+    block = TextBlock()
+    block.line()
+    block.top(50)
+    block.centered("          MAIN MENU", 50)
+    block.divider(50)
+    block.row("  1. Enter Attendance (Day-wise)", 50)
+    block.row("  2. Quick Entry (Total Days)", 50)
+    block.row("  3. View Attendance Summary", 50)
+    block.row("  4. Check 75% Status", 50)
+    block.row("  5. View Day-wise Record", 50)
+    block.row("  6. Calculate Days Needed", 50)
+    block.row("  7. Calculate Safe Leaves", 50)
+    block.row("  8. View Monthly Report", 50)
+    block.row("  9. Save Data", 50)
+    block.row("  10. Exit", 50)
+    block.bottom(50)
+    return block.text()
+
+
+def render_goodbye():
+    """Build the goodbye message"""
+    block = TextBlock()
+    block.line()
+    block.top(50, DOUBLE)
+    block.blank(50, DOUBLE)
+    block.centered("   Thank you for using MSAAS!", 50, DOUBLE)
+    block.blank(50, DOUBLE)
+    block.centered("   Remember:", 50, DOUBLE)
+    block.centered("   • Regular attendance = Academic success", 50, DOUBLE)
+    block.centered("   • Plan your leaves wisely", 50, DOUBLE)
+    block.centered("   • Stay above 75% always", 50, DOUBLE)
+    block.blank(50, DOUBLE)
+    block.centered("   Goodbye! See you next time.", 50, DOUBLE)
+    block.blank(50, DOUBLE)
+    block.bottom(50, DOUBLE)
+    block.line()
+    return block.text()
+
+
+# The static screens never change, so they are built only once
+WELCOME_TEXT = render_welcome()
+MENU_TEXT = render_menu()
+GOODBYE_TEXT = render_goodbye()
+
+# Plain divider line
+DIVIDER_TEXT = "─" * 50 + "\n"
+
+
+def render_section_header(title):
+    """Build a section header with given title"""
+    block = TextBlock()
+    block.line()
+    block.top(48)
+    block.centered(title, 48)
+    block.bottom(48)
+    return block.text()
+
+
 def display_welcome():
     """Display the welcome screen with project information"""
-    print()
-    print("╔" + "═" * 58 + "╗")
-    print("║" + " " * 58 + "║")
-    print("║" + "   MONTHLY SCHOOL ATTENDANCE AWARENESS SYSTEM (MSAAS)".center(58) + "║")
-    print("║" + " " * 58 + "║")
-    print("╠" + "═" * 58 + "╣")
-    print("║" + " " * 58 + "║")
-    print("║" + "   Developed By: Trishaan Saha".center(58) + "║")
-    print("║" + "   Class: XI A".center(58) + "║")
-    print("║" + " " * 58 + "║")
-    print("╠" + "═" * 58 + "╣")
-    print("║" + " " * 58 + "║")
-    print("║" + "   A tool to track and analyze your school attendance".center(58) + "║")
-    print("║" + "   Stay informed. Stay regular. Stay successful.".center(58) + "║")
-    print("║" + " " * 58 + "║")
-    print("╚" + "═" * 58 + "╝")
+    write_text(WELCOME_TEXT)
 
 
 def display_menu():
     """Display the main menu options"""
-    print()
-    print("┌" + "─" * 50 + "┐")
-    print("│" + "          MAIN MENU".center(50) + "│")
-    print("├" + "─" * 50 + "┤")
-    print("│  1. Enter Attendance (Day-wise)".ljust(51) + "│")
-    print("│  2. Quick Entry (Total Days)".ljust(51) + "│")
-    print("│  3. View Attendance Summary".ljust(51) + "│")
-    print("│  4. Check 75% Status".ljust(51) + "│")
-    print("│  5. View Day-wise Record".ljust(51) + "│")
-    print("│  6. Calculate Days Needed".ljust(51) + "│")
-    print("│  7. Calculate Safe Leaves".ljust(51) + "│")
-    print("│  8. View Monthly Report".ljust(51) + "│")
-    print("│  9. Save Data".ljust(51) + "│")
-    print("│  10. Exit".ljust(51) + "│")
-    print("└" + "─" * 50 + "┘")
+    write_text(MENU_TEXT)
 
 
 def display_goodbye():
     """Display goodbye message when exiting"""
-    print()
-    print("╔" + "═" * 50 + "╗")
-    print("║" + " " * 50 + "║")
-    print("║" + "   Thank you for using MSAAS!".center(50) + "║")
-    print("║" + " " * 50 + "║")
-    print("║" + "   Remember:".center(50) + "║")
-    print("║" + "   • Regular attendance = Academic success".center(50) + "║")
-    print("║" + "   • Plan your leaves wisely".center(50) + "║")
-    print("║" + "   • Stay above 75% always".center(50) + "║")
-    print("║" + " " * 50 + "║")
-    print("║" + "   Goodbye! See you next time.".center(50) + "║")
-    print("║" + " " * 50 + "║")
-    print("╚" + "═" * 50 + "╝")
-    print()
+    write_text(GOODBYE_TEXT)
 
 
 def display_section_header(title):
     """Display a section header with given title"""
-    print()
-    print("┌" + "─" * 48 + "┐")
-    print("│" + title.center(48) + "│")
-    print("└" + "─" * 48 + "┘")
+    write_text(render_section_header(title))
 
 
 def display_divider():
     """Display a simple divider line"""
-    print("─" * 50)
+    write_text(DIVIDER_TEXT)
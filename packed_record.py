@@ -0,0 +1,215 @@
+# ============================================================
+# MSAAS - Packed Record Module
+# Stores day-wise marks at 2 bits per day
+# ============================================================
+
+# 2-bit code of each mark (code 0 marks unused space in the last byte)
+MARK_CODES = {'P': 1, 'A': 2, 'H': 3}
+
+# Mark of each 2-bit code
+CODE_MARKS = ('', 'P', 'A', 'H')
+
+# Days packed into one byte
+DAYS_PER_BYTE = 4
+
+
+def _build_count_table(code):
+    """
+    Build a translate table mapping each byte to how many
+    of its four 2-bit slots hold the given code
+    """
+    table = bytearray(256)
+    for byte in range(256):
+        count = 0
+        for slot in range(DAYS_PER_BYTE):
+            if (byte >> (slot * 2)) & 3 == code:
+                count += 1
+        table[byte] = count
+    return bytes(table)
+
+
+# Byte -> number of P / A marks inside it
+PRESENT_COUNT_TABLE = _build_count_table(MARK_CODES['P'])
+ABSENT_COUNT_TABLE = _build_count_table(MARK_CODES['A'])
+
+
+def packed_size(day_count):
+    """
+    Number of bytes needed to pack the given number of days
+    Parameters:
+        day_count (int): Number of days
+    Returns:
+        int: Size in bytes
+    """
+    return (day_count + DAYS_PER_BYTE - 1) // DAYS_PER_BYTE
+
+
+def pack_marks(marks):
+    """
+    Pack a sequence of 'P'/'A'/'H' marks at 2 bits per day
+    Parameters:
+        marks (iterable): Marks, e.g. a list like ['P', 'A', 'P']
+    Returns:
+        bytearray: Packed marks (day 1 in the lowest bits of byte 0)
+    """
+    packed = bytearray()
+    byte = 0
+    slot = 0
+
+    for mark in marks:
+        byte |= MARK_CODES[mark] << (slot * 2)
+        slot += 1
+        if slot == DAYS_PER_BYTE:
+            packed.append(byte)
+            byte = 0
+            slot = 0
+
+    if slot > 0:
+        packed.append(byte)
+
+    return packed
+
+
+class PackedDailyRecord:
+    """
+    List-like view of day-wise marks stored at 2 bits per day
+    The buffer may be a whole snapshot file, so loading a record does not
+    create any per-day Python objects; it is copied into a bytearray
+    only when a mark is changed or added
+    """
+
+    __slots__ = ("_buffer", "_offset", "_length")
+
+    def __init__(self, buffer=None, length=0, offset=0):
+        """
+        Parameters:
+            buffer (bytes-like): Packed marks (bytes or bytearray)
+            length (int): Number of days stored in the buffer
+            offset (int): Byte position of day 1 inside the buffer
+        """
+        if buffer is None:
+            buffer = bytearray()
+        self._buffer = buffer
+        self._offset = offset
+        self._length = length
+
+    @classmethod
+    def from_marks(cls, marks):
+        """Create a packed record from a list of marks"""
+        marks = list(marks)
+        return cls(pack_marks(marks), len(marks))
+
+    def __len__(self):
+        return self._length
+
+    def _code(self, index):
+        byte = self._buffer[self._offset + index // DAYS_PER_BYTE]
+        return (byte >> ((index % DAYS_PER_BYTE) * 2)) & 3
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("day index out of range")
+
+        return CODE_MARKS[self._code(index)]
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield CODE_MARKS[self._code(index)]
+
+    def __eq__(self, other):
+        if isinstance(other, (PackedDailyRecord, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PackedDailyRecord({''.join(self)!r})"
+
+    def _make_writable(self):
+        """Copy a read-only or shared buffer into a private bytearray"""
+        if not isinstance(self._buffer, bytearray) or self._offset != 0:
+            self._buffer = bytearray(self.to_bytes())
+            self._offset = 0
+
+    def __setitem__(self, index, mark):
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("day index out of range")
+
+        self._make_writable()
+        shift = (index % DAYS_PER_BYTE) * 2
+        position = index // DAYS_PER_BYTE
+        self._buffer[position] = (self._buffer[position] & ~(3 << shift)) | (MARK_CODES[mark] << shift)
+
+    def append(self, mark):
+        """Add one more day at the end"""
+        self._make_writable()
+        if self._length % DAYS_PER_BYTE == 0:
+            self._buffer.append(0)
+        self._length += 1
+        self[self._length - 1] = mark
+
+    def pop(self):
+        """Remove and return the last day"""
+        if self._length == 0:
+            raise IndexError("pop from empty record")
+
+        index = self._length - 1
+        mark = self[index]
+        self._make_writable()
+
+        # Clear the freed slot so unused bits stay zero
+        self._buffer[index // DAYS_PER_BYTE] &= ~(3 << ((index % DAYS_PER_BYTE) * 2)) & 0xFF
+        if index % DAYS_PER_BYTE == 0:
+            del self._buffer[-1]
+
+        self._length -= 1
+        return mark
+
+    def to_bytes(self):
+        """
+        Get the packed marks
+        Returns:
+            bytes: Exactly packed_size(len(self)) bytes
+        """
+        end = self._offset + packed_size(self._length)
+        return bytes(self._buffer[self._offset:end])
+
+    def counts(self):
+        """
+        Count present and absent days straight from the packed bytes
+        Returns:
+            tuple: (days present, days absent)
+        """
+        packed = self.to_bytes()
+        present = sum(packed.translate(PRESENT_COUNT_TABLE))
+        absent = sum(packed.translate(ABSENT_COUNT_TABLE))
+        return present, absent
+
+    def count(self, mark):
+        """Count days with the given mark, like list.count"""
+        present, absent = self.counts()
+        if mark == 'P':
+            return present
+        elif mark == 'A':
+            return absent
+        return sum(1 for day in self if day == mark)
+
+
+def count_marks(daily_record):
+    """
+    Count present and absent days of a daily record
+    Parameters:
+        daily_record (list or PackedDailyRecord): Day-wise marks
+    Returns:
+        tuple: (days present, days absent)
+    """
+    if isinstance(daily_record, PackedDailyRecord):
+        return daily_record.counts()
+
+    return daily_record.count('P'), daily_record.count('A')
@@ -0,0 +1,336 @@
+# ============================================================
+# MSAAS - Prefix Index Module
+# Attendance percentage of any range of working days (a term,
+# the last 30 days, across month boundaries) in O(1)
+# ============================================================
+#
+# All working days of one student are laid end to end in term order.
+# present[i] holds the number of present days among the first i
+# working days, so any range is one subtraction:
+#
+#   present days in [start, end) = present[end] - present[start]
+#   working days in [start, end) = end - start
+#
+# Holidays are not working days and are never stored. Quick entries
+# have no day-wise marks, so a range may start or end at their month
+# edges but not inside them.
+
+from array import array
+
+from attendance import MONTH_NAMES, parse_month
+from calculator import calculate_percentage
+from file_handler import load_student, load_data, add_save_listener, remove_save_listener
+from utils import parse_valid_number
+
+
+class AttendancePrefixIndex:
+    """Cumulative present-day counts of one student across months"""
+
+    def __init__(self, first_month=MONTH_NAMES[0]):
+        """
+        Parameters:
+            first_month (str): Month the school year starts with, e.g. "April"
+        """
+        start = MONTH_NAMES.index(first_month)
+        self._term_order = {month: (index - start) % 12 for index, month in enumerate(MONTH_NAMES)}
+
+        self._present = array('I', [0])  # present days among the first i working days
+        self._months = []                # months in term order
+        self._starts = {}                # month -> position of its first working day
+        self._lengths = {}               # month -> working days
+        self._quick = set()              # months without day-wise marks
+        self._listener = None
+
+    def __len__(self):
+        """Number of working days indexed"""
+        return len(self._present) - 1
+
+    def months(self):
+        """Indexed months in term order"""
+        return list(self._months)
+
+    def _splice(self, month, start, old_length, increments):
+        """
+        Replace old_length days at start with days of the given
+        present increments (1 or 0 each) and shift everything after them
+        O(days after start), and O(1) for the last day of the last month
+        """
+        base = self._present[start]
+        old_end = start + old_length
+
+        segment = array('I')
+        running = base
+        for increment in increments:
+            running += increment
+            segment.append(running)
+
+        change = running - self._present[old_end]
+        tail = self._present[old_end + 1:]
+        if change:
+            tail = array('I', (value + change for value in tail))
+
+        del self._present[start + 1:]
+        self._present.extend(segment)
+        self._present.extend(tail)
+
+        # The month grows or shrinks, later months move along
+        shift = len(increments) - old_length
+        self._lengths[month] += shift
+        if shift:
+            for later in self._months[self._months.index(month) + 1:]:
+                self._starts[later] += shift
+
+    def _add_month(self, month):
+        """Insert an empty month at its place in term order"""
+        position = 0
+        while position < len(self._months) and self._term_order[self._months[position]] < self._term_order[month]:
+            position += 1
+
+        if position < len(self._months):
+            start = self._starts[self._months[position]]
+        else:
+            start = len(self)
+
+        self._months.insert(position, month)
+        self._starts[month] = start
+        self._lengths[month] = 0
+
+    def set_month(self, data):
+        """
+        Add or replace one month
+        Parameters:
+            data (dict): Attendance data dictionary
+        """
+        month = data['month']
+        if month not in self._starts:
+            self._add_month(month)
+
+        if data['entry_type'] == "detailed":
+            self._quick.discard(month)
+            increments = [1 if mark == 'P' else 0 for mark in data['daily_record']]
+        else:
+            # Only the month total is known; its inside is never queried
+            self._quick.add(month)
+            increments = [1] * data['days_present'] + [0] * data['days_absent']
+
+        self._splice(month, self._starts[month], self._lengths[month], increments)
+
+    def remove_month(self, month):
+        """Drop one month if it is indexed"""
+        if month not in self._starts:
+            return
+
+        self._splice(month, self._starts[month], self._lengths[month], [])
+        self._months.remove(month)
+        del self._starts[month]
+        del self._lengths[month]
+        self._quick.discard(month)
+
+    def _check_day_wise(self, month):
+        if month in self._quick:
+            raise ValueError(f"{month} has no day-wise record")
+
+    def mark_day(self, month, status):
+        """
+        Add the next working day of a month, like attendance.mark_day
+        O(1) when the month is the last one indexed
+        Parameters:
+            month (str): Month name
+            status (str): 'P' or 'A'
+        """
+        if status not in ('P', 'A'):
+            raise ValueError("Invalid! Enter P or A")
+        if month not in self._starts:
+            self._add_month(month)
+        self._check_day_wise(month)
+
+        end = self._starts[month] + self._lengths[month]
+        increment = 1 if status == 'P' else 0
+
+        if self._months[-1] == month:
+            self._present.append(self._present[end] + increment)
+            self._lengths[month] += 1
+        else:
+            self._splice(month, end, 0, [increment])
+
+    def unmark_day(self, month, day_number=None):
+        """
+        Remove one working day of a month, like attendance.unmark_day
+        Parameters:
+            month (str): Month name
+            day_number (int): Day to remove (1-based), or None for the last day
+        """
+        self._check_day_wise(month)
+        length = self._lengths.get(month, 0)
+        if day_number is None:
+            day_number = length
+        day_number = parse_valid_number(day_number, 1, length)
+
+        self._splice(month, self._starts[month] + day_number - 1, 1, [])
+
+    def correct_day(self, month, day_number, status):
+        """
+        Change the mark of one working day, like attendance.correct_day
+        Parameters:
+            month (str): Month name
+            day_number (int): Day to correct (1-based)
+            status (str): 'P' or 'A'
+        """
+        if status not in ('P', 'A'):
+            raise ValueError("Invalid! Enter P or A")
+        self._check_day_wise(month)
+        day_number = parse_valid_number(day_number, 1, self._lengths.get(month, 0))
+
+        self._splice(month, self._starts[month] + day_number - 1, 1, [1 if status == 'P' else 0])
+
+    def _check_edge(self, position):
+        """Reject a range edge that falls inside a quick-entry month"""
+        for month in self._quick:
+            start = self._starts[month]
+            if start < position < start + self._lengths[month]:
+                raise ValueError(f"{month} has no day-wise record")
+
+    def counts(self, start, end):
+        """
+        Count present and working days in positions [start, end)
+        Parameters:
+            start (int): First working day position (0-based)
+            end (int): Position after the last working day
+        Returns:
+            tuple: (days present, working days)
+        """
+        if start < 0 or end > len(self) or start > end:
+            raise ValueError(f"Range must be within 0 and {len(self)}")
+        if self._quick:
+            self._check_edge(start)
+            self._check_edge(end)
+
+        return self._present[end] - self._present[start], end - start
+
+    def position(self, month, day_number):
+        """
+        Get the position of one working day
+        Parameters:
+            month (str): Month name or number
+            day_number (int): Working day of that month (1-based)
+        Returns:
+            int: 0-based position
+        """
+        month = parse_month(month)
+        if month not in self._starts:
+            raise ValueError(f"No attendance data for {month}")
+        day_number = parse_valid_number(day_number, 1, self._lengths[month])
+        return self._starts[month] + day_number - 1
+
+    def range_percentage(self, start_month, start_day, end_month, end_day):
+        """
+        Attendance percentage from one working day to another (both included)
+        e.g. range_percentage("March", 15, "April", 10)
+        Returns:
+            float: Percentage rounded to 2 decimals
+        """
+        start = self.position(start_month, start_day)
+        end = self.position(end_month, end_day) + 1
+        return calculate_percentage(*self.counts(start, end))
+
+    def months_percentage(self, first_month, last_month):
+        """
+        Attendance percentage of whole months, e.g. a term
+        Parameters:
+            first_month (str): First month of the range
+            last_month (str): Last month of the range (included)
+        Returns:
+            float: Percentage rounded to 2 decimals
+        """
+        first_month = parse_month(first_month)
+        last_month = parse_month(last_month)
+        for month in (first_month, last_month):
+            if month not in self._starts:
+                raise ValueError(f"No attendance data for {month}")
+
+        start = self._starts[first_month]
+        end = self._starts[last_month] + self._lengths[last_month]
+        return calculate_percentage(*self.counts(start, end))
+
+    def recent_percentage(self, days):
+        """
+        Attendance percentage of the last working days, e.g. a rolling 30 days
+        Parameters:
+            days (int): Number of most recent working days
+        Returns:
+            float: Percentage rounded to 2 decimals
+        """
+        days = min(days, len(self))
+        return calculate_percentage(*self.counts(len(self) - days, len(self)))
+
+    def _is_one_more_day(self, data):
+        """
+        Check whether a saved month is the indexed one plus one working
+        day marked at the end, so it can be appended instead of rebuilt
+        """
+        month = data['month']
+        if data['entry_type'] != "detailed" or month not in self._starts or month in self._quick:
+            return False
+
+        marks = data['daily_record']
+        length = self._lengths[month]
+        if len(marks) != length + 1 or marks[-1] not in ('P', 'A'):
+            return False
+
+        present = self._present
+        start = self._starts[month]
+        for offset in range(length):
+            if present[start + offset + 1] - present[start + offset] != (marks[offset] == 'P'):
+                return False
+        return True
+
+    def watch_store(self, student_id):
+        """
+        Keep the index up to date with every save of one student
+        Parameters:
+            student_id (str): Student this index belongs to
+        """
+        if self._listener is not None:
+            return
+
+        def refresh(saved_student_id, month):
+            if saved_student_id != student_id:
+                return
+            data = load_data(student_id, month)
+            if data is None:
+                self.remove_month(month)
+            elif self._is_one_more_day(data):
+                # The usual save while marking: one day added at the end
+                self.mark_day(month, data['daily_record'][-1])
+            else:
+                self.set_month(data)
+
+        self._listener = refresh
+        add_save_listener(refresh)
+
+    def stop_watching(self):
+        """Stop following saves"""
+        if self._listener is not None:
+            remove_save_listener(self._listener)
+            self._listener = None
+
+
+def build_prefix_index(student_id, first_month=MONTH_NAMES[0], watch=False):
+    """
+    Build the prefix index of one student from every saved month
+    Parameters:
+        student_id (str): Student ID
+        first_month (str): Month the school year starts with
+        watch (bool): Keep the index updated as the student's records are saved
+    Returns:
+        AttendancePrefixIndex: The filled index
+    """
+    index = AttendancePrefixIndex(first_month)
+
+    for data in load_student(student_id).values():
+        index.set_month(data)
+
+    if watch:
+        index.watch_store(student_id)
+
+    return index
@@ -0,0 +1,110 @@
+# ============================================================
+# MSAAS - Render Module
+# Builds box-drawn screens in one buffer and writes them at once
+# ============================================================
+
+import sys
+from functools import lru_cache
+
+# Box drawing characters: corners, dividers, line and side
+SINGLE = "single"
+DOUBLE = "double"
+BOX_CHARACTERS = {
+    SINGLE: {"top": ("┌", "┐"), "divider": ("├", "┤"), "bottom": ("└", "┘"),
+             "line": "─", "side": "│"},
+    DOUBLE: {"top": ("╔", "╗"), "divider": ("╠", "╣"), "bottom": ("╚", "╝"),
+             "line": "═", "side": "║"}
+}
+
+
+@lru_cache(maxsize=None)
+def border(kind, width, style=SINGLE):
+    """
+    Get a horizontal box border, built once per (kind, width, style)
+    Parameters:
+        kind (str): "top", "divider" or "bottom"
+        width (int): Inside width of the box
+        style (str): SINGLE or DOUBLE
+    Returns:
+        str: Border line, e.g. "┌────┐"
+    """
+    characters = BOX_CHARACTERS[style]
+    left, right = characters[kind]
+    return left + characters["line"] * width + right
+
+
+@lru_cache(maxsize=None)
+def blank_row(width, style=SINGLE):
+    """Get an empty box row, built once per (width, style)"""
+    side = BOX_CHARACTERS[style]["side"]
+    return side + " " * width + side
+
+
+class TextBlock:
+    """
+    Collects the lines of one screen so it can be written with a
+    single write call instead of one print per line
+    """
+
+    __slots__ = ("_lines",)
+
+    def __init__(self):
+        self._lines = []
+
+    def line(self, text=""):
+        """Add a line of text (like print(text))"""
+        self._lines.append(text)
+
+    def top(self, width, style=SINGLE):
+        """Add the top border of a box"""
+        self._lines.append(border("top", width, style))
+
+    def divider(self, width, style=SINGLE):
+        """Add a divider across a box"""
+        self._lines.append(border("divider", width, style))
+
+    def bottom(self, width, style=SINGLE):
+        """Add the bottom border of a box"""
+        self._lines.append(border("bottom", width, style))
+
+    def row(self, text, width, style=SINGLE):
+        """Add a box row with the text left-aligned"""
+        side = BOX_CHARACTERS[style]["side"]
+        self._lines.append(side + text.ljust(width) + side)
+
+    def centered(self, text, width, style=SINGLE):
+        """Add a box row with the text centred"""
+        side = BOX_CHARACTERS[style]["side"]
+        self._lines.append(side + text.center(width) + side)
+
+    def blank(self, width, style=SINGLE):
+        """Add an empty box row"""
+        self._lines.append(blank_row(width, style))
+
+    def extend(self, text):
+        """Add text rendered by another function (ends with a newline)"""
+        self._lines.append(text[:-1])
+
+    def text(self):
+        """
+        Get the whole block
+        Returns:
+            str: Lines joined with newlines, ending with a newline
+        """
+        return "\n".join(self._lines) + "\n"
+
+    def write(self, stream=None):
+        """Write the whole block with one write call"""
+        write_text(self.text(), stream)
+
+
+def write_text(text, stream=None):
+    """
+    Write already rendered text in one call
+    Parameters:
+        text (str): Rendered text
+        stream (file): Where to write, default sys.stdout
+    """
+    if stream is None:
+        stream = sys.stdout
+    stream.write(text)
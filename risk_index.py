@@ -0,0 +1,191 @@
+# ============================================================
+# MSAAS - Risk Index Module
+# Keeps every record ordered by attendance percentage so
+# "who is below 75%" is answered without scanning all records
+# ============================================================
+
+from bisect import bisect_left, insort
+
+from calculator import get_percentage, STATUS_BANDS, MINIMUM_ATTENDANCE_PERCENT
+from file_handler import list_students, load_student, load_data, add_save_listener, remove_save_listener
+
+
+class AttendanceRiskIndex:
+    """
+    Sorted index of (percentage, student_id, month) entries
+    Searches use binary search, so band and threshold queries take
+    O(log n) plus the number of students returned
+    """
+
+    def __init__(self):
+        self._entries = []       # sorted (percentage, student_id, month)
+        self._month_entries = {} # month -> sorted (percentage, student_id, month)
+        self._percentages = {}   # (student_id, month) -> percentage
+        self._listener = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def update(self, student_id, data):
+        """
+        Add or move one record
+        Parameters:
+            student_id (str): Student ID
+            data (dict): Attendance data dictionary
+        """
+        self.set_percentage(student_id, data['month'], get_percentage(data))
+
+    def set_percentage(self, student_id, month, percentage):
+        """
+        Add or move one (student, month) entry
+        Parameters:
+            student_id (str): Student ID
+            month (str): Month name
+            percentage (float): Attendance percentage
+        """
+        key = (student_id, month)
+        old_percentage = self._percentages.get(key)
+        if old_percentage == percentage:
+            return
+
+        if old_percentage is not None:
+            self._remove_entry(old_percentage, student_id, month)
+
+        entry = (percentage, student_id, month)
+        insort(self._entries, entry)
+        insort(self._month_entries.setdefault(month, []), entry)
+        self._percentages[key] = percentage
+
+    def remove(self, student_id, month):
+        """
+        Drop one (student, month) entry if it is indexed
+        Parameters:
+            student_id (str): Student ID
+            month (str): Month name
+        """
+        percentage = self._percentages.pop((student_id, month), None)
+        if percentage is not None:
+            self._remove_entry(percentage, student_id, month)
+
+    def _remove_entry(self, percentage, student_id, month):
+        entry = (percentage, student_id, month)
+        for entries in (self._entries, self._month_entries[month]):
+            del entries[bisect_left(entries, entry)]
+
+    def get_percentage(self, student_id, month):
+        """Get the indexed percentage of one record, or None"""
+        return self._percentages.get((student_id, month))
+
+    def _slice(self, low, high, month):
+        """Entries with low <= percentage < high, lowest first"""
+        if month is None:
+            entries = self._entries
+        else:
+            entries = self._month_entries.get(month, [])
+
+        start = bisect_left(entries, (low,))
+        end = bisect_left(entries, (high,))
+        return entries[start:end]
+
+    def below(self, threshold=MINIMUM_ATTENDANCE_PERCENT, month=None):
+        """
+        List records below a percentage
+        Parameters:
+            threshold (float): Percentage limit (not included)
+            month (str): Only this month, or None for all months
+        Returns:
+            list: (percentage, student_id, month) tuples, lowest first
+        """
+        return self._slice(float("-inf"), threshold, month)
+
+    def between(self, low, high, month=None):
+        """
+        List records with low <= percentage < high
+        Returns:
+            list: (percentage, student_id, month) tuples, lowest first
+        """
+        return self._slice(low, high, month)
+
+    def in_band(self, status, month=None):
+        """
+        List records in one status band of check_status
+        Parameters:
+            status (str): Band name, e.g. "CRITICAL" or "SATISFACTORY"
+            month (str): Only this month, or None for all months
+        Returns:
+            list: (percentage, student_id, month) tuples, lowest first
+        """
+        high = float("inf")
+        for band in STATUS_BANDS:
+            low = band[0] if band is not STATUS_BANDS[-1] else float("-inf")
+            if band[1] == status:
+                return self._slice(low, high, month)
+            high = band[0]
+
+        raise ValueError(f"Unknown status band: {status}")
+
+    def count_below(self, threshold=MINIMUM_ATTENDANCE_PERCENT):
+        """Count records below a percentage in O(log n)"""
+        return bisect_left(self._entries, (threshold,))
+
+    def band_counts(self):
+        """
+        Count records in every status band in O(bands x log n)
+        Returns:
+            dict: Band name -> number of records
+        """
+        counts = {}
+        high_position = len(self._entries)
+        for band in STATUS_BANDS:
+            if band is STATUS_BANDS[-1]:
+                low_position = 0
+            else:
+                low_position = bisect_left(self._entries, (band[0],))
+            counts[band[1]] = high_position - low_position
+            high_position = low_position
+        return counts
+
+    def refresh(self, student_id, month):
+        """
+        Re-read one record from the store and update its entry
+        Parameters:
+            student_id (str): Student ID
+            month (str): Month name
+        """
+        data = load_data(student_id, month)
+        if data is None:
+            self.remove(student_id, month)
+        else:
+            self.update(student_id, data)
+
+    def watch_store(self):
+        """Keep the index up to date with every save from now on"""
+        if self._listener is None:
+            self._listener = self.refresh
+            add_save_listener(self._listener)
+
+    def stop_watching(self):
+        """Stop following saves"""
+        if self._listener is not None:
+            remove_save_listener(self._listener)
+            self._listener = None
+
+
+def build_risk_index(watch=True):
+    """
+    Build a risk index of every saved record
+    Parameters:
+        watch (bool): Keep the index updated as records are saved
+    Returns:
+        AttendanceRiskIndex: The filled index
+    """
+    index = AttendanceRiskIndex()
+
+    for student_id in list_students():
+        for data in load_student(student_id).values():
+            index.update(student_id, data)
+
+    if watch:
+        index.watch_store()
+
+    return index
@@ -0,0 +1,235 @@
+# ============================================================
+# MSAAS - Risk Simulator Module
+# Monte Carlo chance of ending the term below the 75% minimum
+# for a whole cohort at once (needs NumPy)
+# ============================================================
+#
+# Each student's absence rate is uncertain, so every trial first
+# draws a rate from a Beta posterior (their absences and presences so
+# far on top of a prior shaped like the cohort's average rate), then
+# draws the absences over the remaining days from a binomial.
+# A trial ends below the minimum when it has more absences than the
+# safe leaves calculate_safe_leaves would report.
+# Risk scores come with a 95% Wilson interval for the simulation error.
+
+import numpy as np
+
+from attendance import MONTH_NAMES
+from calculator import MINIMUM_ATTENDANCE_PERCENT
+from cohort_calculator import calculate_cohort
+from school_calendar import get_calendar, default_year, term_records
+
+# Trials per student by default
+DEFAULT_TRIALS = 10000
+
+# Random draws held in memory at once (students per batch = this / trials)
+BATCH_DRAWS = 4000000
+
+# Weight of the cohort's average absence rate, in days of attendance:
+# a student with few recorded days is pulled towards the cohort
+PRIOR_DAYS = 10
+
+# z-score of the 95% intervals
+Z_95 = 1.959964
+
+
+def remaining_working_days(last_month, end_month, recorded_days=0, school_calendar=None, year=None):
+    """
+    Working days left in the term after what has been recorded, from
+    the school calendar: the rest of the last recorded month plus every
+    month after it up to the end of term
+    The term may run across the new year (e.g. August to March)
+    Parameters:
+        last_month (str): Last month with attendance recorded
+        end_month (str): Last month of the term
+        recorded_days (int): Working days recorded in last_month
+        school_calendar (SchoolCalendar): Calendar to count with, default get_calendar()
+        year (int): Year of last_month, default the most recent one
+    Returns:
+        int: Remaining working days
+    """
+    if school_calendar is None:
+        school_calendar = get_calendar()
+    if year is None:
+        year = default_year(last_month)
+
+    days = school_calendar.remaining_working_days(last_month, recorded_days, year)
+
+    if last_month != end_month:
+        index = MONTH_NAMES.index(last_month) + 1
+        if index == 12:
+            index = 0
+            year += 1
+        days += school_calendar.term_working_days(MONTH_NAMES[index], end_month, year)
+    return days
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    """
+    Wilson score interval of a proportion, for many proportions at once
+    Parameters:
+        successes (array-like): Successes of each proportion
+        trials (int or array-like): Trials of each proportion
+        z (float): z-score of the confidence level
+    Returns:
+        tuple: (lower bounds, upper bounds) as NumPy arrays
+    """
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.asarray(trials, dtype=np.float64)
+
+    proportion = successes / trials
+    z2 = z * z
+    denominator = 1 + z2 / trials
+    centre = (proportion + z2 / (2 * trials)) / denominator
+    margin = z * np.sqrt(proportion * (1 - proportion) / trials + z2 / (4 * trials * trials)) / denominator
+
+    return np.clip(centre - margin, 0, 1), np.clip(centre + margin, 0, 1)
+
+
+def simulate_risk(days_present, days_absent, remaining_days, trials=DEFAULT_TRIALS,
+                  target_percent=MINIMUM_ATTENDANCE_PERCENT, seed=None):
+    """
+    Simulate the end of term for every student
+    Parameters:
+        days_present (array-like): Days present so far of each student
+        days_absent (array-like): Days absent so far of each student
+        remaining_days (array-like or int): Working days left in the term
+        trials (int): Simulated terms per student
+        target_percent (float): Percentage a student must end at or above
+        seed (int): Random seed, so nightly runs can be reproduced
+    Returns:
+        dict: NumPy arrays, one value per student
+            "risk"               chance of ending below target_percent
+            "risk_low"           95% interval of the risk (simulation error)
+            "risk_high"
+            "absence_rate"       mean of the absence rate posterior
+            "safe_leaves"        absences the remaining days can take
+            "percentage_low"     5th, 50th and 95th percentile of the
+            "percentage_median"  final percentage
+            "percentage_high"
+    Raises:
+        ValueError: If trials is below 1
+    """
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+
+    present = np.asarray(days_present, dtype=np.int64)
+    absent = np.asarray(days_absent, dtype=np.int64)
+    remaining = np.broadcast_to(np.asarray(remaining_days, dtype=np.int64), present.shape)
+    total = present + absent
+    new_total = total + remaining
+
+    # Safe leaves exactly as calculate_safe_leaves works them out
+    safe_leaves = calculate_cohort(present, total, remaining, (target_percent,))["safe_leaves"][:, 0]
+
+    # Beta prior shaped like the cohort's average absence rate
+    cohort_days = total.sum()
+    cohort_rate = absent.sum() / cohort_days if cohort_days else 0.5
+    cohort_rate = min(max(cohort_rate, 0.01), 0.99)
+    alpha = absent + cohort_rate * PRIOR_DAYS
+    beta = present + (1 - cohort_rate) * PRIOR_DAYS
+
+    rng = np.random.default_rng(seed)
+    count = len(present)
+    below = np.zeros(count, dtype=np.int64)
+    absence_quantiles = np.zeros((3, count), dtype=np.int64)
+
+    batch_size = max(1, BATCH_DRAWS // trials)
+    for start in range(0, count, batch_size):
+        end = min(start + batch_size, count)
+        rows = end - start
+        batch_remaining = remaining[start:end]
+
+        rates = rng.beta(alpha[start:end, np.newaxis], beta[start:end, np.newaxis], size=(rows, trials))
+        absences = rng.binomial(batch_remaining[:, np.newaxis], rates)
+
+        # Count how many trials ended with each number of absences,
+        # which is all the risk and the percentiles need
+        bins = int(batch_remaining.max(initial=0)) + 1
+        offsets = np.arange(rows)[:, np.newaxis] * bins
+        histogram = np.bincount((absences + offsets).ravel(), minlength=rows * bins).reshape(rows, bins)
+        cumulative = histogram.cumsum(axis=1)
+
+        # Trials with more absences than the safe leaves
+        safe = np.clip(safe_leaves[start:end], -1, bins - 1)
+        kept = np.where(safe < 0, 0, cumulative[np.arange(rows), np.maximum(safe, 0)])
+        below[start:end] = trials - kept
+
+        # 95th, 50th and 5th percentile of the absences
+        for row, fraction in enumerate((0.95, 0.5, 0.05)):
+            absence_quantiles[row, start:end] = (cumulative < fraction * trials).sum(axis=1)
+
+    # Fewer absences mean a higher final percentage
+    with np.errstate(divide="ignore", invalid="ignore"):
+        final = (present + remaining - absence_quantiles) / new_total * 100
+    final = np.where(new_total == 0, 0.0, final)
+
+    risk_low, risk_high = wilson_interval(below, trials)
+
+    return {
+        "risk": below / trials,
+        "risk_low": risk_low,
+        "risk_high": risk_high,
+        "absence_rate": alpha / (alpha + beta),
+        "safe_leaves": safe_leaves,
+        "percentage_low": np.round(final[0], 2),
+        "percentage_median": np.round(final[1], 2),
+        "percentage_high": np.round(final[2], 2)
+    }
+
+
+def simulate_store(end_month, trials=DEFAULT_TRIALS, seed=None, start_month=None):
+    """
+    Simulate every stored student up to the end of term
+    Each student's months in the term are added up, and the remaining
+    days are the school calendar's working days after their last saved one
+    Parameters:
+        end_month (str): Last month of the term
+        trials (int): Simulated terms per student
+        seed (int): Random seed
+        start_month (str): First month of the term, default the month
+                           after end_month (the whole year up to it)
+    Returns:
+        tuple: (list of student IDs, dict of arrays from simulate_risk)
+    """
+    from file_handler import list_students, load_student
+
+    student_ids = []
+    present = []
+    absent = []
+    remaining = []
+
+    for student_id in list_students():
+        records = term_records(load_student(student_id), end_month, start_month)
+        if not records:
+            continue
+
+        student_ids.append(student_id)
+        present.append(sum(data['days_present'] for data in records.values()))
+        absent.append(sum(data['days_absent'] for data in records.values()))
+        last_month = list(records)[-1]
+        remaining.append(remaining_working_days(last_month, end_month, records[last_month]['total_days']))
+
+    return student_ids, simulate_risk(present, absent, remaining, trials, seed=seed)
+
+
+def format_risk_report(student_ids, results, limit=None):
+    """
+    Build a table of students, highest risk first
+    Parameters:
+        student_ids (list): Student IDs in the order of results
+        results (dict): Arrays from simulate_risk
+        limit (int): Show only this many students, or None for all
+    Returns:
+        str: Report text
+    """
+    order = np.argsort(-results["risk"], kind="stable")
+    if limit is not None:
+        order = order[:limit]
+
+    lines = [f"{'Student':<34}{'Risk':>8}{'95% interval':>18}{'Final % (5-95)':>20}"]
+    for index in order:
+        interval = f"{results['risk_low'][index] * 100:.1f}-{results['risk_high'][index] * 100:.1f}%"
+        final = f"{results['percentage_low'][index]:.1f}-{results['percentage_high'][index]:.1f}"
+        lines.append(f"{student_ids[index]:<34}{results['risk'][index] * 100:>7.1f}%{interval:>18}{final:>20}")
+    return "\n".join(lines) + "\n"
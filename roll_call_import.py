@@ -0,0 +1,155 @@
+# ============================================================
+# MSAAS - Roll-Call Import Module
+# Streams roll-call exports (CSV/TSV) into monthly records
+# ============================================================
+#
+# Input: one row per student per day, with an optional header row
+#
+#   student_id, date (YYYY-MM-DD), status (P / A / H)
+#
+# Every stage is a generator, so only one row and the month being
+# built for the current student are held in memory at a time.
+# Rows should be grouped by student and month (as exports usually
+# are); a (student, month) that shows up again later is merged into
+# the record saved for it earlier in the same import.
+
+import csv
+import sys
+from datetime import date
+
+from attendance import MONTH_NAMES, VALID_MARKS, build_detailed_record
+from file_handler import save_many_data, load_data
+from utils import is_valid_student_id
+
+# First column names that mark a header row
+HEADER_NAMES = ("student", "student_id", "studentid", "id")
+
+# Records handed to the store at once (one transaction each in a database)
+IMPORT_BATCH_SIZE = 500
+
+
+def read_rows(path):
+    """
+    Read rows from a CSV or TSV file one at a time
+    The delimiter is a tab for .tsv files or when the first line has a tab
+    Parameters:
+        path (str): File to read
+    Yields:
+        tuple: (line number, list of fields)
+    """
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        first_line = file.readline()
+        if path.lower().endswith(".tsv") or "\t" in first_line:
+            delimiter = "\t"
+        else:
+            delimiter = ","
+
+        file.seek(0)
+        for line_number, row in enumerate(csv.reader(file, delimiter=delimiter), start=1):
+            yield line_number, row
+
+
+def parse_rows(rows, errors=sys.stderr):
+    """
+    Validate rows, skipping (and reporting) the invalid ones
+    Parameters:
+        rows (iterable): (line number, fields) pairs
+        errors (file): Where invalid rows are reported
+    Yields:
+        tuple: (student_id, month name, 'P' / 'A' / 'H')
+    """
+    for line_number, row in rows:
+        if len(row) == 0 or (len(row) == 1 and row[0].strip() == ""):
+            continue
+
+        if line_number == 1 and row[0].strip().lower() in HEADER_NAMES:
+            continue
+
+        if len(row) != 3:
+            print(f"⚠ Line {line_number}: expected student_id, date, status", file=errors)
+            continue
+
+        student_id = row[0].strip()
+        if not is_valid_student_id(student_id):
+            print(f"⚠ Line {line_number}: invalid student ID {student_id!r}", file=errors)
+            continue
+
+        try:
+            month = MONTH_NAMES[date.fromisoformat(row[1].strip()).month - 1]
+        except ValueError:
+            print(f"⚠ Line {line_number}: invalid date {row[1]!r}", file=errors)
+            continue
+
+        # Same validation as enter_attendance
+        status = row[2].strip().upper()
+        if status not in VALID_MARKS:
+            print(f"⚠ Line {line_number}: Invalid! Enter P, A, or H", file=errors)
+            continue
+
+        yield student_id, month, status
+
+
+def group_months(marks):
+    """
+    Collect the marks of each (student, month) run of rows
+    Parameters:
+        marks (iterable): (student_id, month, status) tuples
+    Yields:
+        tuple: (student_id, month, list of marks including holidays)
+    """
+    current_key = None
+    current_marks = []
+
+    for student_id, month, status in marks:
+        key = (student_id, month)
+
+        if key != current_key:
+            if current_key is not None:
+                yield current_key[0], current_key[1], current_marks
+            current_key = key
+            current_marks = []
+
+        current_marks.append(status)
+
+    if current_key is not None:
+        yield current_key[0], current_key[1], current_marks
+
+
+def import_roll_call(path, errors=sys.stderr):
+    """
+    Import a roll-call export into the attendance store
+    Holidays are skipped and reduce the working days, like enter_attendance
+    Parameters:
+        path (str): CSV or TSV file to import
+        errors (file): Where invalid rows and months are reported
+    Returns:
+        int: Number of (student, month) records saved
+    """
+    imported_keys = set()
+    pending = {}
+    saved = 0
+
+    for student_id, month, marks in group_months(parse_rows(read_rows(path), errors)):
+        key = (student_id, month)
+
+        # Merge with the part of this month imported earlier in the file
+        earlier = pending.get(key)
+        if earlier is None and key in imported_keys:
+            earlier = load_data(student_id, month)
+        if earlier is not None:
+            marks = list(earlier['daily_record']) + marks
+
+        try:
+            data = build_detailed_record(month, len(marks), marks)
+        except ValueError as e:
+            print(f"⚠ {student_id} {month}: {e}", file=errors)
+            continue
+
+        pending[key] = data
+        if len(pending) >= IMPORT_BATCH_SIZE:
+            saved += save_many_data((student_id, data) for (student_id, month), data in pending.items())
+            imported_keys.update(pending)
+            pending = {}
+
+    saved += save_many_data((student_id, data) for (student_id, month), data in pending.items())
+    return saved
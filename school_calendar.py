@@ -0,0 +1,425 @@
+# ============================================================
+# MSAAS - School Calendar Module
+# Working days of any month, term or date range, from weekends,
+# school holidays and changes for single sections
+# ============================================================
+#
+# A school's calendar is read from CALENDAR_FILE when it exists;
+# without it every Monday to Friday is a working day.
+# One rule per line, blank lines and lines starting with '#' ignored:
+#
+#   weekend, Saturday, Sunday          days of the week without school
+#   holiday, 2025-12-25                one day off
+#   holiday, 2025-12-24, 2026-01-02    days off, both ends included
+#   working, 2026-02-07                a weekend day with school (make-up day)
+#   [XI-A]                             following rules are for section XI-A only
+#   holiday, 2025-11-14
+#
+# A section's rules come before the school's, and on the same level a
+# holiday comes before a working day. The working days of a
+# (year, section) are counted once, as a running count per day of the
+# year, so any date range is one subtraction.
+
+import os
+from array import array
+from datetime import date, timedelta
+
+from attendance import MONTH_NAMES
+
+# School calendar read by get_calendar
+CALENDAR_FILE = "school_calendar.txt"
+
+# Weekdays without school by default (date.weekday(): Monday = 0)
+DEFAULT_WEEKEND = (5, 6)
+
+# Day names accepted in a 'weekend' rule
+WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Calendar file path -> (modification time, SchoolCalendar)
+_calendars = {}
+
+
+def parse_date(text):
+    """
+    Convert YYYY-MM-DD text to a date
+    Raises:
+        ValueError: If the text is not a valid date
+    """
+    try:
+        return date.fromisoformat(text.strip())
+    except ValueError:
+        raise ValueError(f"Invalid date: {text.strip()!r} (use YYYY-MM-DD)")
+
+
+def parse_weekday(text):
+    """
+    Convert a day name (or its first three letters) to a weekday number
+    Raises:
+        ValueError: If the text is not a day of the week
+    """
+    name = text.strip().lower()
+    for number, weekday in enumerate(WEEKDAY_NAMES):
+        if len(name) >= 3 and weekday.startswith(name):
+            return number
+    raise ValueError(f"Unknown day of the week: {text.strip()!r}")
+
+
+def default_year(month, today=None):
+    """
+    Year of the most recent month with this name (this year's, unless
+    the month has not started yet)
+    Parameters:
+        month (str): Month name
+        today (date): Date to count back from, default today
+    Returns:
+        int: Year
+    """
+    if today is None:
+        today = date.today()
+
+    if MONTH_NAMES.index(month) + 1 <= today.month:
+        return today.year
+    return today.year - 1
+
+
+def month_dates(month, year):
+    """
+    First and last day of a month
+    Parameters:
+        month (str): Month name
+        year (int): Year
+    Returns:
+        tuple: (first date, last date)
+    """
+    number = MONTH_NAMES.index(month) + 1
+    if number == 12:
+        return date(year, 12, 1), date(year, 12, 31)
+    return date(year, number, 1), date(year, number + 1, 1) - timedelta(days=1)
+
+
+def term_months(first_month, last_month):
+    """
+    List the months of a term in order, across the new year if needed
+    Parameters:
+        first_month (str): First month of the term
+        last_month (str): Last month of the term (included)
+    Returns:
+        list: Month names, e.g. August ... December, January ... March
+    """
+    first = MONTH_NAMES.index(first_month)
+    count = (MONTH_NAMES.index(last_month) - first) % 12 + 1
+    return [MONTH_NAMES[(first + offset) % 12] for offset in range(count)]
+
+
+def term_records(records, last_month, first_month=None):
+    """
+    Keep a student's records of the months in a term, in term order
+    (load_student returns them in calendar order, which puts January
+    before December in a term running across the new year)
+    Parameters:
+        records (dict): month -> attendance data
+        last_month (str): Last month of the term
+        first_month (str): First month of the term, default the month
+                           after last_month (the whole year up to it)
+    Returns:
+        dict: month -> attendance data, the last recorded month last
+    """
+    if first_month is None:
+        first_month = MONTH_NAMES[(MONTH_NAMES.index(last_month) + 1) % 12]
+
+    return {month: records[month] for month in term_months(first_month, last_month) if month in records}
+
+
+class SchoolCalendar:
+    """Weekends, holidays and make-up days of one school"""
+
+    def __init__(self, weekend=DEFAULT_WEEKEND):
+        """
+        Parameters:
+            weekend (iterable): Weekday numbers without school (Monday = 0)
+        """
+        # Section (None for the whole school) -> rules
+        self._weekends = {None: frozenset(weekend)}
+        self._holidays = {None: set()}
+        self._working = {None: set()}
+
+        # (year, section) -> running count of working days per day of the year
+        self._years = {}
+
+    def set_weekend(self, weekdays, section=None):
+        """
+        Set the weekdays without school
+        Parameters:
+            weekdays (iterable): Weekday numbers (Monday = 0)
+            section (str): Section they apply to, or None for the whole school
+        """
+        self._weekends[section] = frozenset(weekdays)
+        self._years.clear()
+
+    def add_holidays(self, start, end=None, section=None):
+        """
+        Add a holiday or a range of holidays (both ends included)
+        Parameters:
+            start (date): First day off
+            end (date): Last day off, or None for a single day
+            section (str): Section they apply to, or None for the whole school
+        """
+        if end is None:
+            end = start
+        if end < start:
+            raise ValueError(f"Holidays end ({end}) before they start ({start})")
+
+        holidays = self._holidays.setdefault(section, set())
+        day = start
+        while day <= end:
+            holidays.add(day)
+            day += timedelta(days=1)
+        self._years.clear()
+
+    def add_working_day(self, day, section=None):
+        """
+        Make a day a working day, e.g. a Saturday with make-up classes
+        Parameters:
+            day (date): The day
+            section (str): Section it applies to, or None for the whole school
+        """
+        self._working.setdefault(section, set()).add(day)
+        self._years.clear()
+
+    def sections(self):
+        """Sections with rules of their own"""
+        names = set(self._weekends) | set(self._holidays) | set(self._working)
+        names.discard(None)
+        return sorted(names)
+
+    def _is_working(self, day, section):
+        """Apply the rules to one day"""
+        if section is not None:
+            if day in self._holidays.get(section, ()):
+                return False
+            if day in self._working.get(section, ()):
+                return True
+
+        if day in self._holidays[None]:
+            return False
+        if day in self._working[None]:
+            return True
+
+        weekend = self._weekends.get(section, self._weekends[None])
+        return day.weekday() not in weekend
+
+    def _running_counts(self, year, section):
+        """
+        Get the running count of working days of one year, worked out on first use
+        Returns:
+            array: counts[n] = working days among the first n days of the year
+        """
+        key = (year, section)
+        counts = self._years.get(key)
+        if counts is None:
+            counts = array('H', [0])
+            day = date(year, 1, 1)
+            running = 0
+            while day.year == year:
+                if self._is_working(day, section):
+                    running += 1
+                counts.append(running)
+                day += timedelta(days=1)
+            self._years[key] = counts
+        return counts
+
+    def is_working_day(self, day, section=None):
+        """
+        Check one day
+        Parameters:
+            day (date): The day
+            section (str): Section, or None for the whole school
+        Returns:
+            bool: True if there is school that day
+        """
+        counts = self._running_counts(day.year, section)
+        number = day.timetuple().tm_yday
+        return counts[number] != counts[number - 1]
+
+    def working_days_between(self, start, end, section=None):
+        """
+        Count the working days in a date range (both ends included)
+        Parameters:
+            start (date): First day
+            end (date): Last day
+            section (str): Section, or None for the whole school
+        Returns:
+            int: Working days, 0 if end is before start
+        """
+        if end < start:
+            return 0
+
+        total = 0
+        for year in range(start.year, end.year + 1):
+            counts = self._running_counts(year, section)
+            first = start.timetuple().tm_yday if year == start.year else 1
+            last = end.timetuple().tm_yday if year == end.year else len(counts) - 1
+            total += counts[last] - counts[first - 1]
+        return total
+
+    def working_dates(self, start, end, section=None):
+        """
+        List the working days in a date range (both ends included)
+        Parameters:
+            start (date): First day
+            end (date): Last day
+            section (str): Section, or None for the whole school
+        Returns:
+            list: Dates in order, empty if end is before start
+        """
+        dates = []
+        day = start
+        while day <= end:
+            if self.is_working_day(day, section):
+                dates.append(day)
+            day += timedelta(days=1)
+        return dates
+
+    def month_working_days(self, month, year=None, section=None):
+        """
+        Count the working days of one month
+        Parameters:
+            month (str): Month name
+            year (int): Year, default the most recent one (see default_year)
+            section (str): Section, or None for the whole school
+        Returns:
+            int: Working days
+        """
+        if year is None:
+            year = default_year(month)
+
+        return self.working_days_between(*month_dates(month, year), section)
+
+    def term_working_days(self, first_month, last_month, year=None, section=None):
+        """
+        Count the working days of whole months, e.g. a term
+        The term may run across the new year (e.g. August to March)
+        Parameters:
+            first_month (str): First month of the term
+            last_month (str): Last month of the term (included)
+            year (int): Year of the first month, default the most recent one
+            section (str): Section, or None for the whole school
+        Returns:
+            int: Working days
+        """
+        if year is None:
+            year = default_year(first_month)
+
+        first = MONTH_NAMES.index(first_month)
+        last = MONTH_NAMES.index(last_month)
+        last_year = year if last >= first else year + 1
+
+        start = date(year, first + 1, 1)
+        if last == 11:
+            end = date(last_year, 12, 31)
+        else:
+            end = date(last_year, last + 2, 1) - timedelta(days=1)
+        return self.working_days_between(start, end, section)
+
+    def remaining_working_days(self, month, recorded_days, year=None, section=None):
+        """
+        Working days of a month not recorded yet
+        Parameters:
+            month (str): Month name
+            recorded_days (int): Working days already recorded
+            year (int): Year, default the most recent one
+            section (str): Section, or None for the whole school
+        Returns:
+            int: Remaining working days, never below 0
+        """
+        return max(0, self.month_working_days(month, year, section) - recorded_days)
+
+
+def parse_calendar(lines):
+    """
+    Build a calendar from rule lines (format at the top of this module)
+    Parameters:
+        lines (iterable): Lines of a calendar file
+    Returns:
+        SchoolCalendar: The school's calendar
+    Raises:
+        ValueError: With the number of the first invalid line
+    """
+    school_calendar = SchoolCalendar()
+    section = None
+
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            continue
+
+        try:
+            if line.startswith("[") and line.endswith("]"):
+                section = line[1:-1].strip() or None
+                continue
+
+            fields = [field.strip() for field in line.split(",")]
+            kind = fields[0].lower()
+
+            if kind == "weekend":
+                school_calendar.set_weekend([parse_weekday(name) for name in fields[1:] if name], section)
+            elif kind == "holiday" and len(fields) in (2, 3):
+                end = parse_date(fields[2]) if len(fields) == 3 else None
+                school_calendar.add_holidays(parse_date(fields[1]), end, section)
+            elif kind == "working" and len(fields) == 2:
+                school_calendar.add_working_day(parse_date(fields[1]), section)
+            else:
+                raise ValueError(f"Unknown rule: {line}")
+
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}")
+
+    return school_calendar
+
+
+def load_calendar(path):
+    """
+    Read a calendar file
+    Parameters:
+        path (str): File path
+    Returns:
+        SchoolCalendar: The school's calendar
+    Raises:
+        ValueError: If a line is invalid
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return parse_calendar(file)
+
+
+def has_school_calendar(path=CALENDAR_FILE):
+    """Check whether the school has a calendar file"""
+    return os.path.exists(path)
+
+
+def get_calendar(path=CALENDAR_FILE):
+    """
+    Get the school's calendar, read again only when the file changes,
+    so the working days of each year are counted once per session
+    Parameters:
+        path (str): Calendar file
+    Returns:
+        SchoolCalendar: The file's calendar, or Monday to Friday without it
+    """
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        modified = None
+
+    cached = _calendars.get(path)
+    if cached is not None and cached[0] == modified:
+        return cached[1]
+
+    school_calendar = SchoolCalendar()
+    if modified is not None:
+        try:
+            school_calendar = load_calendar(path)
+        except (OSError, ValueError) as e:
+            print(f"\n⚠ Error reading {path}: {e}")
+
+    _calendars[path] = (modified, school_calendar)
+    return school_calendar
@@ -0,0 +1,145 @@
+# ============================================================
+# MSAAS - Screen Module
+# Clears and redraws the terminal with ANSI escape sequences
+# ============================================================
+#
+# Replaces running the `clear` / `cls` command on every menu loop.
+# A frame (e.g. the main menu) is drawn from the top-left corner.
+# Once a frame has been drawn, the next one is written over it row by
+# row from the top and everything below it is erased, instead of
+# blanking the whole screen first. The terminal is never asked where
+# the cursor is (that would read from stdin and eat typed-ahead keys):
+# every row is rewritten, because what other code printed meanwhile
+# may have scrolled any of them.
+# When output is not a terminal nothing is cleared at all, so
+# redirected output contains no escape codes.
+
+import os
+import shutil
+import sys
+
+# ANSI control sequences
+CURSOR_HOME = "\x1b[H"
+CLEAR_SCREEN = "\x1b[2J"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+
+
+def move_cursor(row):
+    """Sequence moving the cursor to the start of a screen row (1-based)"""
+    return f"\x1b[{row};1H"
+
+
+def enable_windows_ansi():
+    """
+    Turn on escape sequence processing in a Windows console
+    Returns:
+        bool: True if the console now understands escape sequences
+    """
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # standard output
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (AttributeError, OSError, ImportError):
+        return False
+
+
+class ScreenManager:
+    """Draws full-screen frames over the previous one"""
+
+    def __init__(self, stream=None):
+        """
+        Parameters:
+            stream (file): Output terminal, default sys.stdout at each call
+        """
+        self._stream = stream
+        self._mode = None          # "ansi", "cls" or "plain", decided on first use
+        self._frame = None         # lines of the last frame drawn
+        self._size = None          # terminal size the frame was drawn at
+
+    def _get_stream(self):
+        return self._stream if self._stream is not None else sys.stdout
+
+    def _get_mode(self):
+        """How the screen is cleared, decided once per manager"""
+        if self._mode is None:
+            stream = self._get_stream()
+            try:
+                is_terminal = stream.isatty()
+            except (AttributeError, ValueError):
+                is_terminal = False
+
+            if not is_terminal or os.environ.get("TERM") == "dumb":
+                self._mode = "plain"
+            elif os.name == 'nt' and not enable_windows_ansi():
+                self._mode = "cls"   # old Windows console without escape codes
+            else:
+                self._mode = "ansi"
+
+        return self._mode
+
+    def invalidate(self):
+        """Forget the frame on screen, so the next one is drawn in full"""
+        self._frame = None
+
+    def clear(self):
+        """Clear the whole screen"""
+        mode = self._get_mode()
+        self._frame = None
+
+        if mode == "ansi":
+            stream = self._get_stream()
+            stream.write(CURSOR_HOME + CLEAR_SCREEN)
+            stream.flush()
+        elif mode == "cls":
+            os.system('cls')
+
+    def present(self, text):
+        """
+        Show a frame from the top of the screen, erasing everything below it
+        Parameters:
+            text (str): Rendered frame
+        """
+        mode = self._get_mode()
+        stream = self._get_stream()
+
+        if mode != "ansi":
+            self.clear()
+            stream.write(text)
+            stream.flush()
+            return
+
+        size = shutil.get_terminal_size()
+        lines = text.split("\n")
+
+        if self._frame is None or size != self._size or len(lines) >= size.lines:
+            stream.write(CURSOR_HOME + CLEAR_SCREEN + text)
+        else:
+            # Overwrite every row in place, then wipe the rest
+            parts = [move_cursor(row) + line + CLEAR_LINE
+                     for row, line in enumerate(lines[:-1], start=1)]
+            parts.append(move_cursor(len(lines)) + lines[-1] + CLEAR_BELOW)
+            stream.write("".join(parts))
+
+        stream.flush()
+        self._frame = lines
+        self._size = size
+
+
+# Screen manager of the interactive program
+SCREEN = ScreenManager()
+
+
+def clear_screen():
+    """Clear the terminal (does nothing when output is not a terminal)"""
+    SCREEN.clear()
+
+
+def present_screen(text):
+    """Show a full-screen frame over the previous one"""
+    SCREEN.present(text)
@@ -0,0 +1,605 @@
+# ============================================================
+# MSAAS - SQLite Store Module
+# Keeps every record of a school in one SQLite database
+# ============================================================
+#
+# Used instead of the attendance_store/ folder with:
+#
+#   python main.py --db school.db
+#
+# One row per (student, month) with the day-wise marks packed at
+# 2 bits per day, indexed by student, month and percentage, plus a
+# students table holding the section of each student and a table of
+# subject records (period-by-period marks, see subject_record.py).
+# A row's saved_at time is its version for save_versioned_data.
+# The database runs in WAL mode, so readers (reports, the API server)
+# never wait for a writer, and bulk saves are grouped into
+# transactions of SAVE_BATCH_SIZE records.
+# On first use, an old attendance_data.txt and everything in the
+# attendance_store/ folder are copied in.
+
+import os
+import sqlite3
+import threading
+import time
+
+import file_handler
+from attendance import MONTH_NAMES, AttendanceRecord, new_detailed_record, mark_day, unmark_day, correct_day
+from calculator import calculate_percentage
+from file_handler import (DEFAULT_STUDENT_ID, ENTRY_TYPES, notify_save_listeners,
+                          parse_record, print_save_conflict, show_store_message)
+from packed_record import PackedDailyRecord, pack_marks
+from subject_record import SubjectRecord
+from utils import is_valid_student_id
+
+# Records written per transaction by save_many
+SAVE_BATCH_SIZE = 500
+
+# Section of students saved without one
+DEFAULT_SECTION = "all"
+
+# PRAGMA user_version once the old files have been copied in
+MIGRATED_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id  TEXT PRIMARY KEY,
+    section     TEXT NOT NULL DEFAULT 'all'
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS students_by_section ON students (section, student_id);
+
+CREATE TABLE IF NOT EXISTS records (
+    student_id    TEXT NOT NULL,
+    month         INTEGER NOT NULL,   -- index into MONTH_NAMES
+    total_days    INTEGER NOT NULL,
+    days_present  INTEGER NOT NULL,
+    days_absent   INTEGER NOT NULL,
+    entry_type    INTEGER NOT NULL,   -- index into ENTRY_TYPES
+    day_count     INTEGER NOT NULL,
+    marks         BLOB NOT NULL,      -- day-wise marks, 2 bits per day
+    percentage    REAL NOT NULL,
+    saved_at      INTEGER NOT NULL,   -- nanoseconds, newest = last saved month
+    PRIMARY KEY (student_id, month)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS records_by_month ON records (month, percentage);
+CREATE INDEX IF NOT EXISTS records_by_percentage ON records (percentage);
+
+CREATE TABLE IF NOT EXISTS subject_records (
+    student_id  TEXT NOT NULL,
+    month       INTEGER NOT NULL,   -- index into MONTH_NAMES
+    record      BLOB NOT NULL,      -- SubjectRecord.to_bytes()
+    PRIMARY KEY (student_id, month)
+) WITHOUT ROWID;
+"""
+
+# Columns read back into an attendance data dictionary
+RECORD_COLUMNS = "month, total_days, days_present, days_absent, entry_type, day_count, marks"
+
+UPSERT_RECORD = """
+INSERT OR REPLACE INTO records
+    (student_id, month, total_days, days_present, days_absent,
+     entry_type, day_count, marks, percentage, saved_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ADD_STUDENT = "INSERT OR IGNORE INTO students (student_id) VALUES (?)"
+
+
+def record_to_row(student_id, data, saved_at):
+    """
+    Convert attendance data into a records table row
+    Parameters:
+        student_id (str): Student ID
+        data (dict): Attendance data dictionary
+        saved_at (int): Save time in nanoseconds
+    Returns:
+        tuple: Values for UPSERT_RECORD
+    Raises:
+        ValueError: If the student ID, month or entry type is invalid
+    """
+    if not is_valid_student_id(student_id):
+        raise ValueError(f"Invalid student ID: {student_id!r}")
+    if data['month'] not in MONTH_NAMES:
+        raise ValueError(f"Invalid month: {data['month']!r}")
+
+    daily_record = data['daily_record']
+    if isinstance(daily_record, PackedDailyRecord):
+        marks = daily_record.to_bytes()
+    else:
+        marks = bytes(pack_marks(daily_record))
+
+    return (
+        student_id,
+        MONTH_NAMES.index(data['month']),
+        data['total_days'],
+        data['days_present'],
+        data['days_absent'],
+        ENTRY_TYPES.index(data['entry_type']),
+        len(daily_record),
+        marks,
+        calculate_percentage(data['days_present'], data['total_days']),
+        saved_at
+    )
+
+
+def row_to_record(row):
+    """
+    Convert a row of RECORD_COLUMNS back into attendance data
+    Parameters:
+        row (tuple): Values in RECORD_COLUMNS order
+    Returns:
+        AttendanceRecord: Attendance data
+    """
+    month, total_days, days_present, days_absent, entry_type, day_count, marks = row
+    return AttendanceRecord(MONTH_NAMES[month], total_days, days_present, days_absent,
+                            PackedDailyRecord(marks, day_count, 0), ENTRY_TYPES[entry_type])
+
+
+class SQLiteStore:
+    """Attendance records of a whole school in one SQLite database"""
+
+    def __init__(self, path):
+        """
+        Parameters:
+            path (str): Database file, created on first use
+        """
+        self.path = path
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Worker processes open their own connection
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def _connect(self):
+        """Get this process's connection, creating the database if needed"""
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        connection.execute("PRAGMA busy_timeout=5000")
+
+        connection.executescript(SCHEMA)
+
+        self._connection = connection
+        self._pid = os.getpid()
+
+        if connection.execute("PRAGMA user_version").fetchone()[0] < MIGRATED_VERSION:
+            try:
+                self._migrate_files()
+            except BaseException:
+                # Try again on the next use
+                self._connection = None
+                connection.close()
+                raise
+
+        return connection
+
+    def _write(self, rows, version=None):
+        """Insert or replace record rows in one transaction"""
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(ADD_STUDENT, [(row[0],) for row in rows])
+            connection.executemany(UPSERT_RECORD, rows)
+            if version is not None:
+                connection.execute(f"PRAGMA user_version = {int(version)}")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _migrate_files(self):
+        """Copy an old attendance_data.txt and the attendance_store/ folder in"""
+        saved_at = time.time_ns()
+        rows = []
+
+        for student_id in file_handler.list_file_students():
+            for data in file_handler.load_file_student(student_id).values():
+                rows.append(record_to_row(student_id, data, saved_at))
+                saved_at += 1
+
+        legacy = None
+        try:
+            with open(file_handler.DATA_FILE, "r", encoding="utf-8") as file:
+                legacy = parse_record(file.readlines())
+            if legacy is not None:
+                rows.append(record_to_row(DEFAULT_STUDENT_ID, legacy, saved_at))
+        except FileNotFoundError:
+            pass
+        except (KeyError, ValueError) as e:
+            # A damaged old file is left in place rather than blocking the database
+            show_store_message(f"⚠ Could not migrate {file_handler.DATA_FILE}: {e}")
+            legacy = None
+
+        # Marked as migrated in the same transaction as the copied records
+        self._write(rows, MIGRATED_VERSION)
+        if legacy is not None and os.path.exists(file_handler.DATA_FILE):
+            os.remove(file_handler.DATA_FILE)
+
+    def save(self, student_id, data, expected_version=None):
+        """
+        Save one (student, month) record
+        Parameters:
+            student_id (str): Student ID
+            data (dict): Attendance data dictionary
+            expected_version (int): saved_at of the row when it was loaded
+                                    (0 if it did not exist), or None to skip the check
+        Returns:
+            int: New version (saved_at) of the record, or None if not saved
+        """
+        try:
+            with self._lock:
+                row = record_to_row(student_id, data, time.time_ns())
+                connection = self._connect()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    current = connection.execute(
+                        "SELECT saved_at FROM records WHERE student_id = ? AND month = ?", row[:2]
+                    ).fetchone()
+                    current = current[0] if current is not None else 0
+
+                    if expected_version is not None and current != expected_version:
+                        connection.execute("ROLLBACK")
+                        print_save_conflict(data['month'])
+                        return None
+
+                    # A coarse clock must still give every save a new version
+                    if row[-1] <= current:
+                        row = row[:-1] + (current + 1,)
+
+                    connection.execute(ADD_STUDENT, (student_id,))
+                    connection.execute(UPSERT_RECORD, row)
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            show_store_message(f"⚠ Error saving data: {e}")
+            return None
+
+        notify_save_listeners(student_id, data['month'])
+        return row[-1]
+
+    def save_many(self, items):
+        """
+        Save many records, SAVE_BATCH_SIZE per transaction
+        Parameters:
+            items (iterable): (student_id, attendance data) pairs
+        Returns:
+            int: Number of records saved
+        """
+        saved = 0
+        saved_at = time.time_ns()
+        batch = []
+        keys = []
+
+        def flush():
+            nonlocal saved
+            try:
+                with self._lock:
+                    self._write(batch)
+            except Exception as e:
+                show_store_message(f"⚠ Error saving data: {e}")
+                return
+            saved += len(batch)
+            for student_id, month in keys:
+                notify_save_listeners(student_id, month)
+
+        for student_id, data in items:
+            try:
+                batch.append(record_to_row(student_id, data, saved_at))
+            except (KeyError, ValueError) as e:
+                show_store_message(f"⚠ Error saving data: {e}")
+                continue
+            keys.append((student_id, data['month']))
+            saved_at += 1
+
+            if len(batch) >= SAVE_BATCH_SIZE:
+                flush()
+                batch = []
+                keys = []
+
+        if batch:
+            flush()
+
+        return saved
+
+    def load(self, student_id, month=None):
+        """
+        Load one record
+        Parameters:
+            student_id (str): Student to load
+            month (str): Month to load, or None for the most recently saved one
+        Returns:
+            dict: Attendance data dictionary, or None if nothing is saved
+        """
+        return self.load_versioned(student_id, month)[0]
+
+    def load_versioned(self, student_id, month=None):
+        """
+        Load one record and its version (saved_at)
+        Returns:
+            tuple: (attendance data or None, version - 0 if nothing is saved)
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                if month is None:
+                    row = connection.execute(
+                        f"SELECT {RECORD_COLUMNS}, saved_at FROM records WHERE student_id = ? "
+                        "ORDER BY saved_at DESC LIMIT 1", (student_id,)
+                    ).fetchone()
+                else:
+                    row = connection.execute(
+                        f"SELECT {RECORD_COLUMNS}, saved_at FROM records WHERE student_id = ? AND month = ?",
+                        (student_id, MONTH_NAMES.index(month))
+                    ).fetchone()
+        except Exception as e:
+            show_store_message(f"⚠ Error loading data: {e}")
+            return None, 0
+
+        if row is None:
+            return None, 0
+        return row_to_record(row[:-1]), row[-1]
+
+    def delete(self, student_id, month=None):
+        """
+        Delete one month, or every month, of a student
+        Returns:
+            bool: True if something was deleted, False otherwise
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                # Records and subject records go in one transaction
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    if month is None:
+                        months = [row[0] for row in connection.execute(
+                            "SELECT month FROM records WHERE student_id = ?", (student_id,))]
+                        connection.execute("DELETE FROM records WHERE student_id = ?", (student_id,))
+                        connection.execute("DELETE FROM subject_records WHERE student_id = ?", (student_id,))
+                    else:
+                        months = [MONTH_NAMES.index(month)]
+                        cursor = connection.execute(
+                            "DELETE FROM records WHERE student_id = ? AND month = ?",
+                            (student_id, months[0])
+                        )
+                        if cursor.rowcount == 0:
+                            months = []
+                        connection.execute(
+                            "DELETE FROM subject_records WHERE student_id = ? AND month = ?",
+                            (student_id, MONTH_NAMES.index(month))
+                        )
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            show_store_message(f"⚠ Error deleting data: {e}")
+            return False
+
+        for month_index in months:
+            notify_save_listeners(student_id, MONTH_NAMES[month_index])
+        return len(months) > 0
+
+    def _change_day(self, student_id, month, change):
+        """
+        Apply a change to one record inside a single transaction
+        Parameters:
+            change (function): Called with the attendance data to update
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    row = connection.execute(
+                        f"SELECT {RECORD_COLUMNS}, saved_at FROM records WHERE student_id = ? AND month = ?",
+                        (student_id, MONTH_NAMES.index(month))
+                    ).fetchone()
+                    if row is not None:
+                        data = row_to_record(row[:-1])
+                        saved_at = max(time.time_ns(), row[-1] + 1)
+                    else:
+                        data = new_detailed_record(month)
+                        saved_at = time.time_ns()
+                    change(data)
+                    connection.execute(ADD_STUDENT, (student_id,))
+                    connection.execute(UPSERT_RECORD, record_to_row(student_id, data, saved_at))
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            show_store_message(f"⚠ Error saving data: {e}")
+            return False
+
+        notify_save_listeners(student_id, month)
+        return True
+
+    def mark_day(self, student_id, month, status):
+        return self._change_day(student_id, month, lambda data: mark_day(data, status))
+
+    def unmark_day(self, student_id, month, day_number):
+        return self._change_day(student_id, month, lambda data: unmark_day(data, int(day_number)))
+
+    def correct_day(self, student_id, month, day_number, status):
+        return self._change_day(student_id, month, lambda data: correct_day(data, int(day_number), status))
+
+    def _query(self, sql, parameters=()):
+        """Run a read-only query and return every row"""
+        with self._lock:
+            return self._connect().execute(sql, parameters).fetchall()
+
+    def list_students(self):
+        """Sorted IDs of every student with at least one record"""
+        return [row[0] for row in self._query("SELECT DISTINCT student_id FROM records ORDER BY student_id")]
+
+    def load_student(self, student_id):
+        """Every saved month of one student, in calendar order"""
+        rows = self._query(
+            f"SELECT {RECORD_COLUMNS} FROM records WHERE student_id = ? ORDER BY month", (student_id,)
+        )
+        return {MONTH_NAMES[row[0]]: row_to_record(row) for row in rows}
+
+    def save_subjects(self, student_id, record):
+        """
+        Save the subject record of one (student, month)
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            if not is_valid_student_id(student_id):
+                raise ValueError(f"Invalid student ID: {student_id!r}")
+            row = (student_id, MONTH_NAMES.index(record.month), record.to_bytes())
+
+            with self._lock:
+                connection = self._connect()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    connection.execute(ADD_STUDENT, (student_id,))
+                    connection.execute(
+                        "INSERT OR REPLACE INTO subject_records (student_id, month, record) VALUES (?, ?, ?)", row
+                    )
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+            return True
+        except Exception as e:
+            show_store_message(f"⚠ Error saving data: {e}")
+            return False
+
+    def load_subjects(self, student_id, month):
+        """
+        Load the subject record of one (student, month)
+        Returns:
+            SubjectRecord: The record, or None if there is none
+        """
+        try:
+            rows = self._query(
+                "SELECT record FROM subject_records WHERE student_id = ? AND month = ?",
+                (student_id, MONTH_NAMES.index(month))
+            )
+            return SubjectRecord.from_bytes(rows[0][0]) if rows else None
+        except Exception as e:
+            show_store_message(f"⚠ Error loading data: {e}")
+            return None
+
+    def load_all(self):
+        """
+        Load every record of the school in one query
+        Returns:
+            dict: student_id -> {month name -> attendance data}
+        """
+        school = {}
+        for row in self._query(f"SELECT student_id, {RECORD_COLUMNS} FROM records ORDER BY student_id, month"):
+            school.setdefault(row[0], {})[MONTH_NAMES[row[1]]] = row_to_record(row[1:])
+        return school
+
+    def load_month(self, month):
+        """
+        Load one month of every student
+        Returns:
+            dict: student_id -> attendance data
+        """
+        rows = self._query(
+            f"SELECT student_id, {RECORD_COLUMNS} FROM records WHERE month = ? ORDER BY student_id",
+            (MONTH_NAMES.index(month),)
+        )
+        return {row[0]: row_to_record(row[1:]) for row in rows}
+
+    def set_sections(self, pairs):
+        """
+        Record the section of many students in one transaction
+        Parameters:
+            pairs (iterable): (student_id, section) pairs
+        """
+        pairs = list(pairs)
+        for student_id, section in pairs:
+            if not is_valid_student_id(student_id) or not is_valid_student_id(section):
+                raise ValueError(f"Invalid student or section: {student_id!r}, {section!r}")
+
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "INSERT INTO students (student_id, section) VALUES (?, ?) "
+                    "ON CONFLICT (student_id) DO UPDATE SET section = excluded.section",
+                    pairs
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def list_section(self, section):
+        """Sorted IDs of the students in one section"""
+        rows = self._query(
+            "SELECT student_id FROM students WHERE section = ? ORDER BY student_id", (section,)
+        )
+        return [row[0] for row in rows]
+
+    def list_sections(self):
+        """(student_id, section) of every student with a record"""
+        return self._query(
+            "SELECT s.student_id, s.section FROM students s "
+            "WHERE EXISTS (SELECT 1 FROM records r WHERE r.student_id = s.student_id) "
+            "ORDER BY s.section, s.student_id"
+        )
+
+    def load_section(self, section, month):
+        """
+        Load one month of every student in a section
+        Returns:
+            dict: student_id -> attendance data
+        """
+        rows = self._query(
+            f"SELECT r.student_id, {', '.join('r.' + column for column in RECORD_COLUMNS.split(', '))} "
+            "FROM students s JOIN records r ON r.student_id = s.student_id "
+            "WHERE s.section = ? AND r.month = ? ORDER BY r.student_id",
+            (section, MONTH_NAMES.index(month))
+        )
+        return {row[0]: row_to_record(row[1:]) for row in rows}
+
+    def below(self, percentage, month=None):
+        """
+        Records under a percentage, lowest first (uses the percentage indexes)
+        Parameters:
+            percentage (float): Exclusive upper bound
+            month (str): Month to look at, or None for every month
+        Returns:
+            list: (student_id, month name, percentage) tuples
+        """
+        if month is None:
+            rows = self._query(
+                "SELECT student_id, month, percentage FROM records "
+                "WHERE percentage < ? ORDER BY percentage, student_id", (percentage,)
+            )
+        else:
+            rows = self._query(
+                "SELECT student_id, month, percentage FROM records "
+                "WHERE month = ? AND percentage < ? ORDER BY percentage, student_id",
+                (MONTH_NAMES.index(month), percentage)
+            )
+        return [(student_id, MONTH_NAMES[month_index], pct) for student_id, month_index, pct in rows]
+
+    def close(self):
+        """Close this process's connection"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
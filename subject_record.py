@@ -0,0 +1,313 @@
+# ============================================================
+# MSAAS - Subject Record Module
+# Period-by-period marks of one student-month, for schools that
+# enforce the 75% minimum per subject
+# ============================================================
+#
+# A subject record holds one byte per (working day, period):
+#
+#   subject number (1-63) << 2 | mark code (P = 1, A = 2)
+#
+# with 0 for a free period, so a month of 8 periods a day takes a
+# couple of hundred bytes, and every subject's counts come from one
+# pass over the bytes. The subject numbers index the record's own list
+# of subject names.
+#
+# Which subject is taught in each period comes from a weekly timetable
+# (TIMETABLE_FILE), one line per school day:
+#
+#   Monday: Maths, Physics, English, -, Chemistry     ('-' = free period)
+#
+# and a month is entered as one line per day of its weekday's marks:
+#
+#   Mon PPAPP        Tue PPP-A        Wed H (holiday, skipped)
+
+import struct
+from collections import Counter
+
+from attendance import MONTH_NAMES
+from packed_record import MARK_CODES, CODE_MARKS
+from school_calendar import get_calendar, default_year, month_dates, parse_weekday
+
+# Weekly timetable read by load_timetable
+TIMETABLE_FILE = "timetable.txt"
+
+# Most periods in one day and most subjects in one record
+MAX_PERIODS = 16
+MAX_SUBJECTS = 63
+
+# Mark of a free period in the timetable and in day lines
+FREE_PERIOD = "-"
+
+# Stored layout: magic, month index, periods per day, number of
+# subjects, number of days, followed by each subject name (length
+# byte + UTF-8) and one byte per (day, period)
+SUBJECT_HEADER = struct.Struct("<4sBBBH")
+SUBJECT_MAGIC = b"MSS1"
+
+
+class SubjectRecord:
+    """Period-by-period marks of one student in one month"""
+
+    __slots__ = ("month", "periods", "subjects", "slots")
+
+    def __init__(self, month, periods, subjects=(), slots=None):
+        """
+        Parameters:
+            month (str): Month name
+            periods (int): Periods per day (1-MAX_PERIODS)
+            subjects (iterable): Subject names, numbered from 1 in this order
+            slots (bytes-like): periods bytes per day, or None for no days yet
+        """
+        if month not in MONTH_NAMES:
+            raise ValueError(f"Invalid month: {month!r}")
+        if not 1 <= periods <= MAX_PERIODS:
+            raise ValueError(f"Periods per day must be 1-{MAX_PERIODS}")
+
+        self.month = month
+        self.periods = periods
+        self.subjects = list(subjects)
+        self.slots = bytearray() if slots is None else bytearray(slots)
+
+    def __len__(self):
+        """Number of working days recorded"""
+        return len(self.slots) // self.periods
+
+    def __eq__(self, other):
+        if not isinstance(other, SubjectRecord):
+            return NotImplemented
+        return (self.month, self.periods, self.subjects, self.slots) == \
+               (other.month, other.periods, other.subjects, other.slots)
+
+    def __repr__(self):
+        return f"SubjectRecord({self.month!r}, {len(self)} days, {len(self.subjects)} subjects)"
+
+    def subject_number(self, subject):
+        """Number of a subject in this record, added if it is new"""
+        try:
+            return self.subjects.index(subject) + 1
+        except ValueError:
+            if len(self.subjects) == MAX_SUBJECTS:
+                raise ValueError(f"At most {MAX_SUBJECTS} subjects per record")
+            if len(subject.encode("utf-8")) > 255:
+                raise ValueError(f"Subject name too long: {subject[:20]}...")
+            self.subjects.append(subject)
+            return len(self.subjects)
+
+    def add_day(self, entries):
+        """
+        Add the next working day
+        Parameters:
+            entries (list): (subject, 'P' or 'A') per period, or
+                            (None, '-') for a free period; days shorter
+                            than the record's periods end in free periods
+        """
+        if len(entries) > self.periods:
+            raise ValueError(f"At most {self.periods} periods per day")
+
+        day = bytearray(self.periods)
+        for period, (subject, mark) in enumerate(entries):
+            if subject is None:
+                continue
+            if mark not in ('P', 'A'):
+                raise ValueError("Invalid! Enter P or A for each period")
+            day[period] = self.subject_number(subject) << 2 | MARK_CODES[mark]
+        self.slots += day
+
+    def day(self, index):
+        """
+        Get one working day
+        Parameters:
+            index (int): Day index (0-based)
+        Returns:
+            list: (subject, mark) per period, (None, '-') for free periods
+        """
+        if not 0 <= index < len(self):
+            raise IndexError("day index out of range")
+
+        entries = []
+        for slot in self.slots[index * self.periods:(index + 1) * self.periods]:
+            if slot == 0:
+                entries.append((None, FREE_PERIOD))
+            else:
+                entries.append((self.subjects[(slot >> 2) - 1], CODE_MARKS[slot & 3]))
+        return entries
+
+    def counts(self):
+        """
+        Count every subject's present and absent periods in one pass
+        Returns:
+            dict: subject -> (present, absent), in the record's subject order
+        """
+        histogram = Counter(self.slots)
+        return {
+            subject: (histogram[number << 2 | MARK_CODES['P']], histogram[number << 2 | MARK_CODES['A']])
+            for number, subject in enumerate(self.subjects, start=1)
+        }
+
+    def to_bytes(self):
+        """Convert the record into its stored layout"""
+        names = bytearray()
+        for subject in self.subjects:
+            encoded = subject.encode("utf-8")
+            names += bytes([len(encoded)]) + encoded
+
+        header = SUBJECT_HEADER.pack(SUBJECT_MAGIC, MONTH_NAMES.index(self.month),
+                                     self.periods, len(self.subjects), len(self))
+        return header + bytes(names) + bytes(self.slots)
+
+    @classmethod
+    def from_bytes(cls, buffer):
+        """
+        Read a record from its stored layout
+        Raises:
+            ValueError: If the buffer is not a subject record
+        """
+        magic, month_index, periods, subject_count, day_count = SUBJECT_HEADER.unpack_from(buffer, 0)
+        if magic != SUBJECT_MAGIC:
+            raise ValueError("not a subject record")
+
+        subjects = []
+        position = SUBJECT_HEADER.size
+        for _ in range(subject_count):
+            length = buffer[position]
+            subjects.append(bytes(buffer[position + 1:position + 1 + length]).decode("utf-8"))
+            position += 1 + length
+
+        slots = buffer[position:position + day_count * periods]
+        if len(slots) != day_count * periods:
+            raise ValueError("subject record is cut short")
+        return cls(MONTH_NAMES[month_index], periods, subjects, slots)
+
+
+def parse_timetable(lines):
+    """
+    Read a weekly timetable (format at the top of this module)
+    Parameters:
+        lines (iterable): Lines of a timetable file
+    Returns:
+        dict: weekday number (Monday = 0) -> tuple of subjects, None for free periods
+    Raises:
+        ValueError: With the number of the first invalid line
+    """
+    timetable = {}
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            continue
+
+        try:
+            if ":" not in line:
+                raise ValueError("Expected: Day: subject, subject, ...")
+            day, subjects = line.split(":", 1)
+            weekday = parse_weekday(day)
+
+            periods = tuple(None if name.strip() == FREE_PERIOD else name.strip()
+                            for name in subjects.split(","))
+            if not 1 <= len(periods) <= MAX_PERIODS:
+                raise ValueError(f"A day needs 1-{MAX_PERIODS} periods")
+            if any(subject == "" for subject in periods):
+                raise ValueError("Empty subject name (use - for a free period)")
+            timetable[weekday] = periods
+
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}")
+
+    if not timetable:
+        raise ValueError("The timetable has no school days")
+    return timetable
+
+
+def load_timetable(path=TIMETABLE_FILE):
+    """
+    Read a timetable file
+    Parameters:
+        path (str): File path
+    Returns:
+        dict: Timetable from parse_timetable
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If a line is invalid
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return parse_timetable(file)
+
+
+def build_subject_record(month, timetable, day_lines):
+    """
+    Build a month's subject record from one line per day
+    Parameters:
+        month (str): Month name
+        timetable (dict): Timetable from parse_timetable
+        day_lines (iterable): "Mon PPAPP" lines, one mark per period of
+                              that weekday ('-' for free periods), or
+                              "Mon H" for a holiday
+    Returns:
+        SubjectRecord: The month's record
+    Raises:
+        ValueError: With the number of the first invalid line
+    """
+    record = SubjectRecord(month, max(len(periods) for periods in timetable.values()))
+
+    for line_number, line in enumerate(day_lines, start=1):
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            continue
+
+        try:
+            fields = line.split(None, 1)
+            if len(fields) != 2:
+                raise ValueError("Expected: day marks")
+            weekday = parse_weekday(fields[0])
+            marks = "".join(fields[1].split()).upper()
+
+            if marks == "H":
+                continue
+            if weekday not in timetable:
+                raise ValueError(f"No timetable for {fields[0]}")
+
+            periods = timetable[weekday]
+            if len(marks) != len(periods):
+                raise ValueError(f"Expected {len(periods)} marks, got {len(marks)}")
+
+            entries = []
+            for period, (subject, mark) in enumerate(zip(periods, marks), start=1):
+                if subject is None:
+                    if mark != FREE_PERIOD:
+                        raise ValueError(f"Period {period} is free, mark it {FREE_PERIOD}")
+                    entries.append((None, FREE_PERIOD))
+                elif mark in ('P', 'A'):
+                    entries.append((subject, mark))
+                else:
+                    raise ValueError(f"Invalid mark {mark!r} in period {period}! Enter P or A")
+            record.add_day(entries)
+
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}")
+
+    return record
+
+
+def remaining_subject_periods(month, recorded_days, timetable, school_calendar=None, year=None, section=None):
+    """
+    Count each subject's periods in the working days of a month not
+    recorded yet, from the school calendar and the timetable
+    Parameters:
+        month (str): Month name
+        recorded_days (int): Working days already recorded
+        timetable (dict): Timetable from parse_timetable
+        school_calendar (SchoolCalendar): Calendar to use, default get_calendar()
+        year (int): Year, default the most recent one
+        section (str): Section, or None for the whole school
+    Returns:
+        Counter: subject -> periods left
+    """
+    if school_calendar is None:
+        school_calendar = get_calendar()
+    if year is None:
+        year = default_year(month)
+
+    remaining = Counter()
+    for day in school_calendar.working_dates(*month_dates(month, year), section)[recorded_days:]:
+        remaining.update(subject for subject in timetable.get(day.weekday(), ()) if subject is not None)
+    return remaining
@@ -0,0 +1,30 @@
+# ============================================================
+# MSAAS - Test Fixtures
+# Shared setup for the tests in this folder (run: python -m pytest)
+# ============================================================
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import archive
+import file_handler
+import school_calendar
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    """Run a test in an empty folder, with the file store and no cached data"""
+    monkeypatch.chdir(tmp_path)
+    previous_store = file_handler.get_store()
+    file_handler.use_store(file_handler.FileStore())
+    archive._indexes.clear()
+    archive._segments.clear()
+    school_calendar._calendars.clear()
+
+    yield tmp_path
+
+    file_handler.use_store(previous_store)
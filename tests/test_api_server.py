@@ -0,0 +1,158 @@
+# ============================================================
+# MSAAS - API Server Tests
+# Requests go over a real connection to a server on a free port
+# ============================================================
+
+import asyncio
+import json
+
+import pytest
+
+import api_server
+from file_handler import save_data
+
+
+def exchange(*requests):
+    """
+    Send raw requests over one connection
+    Returns:
+        list: (status, headers, reply) of every response received
+    """
+    async def run():
+        server = await api_server.start_server(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for request in requests:
+                writer.write(request)
+                await writer.drain()
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+                except asyncio.IncompleteReadError:
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                headers = dict(line.lower().split(": ", 1) for line in lines[1:] if ": " in line)
+                body = await reader.readexactly(int(headers["content-length"]))
+                responses.append((int(lines[0].split(" ")[1]), headers, json.loads(body)))
+            writer.close()
+            await writer.wait_closed()
+            # Let the server see the end of the connection before it stops
+            await asyncio.sleep(0.05)
+            return responses
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(run())
+
+
+def get(target, extra=""):
+    return f"GET {target} HTTP/1.1\r\nHost: test\r\n{extra}\r\n".encode("ascii")
+
+
+def post(target, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return (f"POST {target} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n").encode("ascii") + body
+
+
+@pytest.fixture
+def saved(store_dir):
+    assert save_data({"month": "March", "total_days": 20, "days_present": 14, "days_absent": 6,
+                      "daily_record": [], "entry_type": "quick"}, "s001")
+    return store_dir
+
+
+def test_answers_on_one_kept_alive_connection(saved):
+    responses = exchange(get("/health"), get("/summary?student=s001&month=March"),
+                         get("/status?student=s001&month=3"))
+
+    assert [status for status, headers, reply in responses] == [200, 200, 200]
+    assert responses[0][2] == {"status": "ok"}
+    assert responses[1][2]["percentage"] == 70.0
+    assert responses[2][2]["status"] == "CRITICAL"
+    assert responses[2][1]["connection"] == "keep-alive"
+
+
+def test_calculations_without_a_saved_record(store_dir):
+    status, headers, reply = exchange(get("/safe-leaves?days_present=18&total_days=20&remaining=10&target=75"))[0]
+
+    assert status == 200
+    assert reply["remaining_days"] == 10
+
+
+@pytest.mark.parametrize("target", [
+    "/summary?student=bad%20id&month=March",
+    "/summary?student=s001&month=Smarch",
+    "/days-needed?student=s001&month=March&remaining=many",
+    "/safe-leaves?student=s001&month=March&remaining=5&target=77",
+    "/summary?days_present=30&total_days=20"
+])
+def test_bad_parameters_are_400(saved, target):
+    status, headers, reply = exchange(get(target))[0]
+
+    assert status == 400
+    assert "error" in reply
+
+
+@pytest.mark.parametrize("target", ["/summary?student=s001&month=April", "/summary?student=s404&month=March",
+                                    "/nowhere", "/batch/nowhere", "/leave-plan?student=s404&until=March"])
+def test_missing_data_and_endpoints_are_404(saved, target):
+    assert exchange(get(target))[0][0] == 404
+
+
+def test_wrong_methods_are_405(saved):
+    responses = exchange(post("/summary", {}), get("/batch/summary"))
+
+    assert [status for status, headers, reply in responses] == [405, 405]
+
+
+def test_batch_answers_each_item_in_order(saved):
+    status, headers, reply = exchange(post("/batch/status", {"requests": [
+        {"student": "s001", "month": "March"},
+        {"student": "s001", "month": "April"},
+        "not an object",
+        {"days_present": 19, "total_days": 20}
+    ]}))[0]
+
+    assert status == 200
+    results = reply["results"]
+    assert results[0]["status"] == "CRITICAL"
+    assert "error" in results[1] and "error" in results[2]
+    assert results[3]["status"] == "EXCELLENT"
+
+
+def test_bad_batch_bodies(saved, monkeypatch):
+    monkeypatch.setattr(api_server, "MAX_BATCH_ITEMS", 2)
+
+    assert exchange(post("/batch/status", {"items": []}))[0][0] == 400
+    assert exchange(post("/batch/status", {"requests": {}}))[0][0] == 400
+    assert exchange(post("/batch/status", {"requests": [{}, {}, {}]}))[0][0] == 413
+
+
+def test_malformed_and_oversized_requests_close_the_connection(store_dir):
+    status, headers, reply = exchange(b"HELLO\r\n\r\n", get("/health"))[-1]
+    assert status == 400
+    assert headers["connection"] == "close"
+
+    too_large = f"POST /batch/status HTTP/1.1\r\nContent-Length: {api_server.MAX_BODY_SIZE + 1}\r\n\r\n"
+    assert exchange(too_large.encode("ascii"))[0][0] == 413
+
+    assert exchange(b"GET /health HTTP/1.1\r\nContent-Length: ten\r\n\r\n")[0][0] == 400
+
+
+def test_unexpected_errors_are_500(saved, monkeypatch):
+    def broken(params):
+        raise KeyError("boom")
+    monkeypatch.setitem(api_server.ENDPOINTS, "/summary", broken)
+
+    status, headers, reply = exchange(get("/summary?student=s001&month=March"))[0]
+    assert status == 500
+    assert "boom" in reply["error"]
+
+
+def test_connection_close_is_honoured(saved):
+    responses = exchange(get("/health", "Connection: close\r\n"), get("/health"))
+
+    assert len(responses) == 1
+    assert responses[0][1]["connection"] == "close"
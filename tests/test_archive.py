@@ -0,0 +1,59 @@
+import archive
+import file_handler
+from attendance import build_quick_record, build_record_from_string
+from subject_record import SubjectRecord
+
+
+def test_sealed_month_loads_like_a_live_one(store_dir):
+    record = build_record_from_string("March", 5, "PAPPH")
+    file_handler.save_data(record, "s1")
+    file_handler.save_data(build_quick_record("March", 20, 18), "s2")
+
+    moved, total, size = archive.seal_month("March")
+
+    assert (moved, total) == (2, 2)
+    assert size > 0
+    assert file_handler.list_months("s1") == []
+    assert archive.archived_months("s1") == ["March"]
+    assert file_handler.load_data("s1", "March") == record
+    assert file_handler.load_data("s2", "March")["days_present"] == 18
+
+
+def test_saving_a_sealed_month_hides_the_sealed_record(store_dir):
+    file_handler.save_data(build_quick_record("March", 20, 10), "s1")
+    archive.seal_month("March")
+
+    file_handler.save_data(build_quick_record("March", 20, 15), "s1")
+    assert file_handler.load_data("s1", "March")["days_present"] == 15
+
+    # Sealing again moves the newer record in
+    assert archive.seal_month("March")[0] == 1
+    assert archive.load_archived("s1", "March")["days_present"] == 15
+
+
+def test_non_ascii_student_ids_are_sealed(store_dir):
+    file_handler.save_data(build_quick_record("March", 20, 16), "José")
+
+    assert archive.seal_month("March")[:2] == (1, 1)
+    assert archive.list_archived_students() == {"José"}
+    assert file_handler.load_data("José", "March")["days_present"] == 16
+
+
+def test_menu_start_finds_a_student_whose_months_are_all_sealed(store_dir):
+    file_handler.save_data(build_quick_record("March", 20, 16), "s1")
+    archive.seal_month("March")
+
+    data, version = file_handler.load_versioned_data("s1")
+    assert data["month"] == "March"
+    assert version == 0
+
+
+def test_sealing_keeps_subject_records(store_dir):
+    file_handler.save_data(build_quick_record("March", 20, 16), "s1")
+    subjects = SubjectRecord("March", 2)
+    subjects.add_day([("Maths", "P"), ("Art", "A")])
+    file_handler.save_subject_data(subjects, "s1")
+
+    archive.seal_month("March")
+
+    assert file_handler.load_subject_data("s1", "March") == subjects
@@ -0,0 +1,71 @@
+import autosave
+import file_handler
+from attendance import build_quick_record
+from autosave import AutoSaver
+
+
+def make_saver():
+    return AutoSaver("s1", delay=60)
+
+
+def test_changes_to_a_month_are_saved_once(store_dir, monkeypatch):
+    saved = []
+
+    def save_versioned_data(data, student_id, expected_version):
+        saved.append(data['days_present'])
+        return len(saved)
+
+    monkeypatch.setattr(autosave, "save_versioned_data", save_versioned_data)
+    saver = make_saver()
+    for present in (10, 11, 12):
+        saver.save(build_quick_record("March", 20, present))
+    saver.close()
+
+    assert saved == [12]
+
+
+def test_checked_save_refuses_a_month_changed_by_another_session(store_dir):
+    file_handler.save_data(build_quick_record("March", 20, 10), "s1")
+    data, version = file_handler.load_versioned_data("s1", "March")
+    saver = make_saver()
+    saver.set_version("March", version)
+
+    file_handler.save_data(build_quick_record("March", 20, 5), "s1")
+    saver.save(build_quick_record("March", 20, 15), check_version=True)
+    saver.flush()
+
+    assert saver.take_conflicts() == {"March"}
+    assert file_handler.load_data("s1", "March")["days_present"] == 5
+    saver.close()
+
+
+def test_unchecked_change_is_not_lost_to_a_later_checked_save(store_dir):
+    file_handler.save_data(build_quick_record("March", 20, 10), "s1")
+    data, version = file_handler.load_versioned_data("s1", "March")
+    saver = make_saver()
+    saver.set_version("March", version)
+
+    # A new entry (unchecked) then option 9 (checked) within the delay
+    file_handler.save_data(build_quick_record("March", 20, 5), "s1")
+    saver.save(build_quick_record("March", 20, 18))
+    saver.save(build_quick_record("March", 20, 18), check_version=True)
+    saver.close()
+
+    assert saver.take_conflicts() == set()
+    assert file_handler.load_data("s1", "March")["days_present"] == 18
+    assert saver.take_messages() == ["✓ March saved successfully!"]
+
+
+def test_store_errors_are_kept_for_the_menu_not_printed(store_dir, capsys):
+    file_handler.save_data(build_quick_record("March", 20, 10), "s1")
+    data, version = file_handler.load_versioned_data("s1", "March")
+    saver = make_saver()
+    saver.set_version("March", version)
+    file_handler.save_data(build_quick_record("March", 20, 5), "s1")
+    capsys.readouterr()
+
+    saver.save(build_quick_record("March", 20, 15), check_version=True)
+    saver.close()
+
+    assert capsys.readouterr().out == ""
+    assert any("changed by another session" in message for message in saver.take_messages())
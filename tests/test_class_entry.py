@@ -0,0 +1,24 @@
+import io
+
+import class_entry
+import file_handler
+
+
+def test_valid_lines_are_saved_and_invalid_ones_counted(store_dir):
+    errors = io.StringIO()
+    saved, failures = class_entry.enter_class(
+        ["s1 PPAPP", "s2 PP", "s3 PPPPP", "bad id! PPPPP"], "March", 5, errors)
+
+    assert (saved, failures) == (2, 2)
+    assert file_handler.load_data("s3", "March")["days_present"] == 5
+    assert file_handler.load_data("s2", "March") is None
+
+
+def test_records_the_store_did_not_save_count_as_failures(store_dir, monkeypatch):
+    monkeypatch.setattr(class_entry, "save_many_data", lambda items: len(list(items)) - 1)
+    errors = io.StringIO()
+
+    saved, failures = class_entry.enter_class(["s1 PPAPP", "s2 PPPPP"], "March", 5, errors)
+
+    assert (saved, failures) == (1, 1)
+    assert "could not be saved" in errors.getvalue()
@@ -0,0 +1,42 @@
+import pytest
+
+import file_handler
+from attendance import (build_record_from_string, new_detailed_record,
+                        mark_day, unmark_day, correct_day)
+
+
+def test_counters_follow_day_changes():
+    data = build_record_from_string("March", 4, "PAPP")
+
+    mark_day(data, "A")
+    correct_day(data, 1, "A")
+    unmark_day(data, 2)
+
+    assert list(data['daily_record']) == ["A", "P", "P", "A"]
+    assert (data['total_days'], data['days_present'], data['days_absent']) == (4, 2, 2)
+    assert data['percentage'] == 50.0
+
+
+def test_a_month_stops_at_31_working_days():
+    data = new_detailed_record("March")
+    for _ in range(31):
+        mark_day(data, "P")
+
+    with pytest.raises(ValueError):
+        mark_day(data, "P")
+    assert data['total_days'] == 31
+
+
+def test_store_refuses_a_32nd_mark(store_dir):
+    file_handler.save_data(build_record_from_string("March", 31, "P" * 31), "s1")
+
+    assert not file_handler.journal_mark_day("s1", "March", "P")
+    assert file_handler.load_data("s1", "March")['total_days'] == 31
+
+
+def test_store_refuses_marks_on_quick_entry_months(store_dir):
+    from attendance import build_quick_record
+    file_handler.save_data(build_quick_record("March", 20, 15), "s1")
+
+    assert not file_handler.journal_mark_day("s1", "March", "P")
+    assert file_handler.load_data("s1", "March")['total_days'] == 20
@@ -0,0 +1,26 @@
+import threading
+
+import instrumentation
+
+
+def test_counts_recorded_from_many_threads_add_up():
+    instrumentation.reset_metrics()
+
+    def record():
+        for _ in range(1000):
+            instrumentation.record_timing("test.calls", 1500)
+            instrumentation.record_io("test_read", 10)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = instrumentation.get_metrics()
+    assert metrics["timings"]["test.calls"]["calls"] == 8000
+    assert metrics["timings"]["test.calls"]["histogram_us"] == {"10": 8000}
+    assert metrics["io"]["test_read"] == {"operations": 8000, "bytes": 80000}
+
+    instrumentation.reset_metrics()
+    assert instrumentation.get_metrics()["timings"] == {}
@@ -0,0 +1,83 @@
+# ============================================================
+# MSAAS - Journal Tests
+# ============================================================
+
+import os
+
+import file_handler
+from attendance import RECORD_FIELDS
+from file_handler import (save_data, load_data, load_student, journal_mark_day, journal_unmark_day,
+                          journal_correct_day, get_journal_path, get_record_path, JOURNAL_COMPACT_LIMIT)
+
+
+def record(month, marks=None, total_days=20, days_present=15):
+    if marks is not None:
+        return {"month": month, "total_days": len(marks), "days_present": marks.count('P'),
+                "days_absent": marks.count('A'), "daily_record": list(marks), "entry_type": "detailed"}
+    return {"month": month, "total_days": total_days, "days_present": days_present,
+            "days_absent": total_days - days_present, "daily_record": [], "entry_type": "quick"}
+
+
+def fields(data):
+    """Every field of a record, comparable whatever type holds it"""
+    return tuple(list(data[name]) if name == "daily_record" else data[name] for name in RECORD_FIELDS)
+
+
+def test_saves_are_appended_to_the_journal_and_read_back(store_dir):
+    assert save_data(record("March", "PPAPA"), "s001")
+    assert save_data(record("April", total_days=18, days_present=12), "s001")
+
+    assert os.path.exists(get_journal_path("s001"))
+    assert not os.path.exists(get_record_path("s001", "March"))
+    assert fields(load_data("s001", "March")) == fields(record("March", "PPAPA"))
+    assert fields(load_data("s001", "April")) == fields(record("April", total_days=18, days_present=12))
+    # Without a month, the most recently saved one
+    assert load_data("s001")['month'] == "April"
+
+
+def test_day_events_replay_onto_the_saved_record(store_dir):
+    assert save_data(record("March", "PPA"), "s001")
+    assert journal_mark_day("s001", "March", 'A')
+    assert journal_correct_day("s001", "March", 1, 'A')
+    assert journal_unmark_day("s001", "March", 2)
+
+    assert fields(load_data("s001", "March")) == fields(record("March", "AAA"))
+
+
+def test_compaction_folds_the_journal_into_snapshots(store_dir):
+    expected = {}
+    for count in range(JOURNAL_COMPACT_LIMIT):
+        month = ("January", "February", "March")[count % 3]
+        expected[month] = record(month, "PA" * (count % 7) + "P")
+        assert save_data(expected[month], "s001")
+
+    assert not os.path.exists(get_journal_path("s001"))
+    for month in expected:
+        assert os.path.exists(get_record_path("s001", month))
+    assert {month: fields(data) for month, data in load_student("s001").items()} == \
+        {month: fields(data) for month, data in expected.items()}
+
+    # New events after compaction go on top of the snapshots
+    assert journal_mark_day("s001", "March", 'P')
+    assert list(load_data("s001", "March")['daily_record']) == list(expected["March"]['daily_record']) + ['P']
+
+
+def test_half_written_last_event_is_ignored(store_dir):
+    assert save_data(record("March", "PPA"), "s001")
+    with open(get_journal_path("s001"), "a", encoding="utf-8") as file:
+        file.write("2\trecord\tMarch\t1")
+
+    assert fields(load_data("s001", "March")) == fields(record("March", "PPA"))
+    # The next save starts on a fresh line and is read back
+    assert save_data(record("March", "AAP"), "s001")
+    assert fields(load_data("s001", "March")) == fields(record("March", "AAP"))
+
+
+def test_students_and_months_are_kept_apart(store_dir):
+    assert save_data(record("March", "PP"), "s001")
+    assert save_data(record("March", "AA"), "s002")
+    assert save_data(record("May", "PA"), "s001")
+
+    assert sorted(file_handler.list_students()) == ["s001", "s002"]
+    assert list(load_student("s001")) == ["March", "May"]
+    assert fields(load_data("s002", "March")) == fields(record("March", "AA"))
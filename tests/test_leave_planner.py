@@ -0,0 +1,143 @@
+# ============================================================
+# MSAAS - Leave Planner Tests
+# ============================================================
+
+import random
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from calculator import calculate_percentage, calculate_required_days
+from leave_planner import plan_leaves, upcoming_days, parse_day_list
+from school_calendar import SchoolCalendar
+
+# Monday to Friday, no holidays
+CALENDAR = SchoolCalendar()
+
+
+def quick(month, total_days, days_present):
+    return {"month": month, "total_days": total_days, "days_present": days_present,
+            "days_absent": total_days - days_present, "daily_record": [], "entry_type": "quick"}
+
+
+def plan(records, end_month, **options):
+    options.setdefault("year", 2026)
+    return plan_leaves(records, end_month, school_calendar=CALENDAR, **options)
+
+
+def most_leaves(records, days, must_attend=()):
+    """
+    Largest number of days that can be skipped, worked out from the
+    limits directly: no month and not the term may drop below 75%
+    """
+    upcoming = Counter(month for month, day in days)
+    skippable = Counter(month for month, day in days if day not in must_attend)
+
+    month_total = 0
+    for month, count in upcoming.items():
+        data = records.get(month, quick(month, 0, 0))
+        safe = data['days_present'] + count - calculate_required_days(75, data['total_days'] + count)
+        month_total += max(0, min(safe, skippable[month]))
+
+    present = sum(data['days_present'] for data in records.values())
+    total = sum(data['total_days'] for data in records.values())
+    term_safe = present + len(days) - calculate_required_days(75, total + len(days))
+    return max(0, min(term_safe, month_total))
+
+
+def test_days_left_start_after_the_recorded_days():
+    days = upcoming_days("March", "April", 10, CALENDAR, 2026)
+
+    assert days[0] == ("March", date(2026, 3, 16))
+    assert Counter(month for month, day in days) == {"March": 12, "April": 22}
+
+
+def test_every_month_and_the_term_stay_at_the_minimum():
+    records = {"March": quick("March", 10, 8)}
+    result = plan(records, "May")
+
+    # 8 of 10 so far, then 12 days of March, 22 of April and 21 of May left:
+    # March can lose 3, April and May 5 each, the term 14
+    assert [row["leaves"] for row in result["months"]] == [3, 5, 5]
+    assert len(result["leaves"]) == 13
+    for row in result["months"]:
+        assert row["percentage"] >= 75
+    assert result["term_percentage"] >= 75
+    assert result["meets_target"]
+
+
+def test_the_term_budget_limits_the_months():
+    # Far behind in March: the months could lose days, the term cannot
+    records = {"February": quick("February", 20, 10), "March": quick("March", 10, 10)}
+    result = plan(records, "April")
+
+    present = 20 + 12 + 22 - len(result["leaves"])
+    assert len(result["leaves"]) == most_leaves(records, upcoming_days("March", "April", 10, CALENDAR, 2026))
+    assert calculate_percentage(present, 30 + 12 + 22) >= 75
+    assert result["term_percentage"] >= 75
+
+
+def test_month_below_the_minimum_gets_no_leaves():
+    records = {"March": quick("March", 20, 10)}
+    result = plan(records, "April")
+
+    march = result["months"][0]
+    assert march["leaves"] == 0
+    assert not march["meets_target"]
+    assert not result["meets_target"]
+    assert all(day.month == 4 for day in result["leaves"])
+
+
+def test_must_attend_and_preferred_days():
+    records = {"March": quick("March", 10, 9)}
+    must_attend, weekdays = parse_day_list("2026-03-20, 2026-03-19")
+    preferred, preferred_weekdays = parse_day_list("Friday")
+
+    result = plan(records, "March", must_attend=must_attend, preferred=preferred,
+                  preferred_weekdays=preferred_weekdays)
+
+    assert date(2026, 3, 20) not in result["leaves"]
+    assert date(2026, 3, 19) not in result["leaves"]
+    # Friday 20th is an exam, the other Fridays go first
+    fridays = [day for day in result["leaves"] if day.weekday() == 4]
+    assert fridays == [date(2026, 3, 27)]
+    # 9 of 10 so far and 12 days left: 17 of 22 needed, 4 to spare
+    assert result["leaves"] == [date(2026, 3, 26), date(2026, 3, 27), date(2026, 3, 30), date(2026, 3, 31)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_plans_skip_as_many_days_as_the_limits_allow(seed):
+    generator = random.Random(seed)
+    records = {}
+    for month in ("January", "February", "March"):
+        total_days = generator.randint(15, 22)
+        records[month] = quick(month, total_days, generator.randint(total_days // 2, total_days))
+    must_attend = {date(2026, 4, day) for day in generator.sample(range(1, 31), 5)}
+
+    result = plan(records, "May", must_attend=must_attend)
+    days = upcoming_days("March", "May", records["March"]['total_days'], CALENDAR, 2026)
+
+    assert len(result["leaves"]) == most_leaves(records, days, must_attend)
+    assert not must_attend & set(result["leaves"])
+    if result["meets_target"]:
+        assert result["term_percentage"] >= 75
+        assert all(row["percentage"] >= 75 for row in result["months"])
+
+
+def test_term_running_across_the_new_year():
+    records = {"January": quick("January", 20, 20), "November": quick("November", 20, 20),
+               "June": quick("June", 20, 0)}
+
+    # January 2027 is the last month recorded (1 day left in it); June
+    # is before the term and does not count against it
+    result = plan(records, "February", start_month="August", year=2027)
+
+    assert [row["month"] for row in result["months"]] == ["January", "February"]
+    assert [row["leaves"] for row in result["months"]] == [1, 5]
+    assert result["meets_target"]
+
+
+def test_no_records_in_the_term():
+    with pytest.raises(ValueError):
+        plan({"June": quick("June", 20, 15)}, "March", start_month="January")
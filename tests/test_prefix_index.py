@@ -0,0 +1,154 @@
+# ============================================================
+# MSAAS - Prefix Index Tests
+# ============================================================
+
+import random
+
+import pytest
+
+import api_server
+from calculator import calculate_percentage
+from file_handler import save_data, journal_mark_day, journal_correct_day, delete_data
+from prefix_index import AttendancePrefixIndex, build_prefix_index
+
+TERM = ("August", "September", "October", "November", "December", "January")
+
+
+def detailed(month, marks):
+    return {
+        "month": month,
+        "total_days": len(marks),
+        "days_present": marks.count('P'),
+        "days_absent": marks.count('A'),
+        "daily_record": list(marks),
+        "entry_type": "detailed"
+    }
+
+
+@pytest.fixture
+def term_marks():
+    """month -> marks of a term running across the new year"""
+    generator = random.Random(17)
+    return {month: "".join(generator.choice("PPPA") for day in range(generator.randint(15, 23)))
+            for month in TERM}
+
+
+def slice_percentage(marks):
+    """Percentage of a run of marks, calculated directly"""
+    return calculate_percentage(marks.count('P'), len(marks))
+
+
+def test_day_ranges_match_percentages_of_slices(term_marks):
+    index = AttendancePrefixIndex("August")
+    for month in reversed(TERM):
+        index.set_month(detailed(month, term_marks[month]))
+    every_day = "".join(term_marks[month] for month in TERM)
+    starts = {}
+    for month in TERM:
+        starts[month] = sum(len(term_marks[earlier]) for earlier in TERM[:TERM.index(month)])
+
+    generator = random.Random(3)
+    for attempt in range(200):
+        first, last = sorted(generator.sample(range(len(TERM)), 2))
+        first_day = generator.randint(1, len(term_marks[TERM[first]]))
+        last_day = generator.randint(1, len(term_marks[TERM[last]]))
+        expected = slice_percentage(every_day[starts[TERM[first]] + first_day - 1:
+                                              starts[TERM[last]] + last_day])
+
+        assert index.range_percentage(TERM[first], first_day, TERM[last], last_day) == expected
+
+
+def test_whole_months_and_recent_days_match_slices(term_marks):
+    index = AttendancePrefixIndex("August")
+    for month in TERM:
+        index.set_month(detailed(month, term_marks[month]))
+    every_day = "".join(term_marks[month] for month in TERM)
+
+    assert index.months_percentage("August", "January") == slice_percentage(every_day)
+    assert index.months_percentage("October", "December") == slice_percentage(
+        term_marks["October"] + term_marks["November"] + term_marks["December"])
+    for days in (1, 7, 30, len(every_day), len(every_day) + 5):
+        assert index.recent_percentage(days) == slice_percentage(every_day[-days:])
+
+
+def test_day_changes_match_slices(term_marks):
+    index = AttendancePrefixIndex("August")
+    for month in TERM:
+        index.set_month(detailed(month, term_marks[month]))
+
+    index.mark_day("October", 'A')
+    term_marks["October"] += "A"
+    index.correct_day("August", 2, 'A')
+    term_marks["August"] = term_marks["August"][0] + "A" + term_marks["August"][2:]
+    index.unmark_day("November", 3)
+    term_marks["November"] = term_marks["November"][:2] + term_marks["November"][3:]
+
+    for month in TERM:
+        assert index.months_percentage(month, month) == slice_percentage(term_marks[month])
+    assert index.recent_percentage(40) == slice_percentage("".join(term_marks[month] for month in TERM)[-40:])
+
+
+def test_quick_months_refuse_ranges_inside_them():
+    index = AttendancePrefixIndex()
+    index.set_month({"month": "March", "total_days": 20, "days_present": 15, "days_absent": 5,
+                     "daily_record": [], "entry_type": "quick"})
+    index.set_month(detailed("April", "PPAP"))
+
+    assert index.months_percentage("March", "April") == calculate_percentage(18, 24)
+    with pytest.raises(ValueError):
+        index.range_percentage("March", 5, "April", 2)
+
+
+def test_watched_index_appends_a_marked_day_without_rebuilding(store_dir, monkeypatch):
+    assert save_data(detailed("September", "PPAPP"), "s001")
+    assert save_data(detailed("October", "PAP"), "s001")
+    index = build_prefix_index("s001", "August", watch=True)
+    rebuilt = []
+    monkeypatch.setattr(index, "set_month", lambda data: rebuilt.append(data['month']))
+    try:
+        assert journal_mark_day("s001", "October", 'A')
+        assert journal_mark_day("s001", "October", 'P')
+        assert rebuilt == []
+        assert index.months_percentage("September", "October") == slice_percentage("PPAPP" + "PAPAP")
+
+        # Anything else is still rebuilt
+        assert journal_correct_day("s001", "October", 1, 'A')
+        assert rebuilt == ["October"]
+    finally:
+        index.stop_watching()
+
+
+def test_watched_index_follows_saves_and_deletes(store_dir):
+    assert save_data(detailed("September", "PPAPP"), "s001")
+    index = build_prefix_index("s001", "August", watch=True)
+    try:
+        assert save_data(detailed("September", "AAP"), "s001")
+        assert save_data(detailed("October", "PP"), "s001")
+        assert save_data(detailed("October", "PP"), "s002")
+        assert index.months_percentage("September", "October") == slice_percentage("AAPPP")
+
+        assert delete_data("s001", "September")
+        assert index.months() == ["October"]
+    finally:
+        index.stop_watching()
+
+
+def test_range_endpoint(store_dir, term_marks):
+    for month in TERM:
+        assert save_data(detailed(month, term_marks[month]), "s001")
+    every_day = "".join(term_marks[month] for month in TERM)
+
+    status, payload = api_server.handle_request("GET", "/range?student=s001&from=August&to=January", b"")
+    assert (status, payload["percentage"]) == (200, slice_percentage(every_day))
+
+    status, payload = api_server.handle_request(
+        "GET", "/range?student=s001&from=November&from_day=4&to=December&to_day=2", b"")
+    assert (status, payload["percentage"]) == (
+        200, slice_percentage(term_marks["November"][3:] + term_marks["December"][:2]))
+
+    status, payload = api_server.handle_request("GET", "/range?student=s001&to=January&last=30", b"")
+    assert (status, payload["percentage"]) == (200, slice_percentage(every_day[-30:]))
+
+    assert api_server.handle_request("GET", "/range?student=s001&from=March&to=January", b"")[0] == 404
+    assert api_server.handle_request("GET", "/range?student=s001&from=August&to=January&from_day=1", b"")[0] == 400
+    assert api_server.handle_request("GET", "/range?student=s001&to=January", b"")[0] == 400
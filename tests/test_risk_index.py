@@ -0,0 +1,144 @@
+# ============================================================
+# MSAAS - Risk Index Tests
+# ============================================================
+
+import json
+import random
+
+import pytest
+
+import api_server
+from calculator import calculate_percentage, get_status_band, STATUS_BANDS
+from file_handler import save_data
+from risk_index import AttendanceRiskIndex
+
+MONTHS = ("January", "February", "March")
+
+
+@pytest.fixture
+def records():
+    """Random (student_id, data) records, several with equal percentages"""
+    generator = random.Random(8)
+    records = []
+    for number in range(300):
+        total_days = generator.randint(0, 25)
+        days_present = generator.randint(0, total_days)
+        records.append((f"s{number:03d}", {
+            "month": generator.choice(MONTHS),
+            "total_days": total_days,
+            "days_present": days_present,
+            "days_absent": total_days - days_present,
+            "daily_record": [],
+            "entry_type": "quick"
+        }))
+    return records
+
+
+def scan(records, keep):
+    """The (percentage, student_id, month) entries a linear scan keeps"""
+    entries = []
+    for student_id, data in records:
+        percentage = calculate_percentage(data['days_present'], data['total_days'])
+        if keep(percentage, data['month']):
+            entries.append((percentage, student_id, data['month']))
+    return sorted(entries)
+
+
+def fill(records):
+    index = AttendanceRiskIndex()
+    for student_id, data in records:
+        index.update(student_id, data)
+    return index
+
+
+@pytest.mark.parametrize("threshold", [0, 50, 74.99, 75, 80.5, 100])
+@pytest.mark.parametrize("month", [None, "February", "August"])
+def test_below_matches_a_linear_scan(records, threshold, month):
+    index = fill(records)
+
+    expected = scan(records, lambda percentage, record_month:
+                    percentage < threshold and month in (None, record_month))
+    assert index.below(threshold, month) == expected
+
+
+def test_between_matches_a_linear_scan(records):
+    index = fill(records)
+
+    assert index.between(60, 85) == scan(records, lambda percentage, month: 60 <= percentage < 85)
+
+
+@pytest.mark.parametrize("band", [band[1] for band in STATUS_BANDS])
+def test_bands_match_check_status(records, band):
+    index = fill(records)
+
+    expected = scan(records, lambda percentage, month: get_status_band(percentage)[1] == band)
+    assert index.in_band(band) == expected
+    assert index.band_counts()[band] == len(expected)
+
+
+def test_moved_and_removed_records_match_a_linear_scan(records):
+    index = fill(records)
+    changed = []
+    for student_id, data in records[:100]:
+        data = dict(data, days_present=data['total_days'])
+        index.update(student_id, data)
+        changed.append((student_id, data))
+    for student_id, data in records[100:150]:
+        index.remove(student_id, data['month'])
+
+    current = changed + records[150:]
+    assert index.below(100) == scan(current, lambda percentage, month: percentage < 100)
+    assert index.count_below(75) == len(scan(current, lambda percentage, month: percentage < 75))
+    assert len(index) == len(current)
+
+
+def test_unknown_band_is_refused():
+    with pytest.raises(ValueError):
+        AttendanceRiskIndex().in_band("AVERAGE")
+
+
+def request(target):
+    status, payload = api_server.handle_request("GET", target, b"")
+    return status, json.loads(json.dumps(payload))
+
+
+def test_at_risk_endpoint_lists_saved_records_below_the_limit(store_dir, records, monkeypatch):
+    monkeypatch.setattr(api_server, "_risk_index", None)
+    for student_id, data in records[:40]:
+        assert save_data(data, student_id)
+
+    status, payload = request("/at-risk?below=80&month=March")
+
+    expected = scan(records[:40], lambda percentage, month: percentage < 80 and month == "March")
+    assert status == 200
+    assert payload["count"] == len(expected)
+    assert [(row["percentage"], row["student"], row["month"]) for row in payload["records"]] == expected
+
+
+def test_at_risk_endpoint_answers_band_queries_and_refuses_bad_input(store_dir, records, monkeypatch):
+    monkeypatch.setattr(api_server, "_risk_index", None)
+    for student_id, data in records[:40]:
+        assert save_data(data, student_id)
+
+    status, payload = request("/at-risk?band=critical")
+    assert status == 200
+    assert payload["count"] == len(scan(records[:40], lambda percentage, month: percentage < 75))
+
+    assert request("/at-risk?band=AVERAGE")[0] == 400
+    assert request("/at-risk?below=lots")[0] == 400
+    assert request("/at-risk?below=150")[0] == 400
+    assert request("/at-risk?month=Smarch")[0] == 400
+
+
+def test_at_risk_index_is_rebuilt_once_too_old(store_dir, records, monkeypatch):
+    monkeypatch.setattr(api_server, "_risk_index", None)
+    student_id, data = records[0]
+    data = dict(data, total_days=10, days_present=1, days_absent=9)
+    assert save_data(data, student_id)
+    assert request("/at-risk")[1]["count"] == 1
+
+    # Saved by another session: not seen until the index is rebuilt
+    assert save_data(dict(data, days_present=10, days_absent=0), student_id)
+    assert request("/at-risk")[1]["count"] == 1
+    monkeypatch.setattr(api_server, "RISK_INDEX_MAX_AGE", -1)
+    assert request("/at-risk")[1]["count"] == 0
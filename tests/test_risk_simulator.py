@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import file_handler
+import risk_simulator
+from attendance import build_quick_record
+
+
+def test_certain_outcomes_have_no_risk_or_full_risk():
+    results = risk_simulator.simulate_risk([20, 5], [0, 15], 0, trials=200, seed=1)
+
+    assert list(results["risk"]) == [0.0, 1.0]
+
+
+def test_trials_must_be_positive():
+    for trials in (0, -5):
+        with pytest.raises(ValueError):
+            risk_simulator.simulate_risk([20], [0], 10, trials=trials)
+
+
+def test_store_counts_only_the_term_in_term_order(store_dir, monkeypatch):
+    calls = []
+
+    def remaining_working_days(last_month, end_month, recorded_days=0, school_calendar=None, year=None):
+        calls.append((last_month, end_month, recorded_days))
+        return 10
+
+    monkeypatch.setattr(risk_simulator, "remaining_working_days", remaining_working_days)
+    for month, total, present in [("November", 20, 18), ("December", 18, 15),
+                                  ("January", 22, 20), ("June", 20, 5)]:
+        file_handler.save_data(build_quick_record(month, total, present), "s1")
+
+    student_ids, results = risk_simulator.simulate_store("March", trials=100, seed=1, start_month="August")
+
+    assert student_ids == ["s1"]
+    assert calls == [("January", "March", 22)]
+    # 53 of 60 days so far (June is outside the term) + 10 left: 53 of 70 needed
+    assert results["safe_leaves"][0] == 10
@@ -0,0 +1,131 @@
+# ============================================================
+# MSAAS - School Calendar Tests
+# ============================================================
+
+import os
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from school_calendar import (SchoolCalendar, parse_calendar, get_calendar, term_months,
+                             term_records, default_year, CALENDAR_FILE)
+
+RULES = """
+# Sample school
+weekend, Saturday, Sunday
+holiday, 2025-12-24, 2026-01-02
+holiday, 2026-03-06
+working, 2026-02-07
+[XI-A]
+weekend, Friday, Saturday, Sunday
+holiday, 2026-03-10
+working, 2026-03-06
+""".splitlines()
+
+
+def count_by_day(school_calendar, start, end, section=None):
+    """Working days counted one day at a time, straight from the rules"""
+    total = 0
+    day = start
+    while day <= end:
+        if school_calendar._is_working(day, section):
+            total += 1
+        day += timedelta(days=1)
+    return total
+
+
+def test_weekdays_without_a_calendar():
+    school_calendar = SchoolCalendar()
+
+    assert school_calendar.month_working_days("March", 2026) == 22
+    assert school_calendar.month_working_days("February", 2026) == 20
+    assert school_calendar.month_working_days("February", 2024) == 21
+    assert school_calendar.remaining_working_days("March", 15, 2026) == 7
+    assert school_calendar.remaining_working_days("March", 30, 2026) == 0
+
+
+def test_rules_change_the_counts():
+    school_calendar = parse_calendar(RULES)
+
+    # 22 weekdays, one holiday
+    assert school_calendar.month_working_days("March", 2026) == 21
+    # 20 weekdays plus the make-up Saturday
+    assert school_calendar.month_working_days("February", 2026) == 21
+    assert not school_calendar.is_working_day(date(2025, 12, 31))
+    assert school_calendar.is_working_day(date(2026, 2, 7))
+
+
+def test_section_rules_come_before_the_schools():
+    school_calendar = parse_calendar(RULES)
+
+    # 18 days without Fridays, the school's holiday is a working day for
+    # the section, and the section has a holiday of its own
+    assert school_calendar.month_working_days("March", 2026, "XI-A") == 18
+    assert school_calendar.is_working_day(date(2026, 3, 6), "XI-A")
+    assert not school_calendar.is_working_day(date(2026, 3, 6))
+    # Sections without rules follow the school
+    assert school_calendar.month_working_days("March", 2026, "XI-B") == 21
+    assert school_calendar.sections() == ["XI-A"]
+
+
+@pytest.mark.parametrize("section", [None, "XI-A"])
+def test_ranges_match_counting_day_by_day(section):
+    school_calendar = parse_calendar(RULES)
+    generator = random.Random(21)
+    first_day = date(2025, 6, 1)
+
+    for attempt in range(300):
+        start = first_day + timedelta(days=generator.randint(0, 500))
+        end = start + timedelta(days=generator.randint(-3, 400))
+
+        assert school_calendar.working_days_between(start, end, section) == \
+            count_by_day(school_calendar, start, end, section)
+
+
+def test_terms_across_the_new_year():
+    school_calendar = parse_calendar(RULES)
+
+    expected = count_by_day(school_calendar, date(2025, 8, 1), date(2026, 3, 31))
+    assert school_calendar.term_working_days("August", "March", 2025) == expected
+    assert school_calendar.term_working_days("December", "December", 2025) == \
+        count_by_day(school_calendar, date(2025, 12, 1), date(2025, 12, 31))
+    assert term_months("November", "February") == ["November", "December", "January", "February"]
+
+
+def test_term_records_are_in_term_order():
+    records = {month: {"month": month} for month in ("January", "March", "August", "November")}
+
+    assert list(term_records(records, "January")) == ["March", "August", "November", "January"]
+    assert list(term_records(records, "January", "August")) == ["August", "November", "January"]
+
+
+def test_default_year_is_the_most_recent_month():
+    assert default_year("March", date(2026, 3, 1)) == 2026
+    assert default_year("April", date(2026, 3, 31)) == 2025
+
+
+def test_invalid_lines_are_refused_with_their_number():
+    with pytest.raises(ValueError, match="Line 2"):
+        parse_calendar(["weekend, Sunday", "holiday, 2026-02-30"])
+    with pytest.raises(ValueError, match="Line 1"):
+        parse_calendar(["holiday, 2026-03-10, 2026-03-01"])
+    with pytest.raises(ValueError, match="Line 1"):
+        parse_calendar(["weekend, Funday"])
+    with pytest.raises(ValueError, match="Line 1"):
+        parse_calendar(["vacation, 2026-03-10"])
+
+
+def test_calendar_file_is_read_again_when_changed(store_dir):
+    assert get_calendar().month_working_days("March", 2026) == 22
+
+    with open(CALENDAR_FILE, "w", encoding="utf-8") as file:
+        file.write("holiday, 2026-03-02, 2026-03-03\n")
+    os.utime(CALENDAR_FILE, (1, 1))
+    assert get_calendar().month_working_days("March", 2026) == 20
+    assert get_calendar() is get_calendar()
+
+    with open(CALENDAR_FILE, "w", encoding="utf-8") as file:
+        file.write("holiday, 2026-03-02\n")
+    os.utime(CALENDAR_FILE, (2, 2))
+    assert get_calendar().month_working_days("March", 2026) == 21
@@ -0,0 +1,72 @@
+# ============================================================
+# MSAAS - Screen Tests
+# ============================================================
+
+import io
+import os
+import shutil
+
+import screen
+
+
+class FakeTerminal(io.StringIO):
+    """Output stream that claims to be a terminal"""
+
+    def isatty(self):
+        return True
+
+
+class NoInput:
+    """Standard input that fails the test if anything reads it"""
+
+    def fileno(self):
+        raise AssertionError("the screen read from standard input")
+
+    def read(self, *args):
+        raise AssertionError("the screen read from standard input")
+
+
+def make_manager(monkeypatch, lines=24):
+    monkeypatch.setattr(os, "name", "posix")
+    monkeypatch.setenv("TERM", "xterm")
+    monkeypatch.setattr(shutil, "get_terminal_size", lambda *args: os.terminal_size((80, lines)))
+    monkeypatch.setattr(screen.sys, "stdin", NoInput())
+    return screen.ScreenManager(FakeTerminal())
+
+
+def test_first_frame_clears_the_screen(monkeypatch):
+    manager = make_manager(monkeypatch)
+    manager.present("Menu\n1. One\nChoice")
+
+    assert manager._stream.getvalue() == screen.CURSOR_HOME + screen.CLEAR_SCREEN + "Menu\n1. One\nChoice"
+
+
+def test_next_frame_overwrites_every_row_without_reading_input(monkeypatch):
+    manager = make_manager(monkeypatch)
+    manager.present("Menu\n1. One\nChoice")
+    manager._stream.seek(0)
+    manager._stream.truncate()
+
+    # Same frame again: rows other output may have scrolled are still rewritten
+    manager.present("Menu\n1. One\nChoice")
+
+    output = manager._stream.getvalue()
+    assert screen.CLEAR_SCREEN not in output
+    assert output == (screen.move_cursor(1) + "Menu" + screen.CLEAR_LINE
+                      + screen.move_cursor(2) + "1. One" + screen.CLEAR_LINE
+                      + screen.move_cursor(3) + "Choice" + screen.CLEAR_BELOW)
+
+
+def test_frame_taller_than_the_terminal_clears_the_screen(monkeypatch):
+    manager = make_manager(monkeypatch, lines=3)
+    manager.present("a\nb")
+    manager.present("a\nb\nc")
+
+    assert manager._stream.getvalue().count(screen.CLEAR_SCREEN) == 2
+
+
+def test_plain_output_has_no_escape_codes():
+    stream = io.StringIO()
+    screen.ScreenManager(stream).present("Menu")
+
+    assert stream.getvalue() == "Menu"
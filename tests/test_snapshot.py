@@ -0,0 +1,66 @@
+# ============================================================
+# MSAAS - Snapshot Tests
+# ============================================================
+
+import os
+
+import pytest
+
+from attendance import RECORD_FIELDS
+from file_handler import (pack_snapshot, unpack_snapshot, write_snapshot, read_snapshot,
+                          get_record_path, SNAPSHOT_HEADER)
+from packed_record import PackedDailyRecord, packed_size
+
+
+def fields(data):
+    return tuple(list(data[name]) if name == "daily_record" else data[name] for name in RECORD_FIELDS)
+
+
+@pytest.mark.parametrize("marks", ["", "P", "PAH", "PAHP", "PAHPA", "PPAAHHPA" * 3 + "PAPAPHP"])
+def test_packed_marks_round_trip(marks):
+    data = {"month": "November", "total_days": len(marks), "days_present": marks.count('P'),
+            "days_absent": marks.count('A'), "daily_record": list(marks), "entry_type": "detailed"}
+
+    snapshot = pack_snapshot(data, sequence=41)
+    restored, sequence = unpack_snapshot(snapshot)
+
+    assert len(snapshot) == SNAPSHOT_HEADER.size + packed_size(len(marks))
+    assert sequence == 41
+    assert fields(restored) == fields(data)
+    assert restored['daily_record'].counts()[:2] == (marks.count('P'), marks.count('A'))
+
+
+def test_quick_entry_round_trip():
+    data = {"month": "February", "total_days": 19, "days_present": 16, "days_absent": 3,
+            "daily_record": [], "entry_type": "quick"}
+
+    restored, sequence = unpack_snapshot(pack_snapshot(data))
+
+    assert (fields(restored), sequence) == (fields(data), 0)
+
+
+def test_packed_record_is_written_as_it_is():
+    marks = PackedDailyRecord.from_marks("PAPPA")
+    data = {"month": "May", "total_days": 5, "days_present": 3, "days_absent": 2,
+            "daily_record": marks, "entry_type": "detailed"}
+
+    restored, sequence = unpack_snapshot(pack_snapshot(data, 7))
+
+    assert restored['daily_record'] == marks
+    assert list(restored['daily_record']) == list("PAPPA")
+
+
+def test_snapshot_file_round_trip(store_dir):
+    data = {"month": "July", "total_days": 3, "days_present": 2, "days_absent": 1,
+            "daily_record": list("PAP"), "entry_type": "detailed"}
+    write_snapshot("s001", data, 12)
+
+    assert not os.path.exists(get_record_path("s001", "July") + ".tmp")
+    restored, sequence = read_snapshot("s001", "July")
+    assert (fields(restored), sequence) == (fields(data), 12)
+    assert read_snapshot("s001", "June") == (None, 0)
+
+
+def test_other_files_are_refused():
+    with pytest.raises(ValueError):
+        unpack_snapshot(b"XXXX" + bytes(SNAPSHOT_HEADER.size))
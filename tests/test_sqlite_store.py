@@ -0,0 +1,51 @@
+import file_handler
+from attendance import build_quick_record, build_record_from_string
+from sqlite_store import SQLiteStore
+from subject_record import SubjectRecord
+
+
+def make_store(store_dir):
+    store = SQLiteStore(str(store_dir / "school.db"))
+    file_handler.use_store(store)
+    return store
+
+
+def test_records_round_trip(store_dir):
+    make_store(store_dir)
+    record = build_record_from_string("March", 5, "PAPPH")
+    file_handler.save_data(record, "s1")
+    file_handler.save_data(build_quick_record("April", 20, 18), "s1")
+
+    assert file_handler.load_data("s1", "March") == record
+    assert list(file_handler.load_student("s1")) == ["March", "April"]
+
+
+def test_stale_version_is_refused(store_dir):
+    make_store(store_dir)
+    version = file_handler.save_versioned_data(build_quick_record("March", 20, 10), "s1")
+    file_handler.save_versioned_data(build_quick_record("March", 20, 12), "s1", version)
+
+    assert file_handler.save_versioned_data(build_quick_record("March", 20, 15), "s1", version) is None
+    assert file_handler.load_data("s1", "March")["days_present"] == 12
+
+
+def test_failed_delete_leaves_records_and_subject_records_together(store_dir):
+    store = make_store(store_dir)
+    file_handler.save_data(build_quick_record("March", 20, 10), "s1")
+    subjects = SubjectRecord("March", 1)
+    subjects.add_day([("Maths", "P")])
+    file_handler.save_subject_data(subjects, "s1")
+
+    # The second DELETE fails after the first one has run
+    store._connect().execute(
+        "CREATE TRIGGER keep_subjects BEFORE DELETE ON subject_records "
+        "BEGIN SELECT RAISE(ABORT, 'disk error'); END")
+
+    assert not store.delete("s1", "March")
+    assert file_handler.load_data("s1", "March") is not None
+    assert file_handler.load_subject_data("s1", "March") == subjects
+
+    store._connect().execute("DROP TRIGGER keep_subjects")
+    assert store.delete("s1", "March")
+    assert file_handler.load_data("s1", "March") is None
+    assert file_handler.load_subject_data("s1", "March") is None
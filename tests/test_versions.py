@@ -0,0 +1,90 @@
+# ============================================================
+# MSAAS - Version Check Tests
+# Two sessions sharing one data folder (file store)
+# ============================================================
+
+import threading
+
+from file_handler import (save_versioned_data, load_versioned_data, load_data,
+                          journal_mark_day, compact_journal)
+
+
+def record(month, days_present, total_days=20):
+    return {"month": month, "total_days": total_days, "days_present": days_present,
+            "days_absent": total_days - days_present, "daily_record": [], "entry_type": "quick"}
+
+
+def test_unsaved_month_has_version_zero(store_dir):
+    assert load_versioned_data("s001", "March") == (None, 0)
+    assert save_versioned_data(record("March", 15), "s001", 0) is not None
+
+
+def test_stale_save_is_refused_and_keeps_the_newer_data(store_dir, capsys):
+    first = save_versioned_data(record("March", 15), "s001", 0)
+
+    # Both sessions load the same version, the second one saves first
+    data, version = load_versioned_data("s001", "March")
+    assert version == first
+    assert save_versioned_data(record("March", 18), "s001", version) > version
+
+    assert save_versioned_data(record("March", 10), "s001", version) is None
+    assert "changed by another session" in capsys.readouterr().out
+    assert load_data("s001", "March")['days_present'] == 18
+
+
+def test_saving_a_new_month_twice_from_scratch_conflicts(store_dir, capsys):
+    assert save_versioned_data(record("March", 15), "s001", 0) is not None
+    assert save_versioned_data(record("March", 12), "s001", 0) is None
+    assert load_data("s001", "March")['days_present'] == 15
+
+
+def test_unchecked_save_always_wins(store_dir):
+    version = save_versioned_data(record("March", 15), "s001", 0)
+    save_versioned_data(record("March", 16), "s001", version)
+
+    assert save_versioned_data(record("March", 5), "s001") is not None
+    assert load_data("s001", "March")['days_present'] == 5
+
+
+def test_version_changes_only_with_its_own_month(store_dir):
+    march = save_versioned_data(record("March", 15), "s001", 0)
+    save_versioned_data(record("April", 15), "s001", 0)
+    save_versioned_data(record("March", 16), "s002", 0)
+
+    assert load_versioned_data("s001", "March")[1] == march
+    assert save_versioned_data(record("March", 17), "s001", march) is not None
+
+
+def test_day_marks_and_compaction_keep_versions_in_step(store_dir):
+    data = {"month": "March", "total_days": 1, "days_present": 1, "days_absent": 0,
+            "daily_record": ['P'], "entry_type": "detailed"}
+    version = save_versioned_data(data, "s001", 0)
+
+    assert journal_mark_day("s001", "March", 'A')
+    marked = load_versioned_data("s001", "March")[1]
+    assert marked > version
+
+    compact_journal("s001")
+    assert load_versioned_data("s001", "March")[1] == marked
+    assert save_versioned_data(data, "s001", version) is None
+    assert save_versioned_data(data, "s001", marked) is not None
+
+
+def test_one_of_two_racing_sessions_wins(store_dir, capsys):
+    version = save_versioned_data(record("March", 10), "s001", 0)
+    start = threading.Barrier(8)
+    results = []
+
+    def session(days_present):
+        start.wait()
+        results.append((days_present, save_versioned_data(record("March", days_present), "s001", version)))
+
+    threads = [threading.Thread(target=session, args=(days,)) for days in range(11, 19)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winners = [days_present for days_present, saved in results if saved is not None]
+    assert len(winners) == 1
+    assert load_data("s001", "March")['days_present'] == winners[0]
@@ -3,24 +3,45 @@
 # Contains helper/utility functions
 # ============================================================
 
-import os  
-
-
-def get_valid_input(prompt, min_val, max_val):
+from screen import SCREEN
+
+
+def parse_valid_number(value, min_val, max_val):
+    """
+    Convert text to a whole number within a range
+    Parameters:
+        value (str): Text to convert
+        min_val (int): Smallest allowed number
+        max_val (int): Largest allowed number
+    Returns:
+        int: The number
+    Raises:
+        ValueError: With the message shown to the user
+    """
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError("Invalid input! Please enter a valid number.")
+
+    # Range check using logical operator
+    if value >= min_val and value <= max_val:
+        return value
+
+    raise ValueError(f"Enter a number between {min_val} and {max_val}")
+
+
+def get_valid_input(prompt, min_val, max_val, default=None):
  
     while True:
         try:
             value = input(prompt)
-            value = int(value)  
-            
-            # Range check using logical operator
-            if value >= min_val and value <= max_val:
-                return value
-            else:
-                print(f"   ⚠ Enter a number between {min_val} and {max_val}")
+            # Pressing Enter takes the default, when there is one
+            if default is not None and value.strip() == "":
+                return default
+            return parse_valid_number(value, min_val, max_val)
                 
-        except ValueError:
-            print("   ⚠ Invalid input! Please enter a valid number.")
+        except ValueError as e:
+            print(f"   ⚠ {e}")
 
 
 def get_valid_choice(prompt, min_val, max_val):
@@ -43,12 +64,8 @@ def pause_screen():
 
 
 def clear_screen():
-
-    
-    if os.name == 'nt':
-        os.system('cls')  # Windows command
-    else:
-        os.system('clear')  # Unix/Linux/Mac command
+    # Escape sequences instead of running `clear` / `cls` each time
+    SCREEN.clear()
 
 
 def get_yes_no(prompt):
@@ -64,5 +81,37 @@ def get_yes_no(prompt):
             print("   ⚠ Please enter 'y' or 'n'")
 
 
+def is_valid_student_id(student_id):
+    """
+    Check that a student ID is safe to use as a record key
+    Parameters:
+        student_id (str): Student ID to check
+    Returns:
+        bool: True if the ID is 1-32 letters, digits, '-' or '_'
+    """
+    if len(student_id) == 0 or len(student_id) > 32:
+        return False
+
+    for char in student_id:
+        if not (char.isalnum() or char in "-_"):
+            return False
+
+    return True
+
+
+def get_valid_student_id(prompt, default):
+
+    while True:
+        student_id = input(prompt).strip()
+
+        if student_id == "":
+            return default
+
+        if is_valid_student_id(student_id):
+            return student_id
+        else:
+            print("   ⚠ Use 1-32 letters, digits, '-' or '_'")
+
+
 def format_percentage(value):
     return f"{value:.2f}%"